@@ -0,0 +1,151 @@
+"""Cache backends used to keep hot lookups off the database.
+
+This module defines the `CacheBackend` interface, so a shared cache (e.g.,
+Redis or Memcached) can be plugged in, and an in-process `LRUCache`
+implementation with per-entry TTLs.
+
+Key components:
+- `MISSING`: Sentinel returned on a cache miss, since `None` is a valid
+  cached value (used for negative caching).
+- `CacheStats`: Hit, miss, eviction and expiration counters.
+- `CacheBackend`: Abstract interface for cache implementations.
+- `LRUCache`: Thread-safe in-process LRU cache with TTL expiry.
+"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import Any
+
+MISSING: Any = object()
+
+
+@dataclass
+class CacheStats:
+    """Cumulative counters collected by a cache backend.
+
+    Attributes:
+        hits (int): Lookups answered from the cache.
+        misses (int): Lookups not found in the cache, or found expired.
+        evictions (int): Entries dropped to respect the size limit.
+        expirations (int): Entries dropped because their TTL elapsed.
+
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+
+class CacheBackend(ABC):
+    """Interface every cache backend must implement.
+
+    Attributes:
+        stats (CacheStats): Counters describing the cache effectiveness.
+
+    """
+
+    stats: CacheStats
+
+    @abstractmethod
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value for `key`, or `MISSING` if absent."""
+
+    @abstractmethod
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        """Store `value` under `key` for `ttl` seconds."""
+
+    @abstractmethod
+    def delete(self, key: Hashable) -> None:
+        """Remove `key` from the cache if present."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Return the number of entries currently stored."""
+
+
+class LRUCache(CacheBackend):
+    """In-process cache evicting the least recently used entry when full.
+
+    Entries also expire after their TTL. All operations take a single
+    lock and run in constant time.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            max_size (int): Maximum number of entries. Default is 10000.
+            clock (Callable[[], float]): Time source, in seconds.
+
+        """
+        self.max_size = max_size
+        self.stats = CacheStats()
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[Any, float]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value for `key`, or `MISSING` if absent.
+
+        Args:
+            key (Hashable): The cache key.
+
+        Returns:
+            Any: The cached value or `MISSING`.
+
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return MISSING
+            value, expires_at = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        """Store `value` under `key` for `ttl` seconds.
+
+        Args:
+            key (Hashable): The cache key.
+            value (Any): The value to cache. May be `None`.
+            ttl (float): Time to live, in seconds.
+
+        """
+        with self._lock:
+            self._entries[key] = (value, self._clock() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        """Remove `key` from the cache if present.
+
+        Args:
+            key (Hashable): The cache key.
+
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        """Return the number of entries currently stored."""
+        return len(self._entries)
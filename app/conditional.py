@@ -0,0 +1,97 @@
+"""Entity tags for conditional user reads.
+
+Polling clients send back the `ETag` of the response they already hold
+in `If-None-Match`; when it still matches, the route answers `304 Not
+Modified` with no body, skipping serialization and most of the egress.
+Tags are derived from `User.version`, which the ORM increments on every
+update, so they change exactly when the public representation can.
+
+Key components:
+- `user_etag`: Strong tag of a single user.
+- `users_etag`: Strong tag of a page of users.
+- `matches`: Evaluates an `If-None-Match` header against a tag.
+- `not_modified`: Builds the `304` response.
+"""
+
+import hashlib
+from collections.abc import Iterable
+from typing import Any
+
+from fastapi import Response
+
+
+def user_etag(version: int) -> str:
+    """Return the entity tag of a user at the given row version.
+
+    Args:
+        version (int): The `User.version` of the row.
+
+    Returns:
+        str: The quoted tag.
+
+    """
+    return f'"v{version}"'
+
+
+def users_etag(users: Iterable[Any]) -> str:
+    """Return the entity tag of a list of users.
+
+    The tag digests the id and version of every user in order, so it
+    changes when a user is added, removed, reordered or updated.
+
+    Args:
+        users (Iterable[Any]): Rows exposing `id` and `version`.
+
+    Returns:
+        str: The quoted tag.
+
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for user in users:
+        digest.update(f"{user.id}:{user.version};".encode())
+    return f'"{digest.hexdigest()}"'
+
+
+def matches(if_none_match: str | None, etag: str) -> bool:
+    """Tell whether an `If-None-Match` header matches `etag`.
+
+    Uses the weak comparison required for `If-None-Match`, so `W/`
+    prefixes are ignored.
+
+    Args:
+        if_none_match (str | None): The header value, possibly a list.
+        etag (str): The current tag of the resource.
+
+    Returns:
+        bool: True if the client's copy is current.
+
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def not_modified(
+    etag: str,
+    headers: dict[str, str] | None = None,
+) -> Response:
+    """Build a `304 Not Modified` response.
+
+    Args:
+        etag (str): The current tag of the resource.
+        headers (dict[str, str] | None): Other headers the full response
+            would have carried.
+
+    Returns:
+        Response: The empty response.
+
+    """
+    return Response(
+        status_code=304,
+        headers={**(headers or {}), "ETag": etag},
+    )
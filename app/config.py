@@ -5,6 +5,8 @@ configuration values such as database connection details. Environment variables
 are read from a `.env` file using `pydantic-settings`.
 """
 
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -18,6 +20,89 @@ class Settings(BaseSettings):
         db_type (str): Type of the database (e.g., postgresql, mysql).
         db_host (str): Hostname or IP address of the database server.
         db_port (int): Port number on which the database is listening.
+        db_echo (bool): Log every SQL statement. Off by default because it
+            is expensive under load.
+        db_pool_size (int): Connections kept open in the pool.
+        db_max_overflow (int): Extra connections allowed above the pool size.
+        db_pool_timeout (float): Seconds to wait for a free connection before
+            failing.
+        db_pool_recycle (int): Seconds after which connections are replaced;
+            keep below MySQL's `wait_timeout` to avoid stale connections.
+        db_pool_pre_ping (bool): Test connections on checkout and transparently
+            replace dead ones.
+        db_slow_query_ms (float): Statements slower than this many
+            milliseconds are written to the slow-query log.
+        db_replica_hosts (list[str]): Read replicas, as `host` or
+            `host:port`, given as a JSON list. Reads are spread across
+            them and writes go to `db_host`.
+        db_read_your_writes_seconds (float): After a request writes, the
+            client's reads go to the primary for this many seconds. Set
+            to 0 to disable.
+        db_read_isolation_level (str): MySQL isolation level of the
+            read-only transactions that GET requests and replica reads
+            run in.
+        db_create_schema (bool): Create missing tables on startup. When
+            disabled, startup only checks the schema version and fails
+            on a mismatch; apply the schema with
+            `python -m app.migrations upgrade` instead.
+        db_async (bool): Serve requests through an async engine and
+            `AsyncSession` instead of a blocking session per request.
+        db_async_driver (str): SQLAlchemy async driver used when `db_async`
+            is enabled (e.g., mysql+aiomysql).
+        user_id_binary (bool): Store user ids as `BINARY(16)` instead of
+            `CHAR(36)`. Existing tables must be converted first with
+            `python -m app.migrations binary`.
+        user_id_time_ordered (bool): Generate time-ordered UUIDv7 user ids
+            instead of random UUIDv4 ones.
+        password_hash_scheme (str): Scheme of new password hashes, bcrypt
+            or the memory-hard argon2, which needs `argon2-cffi`.
+        password_hash_rounds (int | None): Fixed cost of new hashes: the
+            bcrypt cost or the argon2 time cost. When unset, the cost is
+            calibrated on startup to fit `password_hash_budget_ms`.
+        password_hash_budget_ms (float): Latency budget of one hash used
+            by the calibration, in milliseconds.
+        password_hash_min_rounds (int | None): Security floor of the
+            calibrated cost, which it can only raise. Defaults to 12 for
+            bcrypt and 2 for argon2.
+        password_argon2_memory_kib (int): Memory cost of argon2 hashes,
+            in KiB.
+        hash_workers (int): Threads dedicated to password hashing.
+        hash_batch_workers (int | None): Bulk hashing jobs, from batch
+            creation and imports, running at once. Defaults to
+            `hash_workers`.
+        hash_queue_size (int): Hashing jobs allowed to wait for a worker
+            before new signups are rejected with 503.
+        user_cache_size (int): Maximum users kept in the in-process lookup
+            cache. Set to 0 to disable the cache.
+        user_cache_ttl (float): Seconds a found user stays cached.
+        user_cache_negative_ttl (float): Seconds a missing user id stays
+            cached.
+        user_count_ttl (float): Seconds a user count stays cached.
+        user_count_cache_size (int): Maximum user counts kept, one per
+            combination of filters, apart from the user cache. Set to 0
+            to disable count caching.
+        email_index_enabled (bool): Keep an in-memory Bloom filter of
+            registered emails to skip existence queries for new emails.
+        email_index_capacity (int): Emails the filter is sized for.
+        email_index_error_rate (float): Target false positive rate of the
+            filter at capacity; lower rates use more memory.
+        email_index_rebuild_seconds (float): Interval between rebuilds
+            that pick up users created by other processes.
+        singleflight_reads (bool): Let concurrent identical user reads
+            share one in-flight database query.
+        import_chunk_size (int): Rows inserted per transaction when
+            importing a file, unless overridden per request.
+        export_batch_size (int): Rows fetched per round trip when streaming
+            a user export.
+        fast_json (bool): Encode user reads directly from the repository
+            rows instead of validating them against the response model
+            first.
+        search_timeout_ms (int): MySQL execution time limit of a user
+            search query, in milliseconds. Set to 0 to disable it.
+        batch_get_max_ids (int): Maximum number of ids per batch lookup.
+        bulk_max_items (int): Maximum number of users per bulk request.
+        bulk_chunk_size (int): Users inserted per transaction in bulk
+            creation.
 
     Configuration:
         Loads values from a `.env` file and ignores any unknown fields.
@@ -30,6 +115,51 @@ class Settings(BaseSettings):
     db_type: str
     db_host: str
     db_port: int
+    db_echo: bool = False
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_slow_query_ms: float = 100.0
+    db_replica_hosts: list[str] = []
+    db_read_your_writes_seconds: float = 5.0
+    db_read_isolation_level: Literal[
+        "READ UNCOMMITTED",
+        "READ COMMITTED",
+        "REPEATABLE READ",
+        "SERIALIZABLE",
+    ] = "READ COMMITTED"
+    db_create_schema: bool = True
+    db_async: bool = False
+    db_async_driver: str = "mysql+aiomysql"
+    user_id_binary: bool = False
+    user_id_time_ordered: bool = True
+    password_hash_scheme: Literal["bcrypt", "argon2"] = "bcrypt"
+    password_hash_rounds: int | None = None
+    password_hash_budget_ms: float = 250.0
+    password_hash_min_rounds: int | None = None
+    password_argon2_memory_kib: int = 65536
+    hash_workers: int = 2
+    hash_batch_workers: int | None = None
+    hash_queue_size: int = 16
+    user_cache_size: int = 10000
+    user_cache_ttl: float = 300.0
+    user_cache_negative_ttl: float = 5.0
+    user_count_ttl: float = 10.0
+    user_count_cache_size: int = 256
+    email_index_enabled: bool = False
+    email_index_capacity: int = 1_000_000
+    email_index_error_rate: float = 0.01
+    email_index_rebuild_seconds: float = 300.0
+    singleflight_reads: bool = True
+    import_chunk_size: int = 1000
+    export_batch_size: int = 1000
+    fast_json: bool = False
+    search_timeout_ms: int = 500
+    batch_get_max_ids: int = 1000
+    bulk_max_items: int = 5000
+    bulk_chunk_size: int = 500
 
     model_config = SettingsConfigDict(extra="ignore")
 
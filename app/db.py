@@ -0,0 +1,60 @@
+"""Database connection URLs built from the settings.
+
+Kept apart from `app.main` so that tools such as `app.migrations` can
+connect without importing the FastAPI app, its routers and middleware.
+
+Key components:
+- `database_url`: Builds the connection URL of the primary or a replica.
+- `replica_urls`: Builds the URLs of `Settings.db_replica_hosts`.
+"""
+
+from sqlalchemy.engine import URL
+
+from app import config
+
+
+def database_url(
+    drivername: str,
+    host: str | None = None,
+    port: int | None = None,
+) -> URL:
+    """Build the database URL from the settings.
+
+    Args:
+        drivername (str): SQLAlchemy dialect and driver, e.g. `mysql`.
+        host (str | None): Server to connect to instead of
+            `Settings.db_host`, e.g. a replica.
+        port (int | None): Port to use instead of `Settings.db_port`.
+
+    Returns:
+        URL: The connection URL.
+
+    """
+    return URL.create(
+        drivername,
+        username=config.settings.db_user,
+        password=config.settings.db_password,
+        host=host or config.settings.db_host,
+        port=port or config.settings.db_port,
+        database=config.settings.db_name,
+    )
+
+
+def replica_urls(drivername: str) -> list[URL]:
+    """Build the URLs of the read replicas from the settings.
+
+    Args:
+        drivername (str): SQLAlchemy dialect and driver, e.g. `mysql`.
+
+    Returns:
+        list[URL]: One URL per entry of `Settings.db_replica_hosts`,
+            given as `host` or `host:port`.
+
+    """
+    urls = []
+    for replica in config.settings.db_replica_hosts:
+        host, _, port = replica.partition(":")
+        urls.append(
+            database_url(drivername, host, int(port) if port else None),
+        )
+    return urls
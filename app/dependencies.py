@@ -3,22 +3,55 @@
 This module defines reusable FastAPI dependency functions to provide database
 sessions and service instances to route handlers.
 
+Each request gets one session acting as its unit of work: GET and HEAD
+requests read in read-only transactions, and other requests commit once
+after the route has returned, or roll back if it raised. The
+dependencies are coroutines, so building the session and the service
+never waits for a threadpool worker; only ending a transaction that
+actually began does.
+
 Key components:
-- `get_session`: Yields a SQLAlchemy session tied to the app lifecycle.
-- `get_user_service`: Provides a fully initialized UserService instance.
-- `UserServiceDep`: Typed annotation for injecting UserService as a dependency.
+- `get_session`: Yields a SQLAlchemy session scoped to the request.
+- `get_async_session`: Yields an `AsyncSession` when async mode is enabled.
+- `get_user_service`: Provides a UserService facade over a blocking session.
+- `get_async_user_service`: Provides a UserService facade over an `AsyncSession`.
+- `UserServiceDep`: Typed annotation for injecting UserService as a dependency,
+  bound to the variant selected by `Settings.db_async`.
+- `get_user_loader`: Provides a request-scoped `DataLoader` for users.
+- `UserLoaderDep`: Request-scoped `DataLoader` resolving users by id.
 """
 
+import uuid
+from collections.abc import (
+    Callable,
+)
+from functools import partial
 from typing import Annotated
 
+from anyio import to_thread
 from fastapi import Depends, Request
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.repositories.user import UserRepository
-from app.services.user import UserService
+from app import config
+from app.loaders import DataLoader
+from app.repositories.user import CachedUserRepository, UserRepository
+from app.routing import reads_from_primary
+from app.services.user import AsyncUserService
+from app.singleflight import SingleFlight
+
+_READ_ONLY_METHODS = frozenset({"GET", "HEAD"})
+
 
+def _session_options(request: Request) -> dict[str, bool]:
+    return {
+        "use_primary": reads_from_primary(request),
+        "read_only": request.method in _READ_ONLY_METHODS,
+    }
 
-def get_session(request: Request):
+
+async def get_session(request: Request):
     """Provide a SQLAlchemy session tied to the current request lifecycle.
 
     Args:
@@ -27,32 +60,163 @@ def get_session(request: Request):
     Yields:
         Session: A SQLAlchemy session instance.
 
-    This function ensures the session is properly closed after the request.
+    The session of a write request is committed once the route returns.
+    It is always closed after the request, on the threadpool if a
+    transaction has to be ended. Requests within their read-your-writes
+    window get a session reading from the primary.
 
     """
     SessionLocal = request.app.state.SessionLocal
-    session = SessionLocal()
+    options = _session_options(request)
+    session = SessionLocal(**options)
+    request.state.db_session = session
     try:
         yield session
+        if not options["read_only"] and session.in_transaction():
+            await to_thread.run_sync(session.commit)
     finally:
-        session.close()
+        if session.in_transaction():
+            await to_thread.run_sync(session.close)
+        else:
+            session.close()
+
+
+async def get_async_session(request: Request):
+    """Provide an async SQLAlchemy session tied to the current request lifecycle.
+
+    Args:
+        request (Request): The incoming FastAPI request object.
 
+    Yields:
+        AsyncSession: An async SQLAlchemy session instance.
+
+    The session of a write request is committed once the route returns.
 
-def get_user_service(
+    """
+    SessionLocal = request.app.state.SessionLocal
+    options = _session_options(request)
+    async with SessionLocal(**options) as session:
+        request.state.db_session = session.sync_session
+        yield session
+        if not options["read_only"] and session.in_transaction():
+            await session.commit()
+
+
+def _repo_factory(
+    request: Request,
+    session: Session,
+) -> Callable[[Session], UserRepository]:
+    cache = request.app.state.user_cache
+    email_index = request.app.state.email_index
+    # The caches are filled from replicas, which a read pinned to the
+    # primary must not see either.
+    if getattr(session, "use_primary", False):
+        return partial(UserRepository, email_index=email_index)
+    counts = {
+        "count_cache": request.app.state.count_cache,
+        "count_ttl": config.settings.user_count_ttl,
+    }
+    if cache is None:
+        return partial(
+            UserRepository,
+            email_index=email_index,
+            **counts,
+        )
+    return partial(
+        CachedUserRepository,
+        cache=cache,
+        ttl=config.settings.user_cache_ttl,
+        negative_ttl=config.settings.user_cache_negative_ttl,
+        email_index=email_index,
+        **counts,
+    )
+
+
+def _singleflight(
+    request: Request,
+    session: Session,
+) -> SingleFlight | None:
+    # A read pinned to the primary must not share a replica's answer.
+    if getattr(session, "use_primary", False):
+        return None
+    return request.app.state.singleflight
+
+
+async def get_user_service(
+    request: Request,
     session: Session = Depends(get_session),
-) -> UserService:
-    """Provide a UserService instance with an attached repository.
+) -> AsyncUserService:
+    """Provide a UserService facade running on the threadpool.
 
     Args:
+        request (Request): The incoming FastAPI request object.
         session (Session): Injected SQLAlchemy session.
 
     Returns:
-        UserService: A fully initialized user service.
+        AsyncUserService: A fully initialized user service.
 
     """
-    repo = UserRepository(session)
-    return UserService(repo)
+    return AsyncUserService.threaded(
+        session,
+        hasher=request.app.state.password_hasher,
+        repo_factory=_repo_factory(request, session),
+        singleflight=_singleflight(request, session),
+    )
+
+
+async def get_async_user_service(
+    request: Request,
+    session: AsyncSession = Depends(get_async_session),
+) -> AsyncUserService:
+    """Provide a UserService facade running on an async session.
+
+    Args:
+        request (Request): The incoming FastAPI request object.
+        session (AsyncSession): Injected async SQLAlchemy session.
+
+    Returns:
+        AsyncUserService: A fully initialized user service.
+
+    """
+    return AsyncUserService.for_async_session(
+        session,
+        hasher=request.app.state.password_hasher,
+        repo_factory=_repo_factory(request, session.sync_session),
+        singleflight=_singleflight(request, session.sync_session),
+    )
 
 
 # Annotated type alias for injecting the user service
-UserServiceDep = Annotated[UserService, Depends(get_user_service)]
+UserServiceDep = Annotated[
+    AsyncUserService,
+    Depends(
+        get_async_user_service
+        if config.settings.db_async
+        else get_user_service,
+    ),
+]
+
+
+async def get_user_loader(
+    user_service: UserServiceDep,
+) -> DataLoader[uuid.UUID, Row]:
+    """Provide a request-scoped loader resolving users by id.
+
+    FastAPI caches dependencies per request, so every handler and
+    dependency of a request shares the same loader and its batches.
+
+    Args:
+        user_service (AsyncUserService): Injected user service.
+
+    Returns:
+        DataLoader[uuid.UUID, Row]: The loader.
+
+    """
+    return DataLoader(user_service.get_users_by_ids)
+
+
+# Annotated type alias for injecting the request-scoped user loader
+UserLoaderDep = Annotated[
+    DataLoader[uuid.UUID, Row],
+    Depends(get_user_loader),
+]
@@ -0,0 +1,302 @@
+"""In-memory probabilistic index of registered emails.
+
+Most signups use an email nobody has registered, yet checking for
+existing emails costs a database round trip. `EmailIndex` keeps a Bloom
+filter of every stored email: a negative answer is definite and lets the
+repository skip the query, while a positive answer may be a false
+positive and is confirmed against the database. The unique constraint on
+`user.email` stays the source of truth.
+
+The index is built at startup by streaming the `email` column, updated
+on every successful create, and rebuilt periodically to pick up users
+created by other processes. A constraint violation on insert reveals
+such a missed write; the index then stops answering negatives until it
+is rebuilt.
+
+Key components:
+- `BloomFilter`: Fixed-size Bloom filter over strings.
+- `EmailIndexStats`: Lookup, skipped query and false positive counters.
+- `EmailIndex`: Thread-safe, rebuildable email index.
+"""
+
+import asyncio
+import hashlib
+import math
+import threading
+from collections.abc import AsyncIterable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+
+class BloomFilter:
+    """Bloom filter sized for a capacity and a target false positive rate.
+
+    Attributes:
+        capacity (int): Items the filter is sized for.
+        error_rate (float): Target false positive rate at capacity.
+        size (int): Number of bits.
+        hash_count (int): Bits set per item.
+        count (int): Items added so far.
+
+    """
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        """Allocate an empty filter.
+
+        Args:
+            capacity (int): Items the filter is sized for.
+            error_rate (float): Target false positive rate, between 0 and 1.
+
+        """
+        self.capacity = max(capacity, 1)
+        self.error_rate = error_rate
+        self.size = math.ceil(
+            -self.capacity * math.log(error_rate) / math.log(2) ** 2,
+        )
+        self.hash_count = max(
+            1,
+            round(self.size / self.capacity * math.log(2)),
+        )
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> Iterable[int]:
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return (
+            (first + i * second) % self.size
+            for i in range(self.hash_count)
+        )
+
+    def add(self, item: str) -> None:
+        """Add an item to the filter.
+
+        Args:
+            item (str): The item to add.
+
+        """
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: object) -> bool:
+        """Return False if `item` was never added, True if it may have been."""
+        return isinstance(item, str) and all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+    @property
+    def memory_bytes(self) -> int:
+        """Size of the bit array, in bytes."""
+        return len(self._bits)
+
+    @property
+    def estimated_false_positive_rate(self) -> float:
+        """False positive rate expected for the items added so far."""
+        return (
+            1 - math.exp(-self.hash_count * self.count / self.size)
+        ) ** self.hash_count
+
+
+def _add_all(bloom: BloomFilter, emails: Iterable[str]) -> None:
+    for email in emails:
+        bloom.add(email.lower())
+
+
+@dataclass
+class EmailIndexStats:
+    """Cumulative counters of an `EmailIndex`.
+
+    Attributes:
+        lookups (int): Emails checked against the index.
+        skipped_queries (int): Lookups answered as definitely absent.
+        false_positives (int): Lookups reported as possibly present that
+            the database did not confirm.
+        rebuilds (int): Completed rebuilds, including the initial build.
+
+    """
+
+    lookups: int = 0
+    skipped_queries: int = 0
+    false_positives: int = 0
+    rebuilds: int = 0
+
+
+class EmailIndex:
+    """Bloom filter of registered emails, safe to share across threads.
+
+    Emails are normalized to lower case, matching the case-insensitive
+    comparison used for duplicate detection. Until the first build
+    completes, and after a missed write is detected, every email is
+    reported as possibly present so callers fall back to the database.
+
+    Attributes:
+        capacity (int): Emails each filter is sized for.
+        error_rate (float): Target false positive rate at capacity.
+        stats (EmailIndexStats): Lookup counters.
+
+    """
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        """Initialize an index that answers nothing until it is built.
+
+        Args:
+            capacity (int): Emails each filter is sized for. Rebuilds grow
+                it to twice the current number of emails when exceeded.
+            error_rate (float): Target false positive rate at capacity.
+
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.stats = EmailIndexStats()
+        self._filter: BloomFilter | None = None
+        self._pending: list[str] | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        """Whether the index can currently answer negatives."""
+        return self._filter is not None
+
+    def might_contain(self, email: str) -> bool:
+        """Return False only if `email` is definitely not registered.
+
+        Args:
+            email (str): The email to look up.
+
+        Returns:
+            bool: False for a definite negative, True otherwise.
+
+        """
+        bloom = self._filter
+        if bloom is None:
+            return True
+        self.stats.lookups += 1
+        if email.lower() in bloom:
+            return True
+        self.stats.skipped_queries += 1
+        return False
+
+    def record_false_positive(self) -> None:
+        """Count a positive answer the database did not confirm."""
+        if self._filter is not None:
+            self.stats.false_positives += 1
+
+    def add(self, email: str) -> None:
+        """Record a newly registered email.
+
+        Args:
+            email (str): The email that was stored.
+
+        """
+        email = email.lower()
+        with self._lock:
+            if self._filter is not None:
+                self._filter.add(email)
+            if self._pending is not None:
+                self._pending.append(email)
+
+    def mark_stale(self) -> None:
+        """Stop answering negatives until the next rebuild.
+
+        Called when an insert hits the unique constraint for an email the
+        index did not know, i.e. one written by another process.
+        """
+        with self._lock:
+            self._filter = None
+
+    def _begin_rebuild(self) -> BloomFilter:
+        with self._lock:
+            self._pending = []
+        return BloomFilter(self.capacity, self.error_rate)
+
+    def _abort_rebuild(self) -> None:
+        with self._lock:
+            self._pending = None
+
+    def _finish_rebuild(self, bloom: BloomFilter) -> None:
+        if bloom.count > self.capacity:
+            # Overfull: answer from it for now, size the next one right.
+            self.capacity = bloom.count * 2
+        with self._lock:
+            for email in self._pending or ():
+                bloom.add(email)
+            self._pending = None
+            self._filter = bloom
+        self.stats.rebuilds += 1
+
+    def rebuild(self, emails: Iterable[str]) -> None:
+        """Replace the filter with one built from `emails`.
+
+        Emails added while the new filter is being built are carried
+        over, so concurrent creates are never lost.
+
+        Args:
+            emails (Iterable[str]): Every registered email, typically
+                streamed from the database.
+
+        """
+        bloom = self._begin_rebuild()
+        try:
+            _add_all(bloom, emails)
+        except BaseException:
+            self._abort_rebuild()
+            raise
+        self._finish_rebuild(bloom)
+
+    async def rebuild_async(
+        self,
+        batches: AsyncIterable[Iterable[str]],
+    ) -> None:
+        """Replace the filter with one built from batches of emails.
+
+        Counterpart of `rebuild` for async database streams: hashing
+        each batch runs in a worker thread so the event loop stays free.
+
+        Args:
+            batches (AsyncIterable[Iterable[str]]): Every registered email,
+                in batches, e.g. `AsyncScalarResult.partitions()`.
+
+        """
+        bloom = self._begin_rebuild()
+        try:
+            async for batch in batches:
+                await asyncio.to_thread(_add_all, bloom, batch)
+        except BaseException:
+            self._abort_rebuild()
+            raise
+        self._finish_rebuild(bloom)
+
+    def report(self) -> dict[str, Any]:
+        """Describe the sizing and effectiveness of the index.
+
+        Returns:
+            dict[str, Any]: Capacity, target error rate, bits, hash count,
+                memory, stored emails, estimated false positive rate and
+                the `EmailIndexStats` counters.
+
+        """
+        bloom = self._filter
+        report: dict[str, Any] = {
+            "ready": bloom is not None,
+            "capacity": self.capacity,
+            "error_rate": self.error_rate,
+        }
+        if bloom is not None:
+            report |= {
+                "bits": bloom.size,
+                "hash_count": bloom.hash_count,
+                "memory_bytes": bloom.memory_bytes,
+                "emails": bloom.count,
+                "estimated_false_positive_rate": (
+                    bloom.estimated_false_positive_rate
+                ),
+            }
+        return report | {
+            "lookups": self.stats.lookups,
+            "skipped_queries": self.stats.skipped_queries,
+            "false_positives": self.stats.false_positives,
+            "rebuilds": self.stats.rebuilds,
+        }
@@ -13,3 +13,48 @@ class ExistingEmailError(Exception):
 
     def __init__(self):
         super().__init__("User with this email already exists")
+
+
+class HashingQueueFullError(Exception):
+    """Exception raised when the password hashing queue is at capacity.
+
+    This is caught in the API layer to return a 503 Service Unavailable response.
+    """
+
+    def __init__(self):
+        super().__init__("Password hashing queue is full")
+
+
+class InvalidCursorError(Exception):
+    """Exception raised when a pagination cursor cannot be decoded.
+
+    This is caught in the API layer to return a 400 Bad Request response.
+    """
+
+    def __init__(self):
+        super().__init__("Invalid pagination cursor")
+
+
+class SearchTimeoutError(Exception):
+    """Exception raised when a user search exceeds its time budget.
+
+    This is caught in the API layer to return a 503 Service Unavailable response.
+    """
+
+    def __init__(self):
+        super().__init__("User search timed out")
+
+
+class SchemaVersionError(Exception):
+    """Exception raised when the database schema is not the expected version.
+
+    Raised on startup so that the process refuses to serve requests.
+    """
+
+    def __init__(self, found: int | None, expected: int):
+        super().__init__(
+            f"Database schema version is {found}, expected {expected}; "
+            "run `python -m app.migrations upgrade`",
+        )
+        self.found = found
+        self.expected = expected
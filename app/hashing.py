@@ -0,0 +1,285 @@
+"""Bounded executor for password hashing.
+
+bcrypt is deliberately slow, so hashing inline on Starlette's shared
+threadpool lets a burst of signups occupy the worker threads that read
+endpoints also need. This module runs hashing on a dedicated, separately
+sized thread pool behind a bounded admission queue, rejecting work once
+the queue is full instead of letting it pile up. Password checks, which
+cost as much as hashing, run on the same pool. Bulk hashing waits for
+its own batch slots instead of taking the admission queue's, so it
+never makes interactive signups fail, and keeps at most one job per
+worker queued ahead of them.
+
+Key components:
+- `PasswordHasher`: Submits hashing jobs to its own pool with backpressure.
+- `HashingStats`: Counters for queue wait and hash time.
+"""
+
+import asyncio
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+from app import exceptions
+
+
+@dataclass
+class HashingStats:
+    """Cumulative timing metrics collected by a `PasswordHasher`.
+
+    Password checks count as hashing jobs.
+
+    Attributes:
+        hashed (int): Number of completed hashing jobs.
+        rejected (int): Number of jobs refused because the queue was full.
+        queue_wait_seconds (float): Total time jobs waited for a worker.
+        hash_seconds (float): Total time spent hashing.
+        max_queue_wait_seconds (float): Longest single queue wait.
+        max_hash_seconds (float): Longest single hash.
+
+    """
+
+    hashed: int = 0
+    rejected: int = 0
+    queue_wait_seconds: float = 0.0
+    hash_seconds: float = 0.0
+    max_queue_wait_seconds: float = 0.0
+    max_hash_seconds: float = 0.0
+
+
+class PasswordHasher:
+    """Run a hashing function on a dedicated, bounded thread pool.
+
+    At most `max_workers + max_pending` jobs are admitted at once. Further
+    submissions fail immediately with `HashingQueueFullError`, so callers
+    can answer with a fast 503 instead of holding a request thread.
+    `hash_many` is admitted separately, with at most `max_batch` of its
+    jobs in flight.
+    """
+
+    def __init__(
+        self,
+        hash_func: Callable[[str], str],
+        max_workers: int = 2,
+        max_pending: int = 16,
+        verify_func: Callable[[str, str], tuple[bool, str | None]]
+        | None = None,
+        max_batch: int | None = None,
+    ) -> None:
+        """Initialize the hasher and its worker pool.
+
+        Args:
+            hash_func (Callable[[str], str]): Function hashing a plaintext password.
+            max_workers (int): Number of hashing threads. Default is 2.
+            max_pending (int): Jobs allowed to wait for a worker. Default is 16.
+            verify_func (Callable[[str, str], tuple[bool, str | None]] | None):
+                Function checking a password against a stored hash and
+                returning a replacement hash if it is outdated, such as
+                `passwords.verify_and_update`. Required by `verify`.
+            max_batch (int | None): `hash_many` jobs queued or running at
+                once. Defaults to `max_workers`, hashing a batch on
+                every worker; lower it to keep workers free for
+                interactive jobs.
+
+        """
+        self._hash_func = hash_func
+        self._verify_func = verify_func
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="password-hasher",
+        )
+        self._slots = threading.BoundedSemaphore(
+            max_workers + max_pending,
+        )
+        self._batch_slots = threading.BoundedSemaphore(
+            max_batch or max_workers,
+        )
+        self._lock = threading.Lock()
+        self.stats = HashingStats()
+
+    def _record(self, queue_wait: float, hash_time: float) -> None:
+        with self._lock:
+            self.stats.hashed += 1
+            self.stats.queue_wait_seconds += queue_wait
+            self.stats.hash_seconds += hash_time
+            self.stats.max_queue_wait_seconds = max(
+                self.stats.max_queue_wait_seconds,
+                queue_wait,
+            )
+            self.stats.max_hash_seconds = max(
+                self.stats.max_hash_seconds,
+                hash_time,
+            )
+
+    def _run(
+        self,
+        slots: threading.BoundedSemaphore,
+        submitted_at: float,
+        func: Callable[..., Any],
+        *args: Any,
+    ) -> Any:
+        started_at = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            finished_at = time.perf_counter()
+            slots.release()
+            self._record(
+                started_at - submitted_at,
+                finished_at - started_at,
+            )
+
+    def _submit(self, func: Callable[..., Any], *args: Any) -> Future:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.stats.rejected += 1
+            raise exceptions.HashingQueueFullError
+        return self._executor.submit(
+            self._run,
+            self._slots,
+            time.perf_counter(),
+            func,
+            *args,
+        )
+
+    def submit(self, password: str) -> Future[str]:
+        """Queue a password for hashing without blocking.
+
+        Args:
+            password (str): The plaintext password to hash.
+
+        Raises:
+            HashingQueueFullError: If the hashing queue is at capacity.
+
+        Returns:
+            Future[str]: A future resolving to the hashed password.
+
+        """
+        return self._submit(self._hash_func, password)
+
+    def hash(self, password: str) -> str:
+        """Hash a password on the dedicated pool and wait for the result.
+
+        Args:
+            password (str): The plaintext password to hash.
+
+        Raises:
+            HashingQueueFullError: If the hashing queue is at capacity.
+
+        Returns:
+            str: The hashed password.
+
+        """
+        return self.submit(password).result()
+
+    def hash_many(self, passwords: Iterable[str]) -> list[str]:
+        """Hash several passwords in parallel on the dedicated pool.
+
+        Unlike `submit`, this waits for a batch slot instead of failing,
+        so bulk work throttles itself to its share of the pool.
+
+        Args:
+            passwords (Iterable[str]): The plaintext passwords to hash.
+
+        Returns:
+            list[str]: The hashed passwords, in input order.
+
+        """
+        futures = []
+        for password in passwords:
+            self._batch_slots.acquire()
+            futures.append(
+                self._executor.submit(
+                    self._run,
+                    self._batch_slots,
+                    time.perf_counter(),
+                    self._hash_func,
+                    password,
+                ),
+            )
+        return [future.result() for future in futures]
+
+    def verify(
+        self,
+        password: str,
+        hashed_password: str,
+    ) -> tuple[bool, str | None]:
+        """Check a password on the dedicated pool and wait for the result.
+
+        Args:
+            password (str): The plaintext password to check.
+            hashed_password (str): The stored hash.
+
+        Raises:
+            HashingQueueFullError: If the hashing queue is at capacity.
+
+        Returns:
+            tuple[bool, str | None]: Whether the password matches, and a
+                replacement for an outdated hash.
+
+        """
+        return self._submit(
+            self._verify_func,
+            password,
+            hashed_password,
+        ).result()
+
+    async def hash_async(self, password: str) -> str:
+        """Hash a password on the dedicated pool without blocking the event loop.
+
+        Args:
+            password (str): The plaintext password to hash.
+
+        Raises:
+            HashingQueueFullError: If the hashing queue is at capacity.
+
+        Returns:
+            str: The hashed password.
+
+        """
+        return await asyncio.wrap_future(self.submit(password))
+
+    async def verify_async(
+        self,
+        password: str,
+        hashed_password: str,
+    ) -> tuple[bool, str | None]:
+        """Check a password on the dedicated pool without blocking the event loop.
+
+        Args:
+            password (str): The plaintext password to check.
+            hashed_password (str): The stored hash.
+
+        Raises:
+            HashingQueueFullError: If the hashing queue is at capacity.
+
+        Returns:
+            tuple[bool, str | None]: Whether the password matches, and a
+                replacement for an outdated hash.
+
+        """
+        return await asyncio.wrap_future(
+            self._submit(self._verify_func, password, hashed_password),
+        )
+
+    async def hash_many_async(
+        self,
+        passwords: Iterable[str],
+    ) -> list[str]:
+        """Async counterpart of `hash_many`.
+
+        Args:
+            passwords (Iterable[str]): The plaintext passwords to hash.
+
+        Returns:
+            list[str]: The hashed passwords, in input order.
+
+        """
+        return await asyncio.to_thread(self.hash_many, list(passwords))
+
+    def shutdown(self) -> None:
+        """Wait for queued jobs to finish and stop the worker threads."""
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,146 @@
+"""Generation and storage of user primary keys.
+
+Random `uuid4` keys stored as 36-character strings make InnoDB's
+clustered index wide and randomly ordered: inserts land on arbitrary
+pages and split them, and every secondary index embeds the full 36-byte
+key. This module provides time-ordered UUIDv7 keys, which are appended
+near the end of the index, and a column type that can store them as 16
+raw bytes. The API keeps speaking canonical UUID strings either way.
+
+The format is chosen once per process with `configure`, before the first
+engine is created. Existing `CHAR(36)` tables are converted with
+`python -m app.migrations`.
+
+Key components:
+- `uuid7`: Monotonic UUIDv7 generator (RFC 9562).
+- `new_id`: Returns a new key in the configured format.
+- `UUIDKey`: Column type storing UUID strings as `CHAR(36)` or
+  `BINARY(16)`.
+- `configure`: Selects the key version and storage format.
+"""
+
+import os
+import threading
+import time
+import uuid
+from typing import Any, ClassVar
+
+from sqlalchemy import BINARY, String
+from sqlalchemy.engine import Dialect
+from sqlalchemy.types import TypeDecorator, TypeEngine
+
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+
+def uuid7() -> uuid.UUID:
+    """Return a UUIDv7: a millisecond timestamp followed by random bits.
+
+    Ids generated by this process are strictly increasing: within one
+    millisecond the 12 `rand_a` bits act as a counter, seeded randomly
+    each millisecond, and the timestamp is advanced if it overflows.
+
+    Returns:
+        uuid.UUID: The new id.
+
+    """
+    global _last_ms, _counter  # noqa: PLW0603
+    with _lock:
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms > _last_ms:
+            _last_ms = now_ms
+            _counter = int.from_bytes(os.urandom(2)) & 0x7FF
+        else:
+            _counter += 1
+            if _counter > 0xFFF:
+                _last_ms += 1
+                _counter = 0
+        timestamp, counter = _last_ms, _counter
+    rand_b = int.from_bytes(os.urandom(8)) & (2**62 - 1)
+    return uuid.UUID(
+        int=(
+            (timestamp & (2**48 - 1)) << 80
+            | 0x7 << 76
+            | counter << 64
+            | 0b10 << 62
+            | rand_b
+        ),
+    )
+
+
+class UUIDKey(TypeDecorator):
+    """UUID column exchanged with Python as a canonical string.
+
+    Values are stored as `CHAR(36)` text by default, or as `BINARY(16)`
+    when `UUIDKey.binary` is set. Both orderings match the order of the
+    canonical strings, so keyset pagination behaves the same.
+    """
+
+    impl = String(36)
+    cache_ok = True
+
+    binary: ClassVar[bool] = False
+
+    def load_dialect_impl(self, dialect: Dialect) -> TypeEngine[Any]:
+        """Pick the storage type for the configured format."""
+        return dialect.type_descriptor(
+            BINARY(16) if self.binary else String(36),
+        )
+
+    def process_bind_param(
+        self,
+        value: Any,
+        dialect: Dialect,
+    ) -> str | bytes | None:
+        """Convert a UUID or UUID string to its stored form."""
+        if value is None:
+            return None
+        if self.binary:
+            return uuid.UUID(str(value)).bytes
+        return str(value)
+
+    def process_result_value(
+        self,
+        value: Any,
+        dialect: Dialect,
+    ) -> str | None:
+        """Convert a stored value back to a canonical UUID string."""
+        if isinstance(value, bytes):
+            return str(uuid.UUID(bytes=value))
+        return value
+
+
+_factory = uuid7
+
+
+def new_id() -> str:
+    """Return a new primary key in the configured format.
+
+    Returns:
+        str: The canonical string of a UUIDv7, or of a UUIDv4 when
+            time-ordered ids are disabled.
+
+    """
+    return str(_factory())
+
+
+def configure(
+    *,
+    binary: bool = False,
+    time_ordered: bool = True,
+) -> None:
+    """Select how new ids are generated and how ids are stored.
+
+    Must run before the engine that uses `UUIDKey` is created.
+
+    Args:
+        binary (bool): Store ids as `BINARY(16)` instead of `CHAR(36)`.
+            Default is False.
+        time_ordered (bool): Generate UUIDv7 instead of random UUIDv4
+            ids. Default is True.
+
+    """
+    global _factory  # noqa: PLW0603
+    UUIDKey.binary = binary
+    _factory = uuid7 if time_ordered else uuid.uuid4
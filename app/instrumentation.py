@@ -0,0 +1,187 @@
+"""Per-request SQL instrumentation.
+
+Engine event hooks count the statements each request executes and how
+long they take. The totals are returned to the client as a
+`Server-Timing` header and logged, and statements slower than a
+configurable threshold are written to a slow-query log with normalized
+SQL, so regressions and N+1 patterns in the repository show up early.
+
+Key components:
+- `QueryStats`: Statement count and database time of one request.
+- `instrument_engine`: Registers the timing hooks on an engine.
+- `QueryStatsMiddleware`: ASGI middleware scoping `QueryStats` to a request.
+- `normalize_sql`: Collapses whitespace and placeholder lists in SQL.
+"""
+
+import logging
+import re
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import Engine, event
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger(f"{__name__}.slow_query")
+
+_WHITESPACE = re.compile(r"\s+")
+_PLACEHOLDER_LIST = re.compile(
+    r"\(\s*(?:%s|\?|:\w+|%\(\w+\)s)(?:\s*,\s*(?:%s|\?|:\w+|%\(\w+\)s))+\s*\)",
+)
+_VALUES_LIST = re.compile(
+    r"(VALUES\s*\(\.\.\.\))(?:\s*,\s*\(\.\.\.\))+",
+)
+
+
+@dataclass
+class QueryStats:
+    """SQL statements executed while handling one request.
+
+    Attributes:
+        count (int): Number of statements executed.
+        seconds (float): Total time spent executing them.
+
+    """
+
+    count: int = 0
+    seconds: float = 0.0
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar(
+    "query_stats",
+    default=None,
+)
+
+
+def current_query_stats() -> QueryStats | None:
+    """Return the statistics of the request being handled, if any."""
+    return _current_stats.get()
+
+
+def normalize_sql(statement: str) -> str:
+    """Normalize a SQL statement for grouping in the slow-query log.
+
+    Whitespace is collapsed and placeholder lists such as
+    `IN (?, ?, ?)` or multi-row `VALUES` become `(...)`, so statements
+    differing only in batch size are logged identically.
+
+    Args:
+        statement (str): The SQL statement.
+
+    Returns:
+        str: The normalized statement.
+
+    """
+    normalized = _WHITESPACE.sub(" ", statement).strip()
+    normalized = _PLACEHOLDER_LIST.sub("(...)", normalized)
+    return _VALUES_LIST.sub(r"\1", normalized)
+
+
+def instrument_engine(engine: Engine, slow_query_ms: float) -> None:
+    """Register statement timing hooks on an engine.
+
+    Args:
+        engine (Engine): The synchronous engine (use `sync_engine` for an
+            async one).
+        slow_query_ms (float): Statements slower than this many
+            milliseconds are written to the slow-query log.
+
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(
+        conn: Any,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        # Kept on the statement's context, which a failed statement
+        # discards, rather than on the long-lived pooled connection.
+        if context is not None:
+            context.query_started_at = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(
+        conn: Any,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        started_at = getattr(context, "query_started_at", None)
+        if started_at is None:
+            return
+        elapsed = time.perf_counter() - started_at
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.count += 1
+            stats.seconds += elapsed
+        if elapsed * 1000 >= slow_query_ms:
+            slow_query_logger.warning(
+                "Slow query (%.1f ms): %s",
+                elapsed * 1000,
+                normalize_sql(statement),
+            )
+
+
+class QueryStatsMiddleware:
+    """ASGI middleware collecting `QueryStats` for each HTTP request.
+
+    The totals are added to the response as
+    `Server-Timing: db;dur=<ms>;desc="<n> queries"` and logged.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Wrap an ASGI application.
+
+        Args:
+            app (ASGIApp): The application to instrument.
+
+        """
+        self.app = app
+
+    async def __call__(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        """Handle a request with its own `QueryStats` scope."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current_stats.set(stats)
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append(
+                    (
+                        b"server-timing",
+                        (
+                            f"db;dur={stats.seconds * 1000:.2f};"
+                            f'desc="{stats.count} queries"'
+                        ).encode(),
+                    ),
+                )
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_stats.reset(token)
+            logger.info(
+                "%s %s ran %d queries in %.2f ms",
+                scope["method"],
+                scope["path"],
+                stats.count,
+                stats.seconds * 1000,
+            )
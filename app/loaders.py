@@ -0,0 +1,107 @@
+"""Request-scoped batching of lookups by key.
+
+Resolving references one at a time turns a list of N ids into N
+queries. A `DataLoader` collects the keys requested while the event
+loop is busy and resolves them with a single batch call, so code can
+keep asking for one item at a time without paying one round trip each.
+
+Key components:
+- `DataLoader`: Coalesces and memoizes per-key lookups.
+"""
+
+import asyncio
+from collections.abc import (
+    Awaitable,
+    Callable,
+    Hashable,
+    Iterable,
+    Mapping,
+)
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class DataLoader(Generic[K, V]):
+    """Batch and deduplicate lookups by key within a request.
+
+    Every `load` made before the event loop gets back to the loader is
+    queued, and the queue is resolved with one call to `batch_load`.
+    Concurrent handlers, or a handler resolving a list of references,
+    therefore issue one query instead of one per key. Results are
+    memoized for the loader's lifetime, so repeated keys are free.
+
+    Batches run one at a time, since they usually share the request's
+    database session.
+
+    Example:
+        `await asyncio.gather(loader.load(a), loader.load(b))` resolves
+        both keys with a single `batch_load([a, b])` call.
+
+    """
+
+    def __init__(
+        self,
+        batch_load: Callable[[list[K]], Awaitable[Mapping[K, V]]],
+    ) -> None:
+        """Initialize an empty loader.
+
+        Args:
+            batch_load (Callable): Coroutine function resolving a list of
+                keys to a mapping; keys missing from it resolve to None.
+
+        """
+        self._batch_load = batch_load
+        self._futures: dict[K, asyncio.Future[V | None]] = {}
+        self._queue: list[K] = []
+        self._lock = asyncio.Lock()
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def load(self, key: K) -> Awaitable[V | None]:
+        """Schedule `key` for the next batch.
+
+        Args:
+            key (K): The key to resolve.
+
+        Returns:
+            Awaitable[V | None]: Resolves to the value, or None if unknown.
+
+        """
+        future = self._futures.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._futures[key] = loop.create_future()
+            self._queue.append(key)
+            if len(self._queue) == 1:
+                loop.call_soon(self._schedule_dispatch)
+        return future
+
+    async def load_many(self, keys: Iterable[K]) -> list[V | None]:
+        """Resolve several keys in as few batches as possible.
+
+        Args:
+            keys (Iterable[K]): The keys to resolve.
+
+        Returns:
+            list[V | None]: The values, in the order of `keys`.
+
+        """
+        return list(await asyncio.gather(*map(self.load, keys)))
+
+    def _schedule_dispatch(self) -> None:
+        keys, self._queue = self._queue, []
+        task = asyncio.ensure_future(self._dispatch(keys))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, keys: list[K]) -> None:
+        try:
+            async with self._lock:
+                values = await self._batch_load(keys)
+        except Exception as exc:  # noqa: BLE001
+            for key in keys:
+                self._futures.pop(key).set_exception(exc)
+            return
+        for key in keys:
+            self._futures[key].set_result(values.get(key))
@@ -1,23 +1,56 @@
 """FastAPI application setup and startup configuration.
 
 This module initializes the FastAPI app, configures the database connection,
-creates database tables at startup, and includes API routers.
+creates database tables or checks the schema version at startup, and
+includes API routers.
 
 Key components:
-- `lifespan`: Async context manager that sets up the database engine on app startup.
+- `lifespan`: Async context manager that sets up the database engines, the
+  password hashing pool, the user cache and the email index on app startup.
 - `create_db_and_tables`: Initializes database schema from ORM models.
+- `create_db_and_tables_async`: Same as above for an async engine.
+- `check_db_schema`: Refuses to start on a schema version mismatch.
+- `check_db_schema_async`: Same as above for an async engine.
+- `build_email_index`: Fills the email index from the `email` column.
+- `calibrate_password_hashing`: Picks the password hashing cost.
 - `app`: The FastAPI instance with registered routes and lifecycle management.
 """
 
+import asyncio
+import contextlib
+import logging
+import threading
 from contextlib import asynccontextmanager
+from functools import partial
+from typing import Any
 
+from anyio import to_thread
 from fastapi import FastAPI
 from sqlalchemy import Engine
-from sqlalchemy.engine import URL, create_engine
+from sqlalchemy.engine import create_engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import sessionmaker
 
-from app import config, models
+from app import config, ids, models, passwords, schema
+from app.cache import LRUCache
+from app.db import database_url, replica_urls
+from app.email_index import EmailIndex
+from app.hashing import PasswordHasher
+from app.instrumentation import QueryStatsMiddleware, instrument_engine
+from app.metrics import MetricsMiddleware
+from app.pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool
+from app.repositories.user import UserRepository, select_emails
+from app.routers import metrics as metrics_router
+from app.routers import stats as stats_router
 from app.routers import user as users_router
+from app.routing import ReadYourWritesMiddleware, RoutingSession
+from app.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
 
 
 def create_db_and_tables(engine: Engine) -> None:
@@ -30,13 +63,150 @@ def create_db_and_tables(engine: Engine) -> None:
     models.Base.metadata.create_all(engine)
 
 
+async def create_db_and_tables_async(engine: AsyncEngine) -> None:
+    """Create all tables defined in the ORM models using an async engine.
+
+    Args:
+        engine (AsyncEngine): Async SQLAlchemy engine.
+
+    """
+    async with engine.begin() as connection:
+        await connection.run_sync(models.Base.metadata.create_all)
+
+
+def check_db_schema(engine: Engine) -> None:
+    """Ensure the database schema is the version the models describe.
+
+    Args:
+        engine (Engine): SQLAlchemy engine used to connect to the database.
+
+    Raises:
+        exceptions.SchemaVersionError: If the schema is missing or is
+            another version.
+
+    """
+    with engine.connect() as connection:
+        schema.check_version(connection)
+
+
+async def check_db_schema_async(engine: AsyncEngine) -> None:
+    """Ensure the database schema is current using an async engine.
+
+    Args:
+        engine (AsyncEngine): Async SQLAlchemy engine.
+
+    Raises:
+        exceptions.SchemaVersionError: If the schema is missing or is
+            another version.
+
+    """
+    async with engine.connect() as connection:
+        await connection.run_sync(schema.check_version)
+
+
+async def build_email_index(app: FastAPI) -> None:
+    """Rebuild `app.state.email_index` by streaming every stored email.
+
+    Args:
+        app (FastAPI): The application whose state holds the index and
+            the session factory.
+
+    """
+    index: EmailIndex = app.state.email_index
+    if config.settings.db_async:
+        async with app.state.SessionLocal() as session:
+            result = await session.stream_scalars(select_emails())
+            await index.rebuild_async(result.partitions())
+        return
+
+    def rebuild() -> None:
+        with app.state.SessionLocal() as session:
+            index.rebuild(UserRepository(session).stream_emails())
+
+    await to_thread.run_sync(rebuild)
+
+
+async def calibrate_password_hashing(
+    app: FastAPI,
+    stop: threading.Event,
+) -> None:
+    """Pick the cost of new password hashes on the running hardware.
+
+    Measures hashing off the event loop, switches the hashing policy to
+    the highest cost within `Settings.password_hash_budget_ms`, and
+    records the outcome as `app.state.password_calibration`. The worker
+    thread is never abandoned: setting `stop` ends the measurements
+    after the current one, and the outcome is then discarded.
+
+    Args:
+        app (FastAPI): The application whose state holds the outcome.
+        stop (threading.Event): Set on shutdown to end the calibration.
+
+    """
+    settings = config.settings
+    calibration = await to_thread.run_sync(
+        partial(
+            passwords.calibrate,
+            scheme=settings.password_hash_scheme,
+            budget_seconds=settings.password_hash_budget_ms / 1000,
+            min_rounds=settings.password_hash_min_rounds,
+            stop=stop,
+            memory_kib=settings.password_argon2_memory_kib,
+        ),
+    )
+    if stop.is_set():
+        return
+    passwords.configure(
+        settings.password_hash_scheme,
+        calibration.rounds,
+        memory_kib=settings.password_argon2_memory_kib,
+    )
+    app.state.password_calibration = calibration
+    log = logger.info if calibration.within_budget else logger.warning
+    log(
+        "Password hashing calibrated to %s cost %d: %.0f ms per hash, "
+        "budget %.0f ms",
+        calibration.scheme,
+        calibration.rounds,
+        calibration.hash_seconds * 1000,
+        calibration.budget_seconds * 1000,
+    )
+
+
+async def _rebuild_email_index_periodically(app: FastAPI) -> None:
+    while True:
+        await asyncio.sleep(config.settings.email_index_rebuild_seconds)
+        try:
+            await build_email_index(app)
+        except Exception:
+            logger.exception("Email index rebuild failed")
+
+
+def _engine_options() -> dict[str, Any]:
+    return {
+        "echo": config.settings.db_echo,
+        "pool_size": config.settings.db_pool_size,
+        "max_overflow": config.settings.db_max_overflow,
+        "pool_timeout": config.settings.db_pool_timeout,
+        "pool_recycle": config.settings.db_pool_recycle,
+        "pool_pre_ping": config.settings.db_pool_pre_ping,
+    }
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """FastAPI lifespan context manager to set up and tear down application resources.
 
-    Initializes the SQLAlchemy engine and session factory,
-    attaches them to the FastAPI app state, and ensures database
-    tables are created before serving requests.
+    Selects the user id format, initializes the SQLAlchemy engines of the
+    primary and of any read replicas with their SQL instrumentation
+    hooks, the routing session factory, password hashing pool, user
+    and count caches, read coalescer and email index, attaches them to
+    the FastAPI
+    app state, and ensures database tables are created before serving
+    requests; with `Settings.db_create_schema` disabled it only checks
+    the schema version instead. The email index is built before the
+    first request and then rebuilt in the background. When `Settings.db_async` is
+    enabled the engine and sessions are async.
 
     Args:
         app (FastAPI): The FastAPI application instance.
@@ -45,29 +215,155 @@ async def lifespan(app: FastAPI):
         None: Keeps the app running while the context is active.
 
     """
-    url_object = URL.create(
-        config.settings.db_type,
-        username=config.settings.db_user,
-        password=config.settings.db_password,
-        host=config.settings.db_host,
-        port=config.settings.db_port,
-        database=config.settings.db_name,
+    ids.configure(
+        binary=config.settings.user_id_binary,
+        time_ordered=config.settings.user_id_time_ordered,
     )
+    if config.settings.db_async:
+        engine = create_async_engine(
+            database_url(config.settings.db_async_driver),
+            poolclass=InstrumentedAsyncQueuePool,
+            **_engine_options(),
+        )
+        replicas = [
+            create_async_engine(
+                url,
+                poolclass=InstrumentedAsyncQueuePool,
+                **_engine_options(),
+            )
+            for url in replica_urls(config.settings.db_async_driver)
+        ]
+        SessionLocal = async_sessionmaker(
+            sync_session_class=RoutingSession,
+            primary=engine.sync_engine,
+            replicas=[replica.sync_engine for replica in replicas],
+            isolation_level=config.settings.db_read_isolation_level,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+        sync_engines = [engine.sync_engine] + [
+            replica.sync_engine for replica in replicas
+        ]
+    else:
+        engine = create_engine(
+            database_url(config.settings.db_type),
+            poolclass=InstrumentedQueuePool,
+            **_engine_options(),
+        )
+        replicas = [
+            create_engine(
+                url,
+                poolclass=InstrumentedQueuePool,
+                **_engine_options(),
+            )
+            for url in replica_urls(config.settings.db_type)
+        ]
+        SessionLocal = sessionmaker(
+            class_=RoutingSession,
+            primary=engine,
+            replicas=replicas,
+            isolation_level=config.settings.db_read_isolation_level,
+            autocommit=False,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+        sync_engines = [engine, *replicas]
 
-    engine = create_engine(url_object, echo=True)
-    SessionLocal = sessionmaker(
-        autocommit=False,
-        autoflush=False,
-        bind=engine,
-    )
+    for sync_engine in sync_engines:
+        instrument_engine(
+            sync_engine,
+            slow_query_ms=config.settings.db_slow_query_ms,
+        )
 
     app.state.db_engine = engine
+    app.state.db_replicas = replicas
     app.state.SessionLocal = SessionLocal
+    passwords.configure(
+        config.settings.password_hash_scheme,
+        config.settings.password_hash_rounds
+        or max(
+            config.settings.password_hash_min_rounds or 0,
+            passwords.MIN_ROUNDS[config.settings.password_hash_scheme],
+        ),
+        memory_kib=config.settings.password_argon2_memory_kib,
+    )
+    app.state.password_calibration = None
+    app.state.password_hasher = PasswordHasher(
+        passwords.hash_password,
+        max_workers=config.settings.hash_workers,
+        max_pending=config.settings.hash_queue_size,
+        verify_func=passwords.verify_and_update,
+        max_batch=config.settings.hash_batch_workers,
+    )
+    app.state.user_cache = (
+        LRUCache(max_size=config.settings.user_cache_size)
+        if config.settings.user_cache_size > 0
+        else None
+    )
+    app.state.count_cache = (
+        LRUCache(max_size=config.settings.user_count_cache_size)
+        if config.settings.user_count_cache_size > 0
+        else None
+    )
+    app.state.singleflight = (
+        SingleFlight() if config.settings.singleflight_reads else None
+    )
+    app.state.email_index = (
+        EmailIndex(
+            capacity=config.settings.email_index_capacity,
+            error_rate=config.settings.email_index_error_rate,
+        )
+        if config.settings.email_index_enabled
+        else None
+    )
+
+    if not config.settings.db_create_schema:
+        if config.settings.db_async:
+            await check_db_schema_async(engine=engine)
+        else:
+            check_db_schema(engine=engine)
+    elif config.settings.db_async:
+        await create_db_and_tables_async(engine=engine)
+    else:
+        create_db_and_tables(engine=engine)
 
-    create_db_and_tables(engine=engine)
+    tasks = []
+    stop_calibration = threading.Event()
+    if app.state.email_index is not None:
+        await build_email_index(app)
+        tasks.append(
+            asyncio.create_task(_rebuild_email_index_periodically(app)),
+        )
+    if config.settings.password_hash_rounds is None:
+        tasks.append(
+            asyncio.create_task(
+                calibrate_password_hashing(app, stop_calibration),
+            ),
+        )
     yield
+    stop_calibration.set()
+    for task in tasks:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+    app.state.password_hasher.shutdown()
+    if config.settings.db_async:
+        for async_engine in [engine, *replicas]:
+            await async_engine.dispose()
 
 
 app = FastAPI(lifespan=lifespan)
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(
+    ReadYourWritesMiddleware,
+    window_seconds=(
+        config.settings.db_read_your_writes_seconds
+        if config.settings.db_replica_hosts
+        else 0
+    ),
+)
 
 app.include_router(users_router.router)
+app.include_router(stats_router.router)
+app.include_router(metrics_router.router)
@@ -0,0 +1,406 @@
+"""Prometheus-compatible metrics.
+
+This module collects per-route request counts and latency histograms in
+an ASGI middleware and renders them, together with the hashing pool,
+connection pool, cache, read coalescing and email index counters and
+the password hashing cost, in the Prometheus text exposition format. Routes are labelled by their
+template (e.g. `/users/{user_id}`) rather than the raw path to keep
+label cardinality bounded, and connection pools by their engine:
+`primary` or the replica's `host:port`.
+
+The middleware runs on the event loop thread, so recording a request
+is a couple of dictionary updates with no locking.
+
+Key components:
+- `RequestMetrics`: Request counters, latency histograms and in-flight gauge.
+- `MetricsMiddleware`: ASGI middleware feeding `RequestMetrics`.
+- `render_metrics`: Renders every metric in the text exposition format.
+- `request_metrics`: Process-wide `RequestMetrics` instance.
+"""
+
+import time
+from bisect import bisect_left
+from collections.abc import Iterable, Mapping
+from dataclasses import asdict
+from typing import Any
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.cache import CacheBackend
+from app.email_index import EmailIndex
+from app.hashing import PasswordHasher
+from app.passwords import Calibration
+from app.pool import pool_status
+from app.singleflight import SingleFlight
+
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.075,
+    0.1,
+    0.25,
+    0.5,
+    0.75,
+    1.0,
+    2.5,
+    5.0,
+    7.5,
+    10.0,
+)
+
+
+class _Histogram:
+    __slots__ = ("counts", "total")
+
+    def __init__(self, size: int) -> None:
+        self.counts = [0] * (size + 1)
+        self.total = 0.0
+
+
+class RequestMetrics:
+    """HTTP request counters and latency histograms keyed by route template.
+
+    Attributes:
+        buckets (tuple[float, ...]): Histogram upper bounds, in seconds.
+        in_flight (int): Requests currently being handled.
+        requests (dict): Request count per (method, route, status).
+        durations (dict): Latency histogram per (method, route).
+
+    """
+
+    def __init__(
+        self,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        """Initialize empty metrics.
+
+        Args:
+            buckets (tuple[float, ...]): Histogram upper bounds, in seconds.
+
+        """
+        self.buckets = buckets
+        self.in_flight = 0
+        self.requests: dict[tuple[str, str, str], int] = {}
+        self.durations: dict[tuple[str, str], _Histogram] = {}
+
+    def observe(
+        self,
+        method: str,
+        route: str,
+        status: int,
+        seconds: float,
+    ) -> None:
+        """Record a finished request.
+
+        Args:
+            method (str): HTTP method.
+            route (str): Route template, not the raw path.
+            status (int): Response status code.
+            seconds (float): Time taken to handle the request.
+
+        """
+        key = (method, route, str(status))
+        self.requests[key] = self.requests.get(key, 0) + 1
+
+        histogram = self.durations.get((method, route))
+        if histogram is None:
+            histogram = self.durations.setdefault(
+                (method, route),
+                _Histogram(len(self.buckets)),
+            )
+        histogram.counts[bisect_left(self.buckets, seconds)] += 1
+        histogram.total += seconds
+
+
+request_metrics = RequestMetrics()
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording every HTTP request in `RequestMetrics`."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        metrics: RequestMetrics = request_metrics,
+    ) -> None:
+        """Wrap an ASGI application.
+
+        Args:
+            app (ASGIApp): The application to measure.
+            metrics (RequestMetrics): Where to record requests.
+
+        """
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        """Handle a request while measuring it."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        self.metrics.in_flight += 1
+        started_at = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.metrics.in_flight -= 1
+            route = scope.get("route")
+            self.metrics.observe(
+                scope["method"],
+                getattr(route, "path_format", "unmatched"),
+                status,
+                time.perf_counter() - started_at,
+            )
+
+
+def _escape(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("\n", "\\n")
+    )
+
+
+def _labels(**labels: str) -> str:
+    pairs = (
+        f'{name}="{_escape(value)}"' for name, value in labels.items()
+    )
+    return "{" + ",".join(pairs) + "}"
+
+
+def _metric(
+    name: str,
+    kind: str,
+    help_text: str,
+    samples: Iterable[tuple[str, str, float]],
+) -> list[str]:
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    lines.extend(
+        f"{name}{suffix}{labels} {value}"
+        for suffix, labels, value in samples
+    )
+    return lines
+
+
+def _histogram_samples(
+    metrics: RequestMetrics,
+) -> Iterable[tuple[str, str, float]]:
+    bounds = [*map(str, metrics.buckets), "+Inf"]
+    for (method, route), histogram in list(metrics.durations.items()):
+        cumulative = 0
+        for bound, count in zip(bounds, histogram.counts, strict=True):
+            cumulative += count
+            yield (
+                "_bucket",
+                _labels(method=method, route=route, le=bound),
+                cumulative,
+            )
+        labels = _labels(method=method, route=route)
+        yield "_sum", labels, histogram.total
+        yield "_count", labels, cumulative
+
+
+def render_metrics(
+    metrics: RequestMetrics,
+    hasher: PasswordHasher | None = None,
+    pools: Mapping[str, Any] | None = None,
+    cache: CacheBackend | None = None,
+    singleflight: SingleFlight | None = None,
+    email_index: EmailIndex | None = None,
+    password_policy: dict[str, Any] | None = None,
+    password_calibration: Calibration | None = None,
+) -> str:
+    """Render all metrics in the Prometheus text exposition format.
+
+    Args:
+        metrics (RequestMetrics): HTTP request metrics.
+        hasher (PasswordHasher | None): Hashing pool to report on.
+        pools (Mapping[str, Any] | None): Connection pools to report
+            on, keyed by engine label, as returned by
+            `pool.engine_pools`.
+        cache (CacheBackend | None): User cache to report on.
+        singleflight (SingleFlight | None): Read coalescer to report on.
+        email_index (EmailIndex | None): Email index to report on.
+        password_policy (dict[str, Any] | None): Scheme and cost of new
+            password hashes, as returned by `passwords.policy`.
+        password_calibration (Calibration | None): Outcome of the
+            password hashing calibration, if it ran.
+
+    Returns:
+        str: The exposition text.
+
+    """
+    lines = _metric(
+        "http_requests_total",
+        "counter",
+        "HTTP requests by method, route template and status.",
+        (
+            (
+                "",
+                _labels(method=method, route=route, status=status),
+                count,
+            )
+            for (method, route, status), count in list(
+                metrics.requests.items(),
+            )
+        ),
+    )
+    lines += _metric(
+        "http_request_duration_seconds",
+        "histogram",
+        "HTTP request latency by method and route template.",
+        _histogram_samples(metrics),
+    )
+    lines += _metric(
+        "http_requests_in_flight",
+        "gauge",
+        "HTTP requests currently being handled.",
+        [("", "", metrics.in_flight)],
+    )
+
+    if hasher is not None:
+        stats = hasher.stats
+        lines += _metric(
+            "password_hash_duration_seconds",
+            "summary",
+            "Time spent hashing passwords.",
+            [
+                ("_sum", "", stats.hash_seconds),
+                ("_count", "", stats.hashed),
+            ],
+        )
+        lines += _metric(
+            "password_hash_queue_wait_seconds",
+            "summary",
+            "Time hashing jobs waited for a worker.",
+            [
+                ("_sum", "", stats.queue_wait_seconds),
+                ("_count", "", stats.hashed),
+            ],
+        )
+        lines += _metric(
+            "password_hash_rejected_total",
+            "counter",
+            "Hashing jobs rejected because the queue was full.",
+            [("", "", stats.rejected)],
+        )
+
+    if password_policy is not None:
+        lines += _metric(
+            "password_hash_cost",
+            "gauge",
+            "Cost of new password hashes.",
+            [
+                (
+                    "",
+                    _labels(scheme=password_policy["scheme"]),
+                    password_policy["rounds"],
+                ),
+            ],
+        )
+    if password_calibration is not None:
+        lines += _metric(
+            "password_hash_calibrated_seconds",
+            "gauge",
+            "Time of one hash measured by the cost calibration.",
+            [("", "", password_calibration.hash_seconds)],
+        )
+        lines += _metric(
+            "password_hash_budget_seconds",
+            "gauge",
+            "Latency budget of one password hash.",
+            [("", "", password_calibration.budget_seconds)],
+        )
+
+    if pools:
+        samples: dict[str, list[tuple[str, str, float]]] = {}
+        for engine, pool in pools.items():
+            for key, value in pool_status(pool).items():
+                samples.setdefault(key, []).append(
+                    ("", _labels(engine=engine), value),
+                )
+        for key, values in samples.items():
+            kind = "gauge"
+            name = f"db_pool_{key}"
+            if key in {
+                "checkouts",
+                "timeouts",
+                "checkout_wait_seconds",
+            }:
+                kind = "counter"
+                name += "_total"
+            lines += _metric(
+                name,
+                kind,
+                f"Connection pool {key.replace('_', ' ')} by engine.",
+                values,
+            )
+
+    if cache is not None:
+        for key, value in asdict(cache.stats).items():
+            lines += _metric(
+                f"user_cache_{key}_total",
+                "counter",
+                f"User cache {key}.",
+                [("", "", value)],
+            )
+        lines += _metric(
+            "user_cache_size",
+            "gauge",
+            "Entries in the user cache.",
+            [("", "", len(cache))],
+        )
+
+    if singleflight is not None:
+        lines += _metric(
+            "singleflight_calls_total",
+            "counter",
+            "User reads made through the read coalescer.",
+            [("", "", singleflight.stats.calls)],
+        )
+        lines += _metric(
+            "singleflight_deduplicated_total",
+            "counter",
+            "User reads served by another in-flight query.",
+            [("", "", singleflight.stats.deduplicated)],
+        )
+
+    if email_index is not None:
+        for key, value in asdict(email_index.stats).items():
+            lines += _metric(
+                f"email_index_{key}_total",
+                "counter",
+                f"Email index {key.replace('_', ' ')}.",
+                [("", "", value)],
+            )
+        report = email_index.report()
+        for key in (
+            "memory_bytes",
+            "emails",
+            "estimated_false_positive_rate",
+        ):
+            if key in report:
+                lines += _metric(
+                    f"email_index_{key}",
+                    "gauge",
+                    f"Email index {key.replace('_', ' ')}.",
+                    [("", "", report[key])],
+                )
+
+    return "\n".join(lines) + "\n"
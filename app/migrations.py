@@ -0,0 +1,314 @@
+"""Schema migrations for existing MySQL databases.
+
+The app creates missing tables on startup but never alters existing
+ones, so schema changes to the `user` table are applied with this
+module. Deployments that disable `Settings.db_create_schema` create the
+schema with it too.
+
+- `upgrade`: Create the tables on an empty database, or apply the
+  `search` and `version` migrations still missing from an existing one,
+  and stamp `app.schema.SCHEMA_VERSION`. Run it before rolling out a
+  version whose pods check the schema version on startup.
+
+- `binary` / `char`: Convert `user.id` between `CHAR(36)` and
+  `BINARY(16)`, required before switching `Settings.user_id_binary`.
+  Ids keep their value: `UUID_TO_BIN` stores the 16 bytes in canonical
+  order, so API ids and keyset cursors stay valid and `BIN_TO_UUID`
+  converts them back. Changing the primary key rebuilds the table and
+  blocks writes while it runs. Stop the app, migrate, then start it with
+  the matching `USER_ID_BINARY` value.
+- `search`: Add the `email_normalized` generated column and the indexes
+  used by `GET /users/search` and case-insensitive email filters. Run it
+  before deploying a version that reads them.
+- `version`: Add the `version` column that HTTP ETags are built from.
+- `email`: Make the `email_normalized` index unique, in place of the
+  unique key on `email`, so emails differing only in case are taken.
+  Fails while such duplicates exist; merge or rename them first.
+
+Usage:
+    python -m app.migrations upgrade
+    python -m app.migrations binary [--batch-size 10000]
+    python -m app.migrations char [--batch-size 10000]
+    python -m app.migrations search
+    python -m app.migrations version
+    python -m app.migrations email
+"""
+
+import argparse
+
+from sqlalchemy import BINARY, Connection, inspect, text
+from sqlalchemy.engine import create_engine
+
+from app import config, models, schema
+from app.db import database_url
+
+_TABLE = "`user`"
+
+
+def _id_is_binary(connection: Connection) -> bool:
+    columns = inspect(connection).get_columns("user")
+    id_type = next(
+        column["type"] for column in columns if column["name"] == "id"
+    )
+    return isinstance(id_type, BINARY)
+
+
+def _convert(
+    connection: Connection,
+    column_type: str,
+    function: str,
+    batch_size: int,
+) -> None:
+    connection.execute(
+        text(
+            f"ALTER TABLE {_TABLE} ADD COLUMN new_id {column_type} NULL",
+        ),
+    )
+    connection.commit()
+    while True:
+        result = connection.execute(
+            text(
+                f"UPDATE {_TABLE} SET new_id = {function}(id) "
+                "WHERE new_id IS NULL LIMIT :batch_size",
+            ),
+            {"batch_size": batch_size},
+        )
+        connection.commit()
+        if result.rowcount < batch_size:
+            break
+    connection.execute(
+        text(
+            f"ALTER TABLE {_TABLE} DROP PRIMARY KEY, DROP COLUMN id, "
+            f"CHANGE COLUMN new_id id {column_type} NOT NULL FIRST, "
+            "ADD PRIMARY KEY (id)",
+        ),
+    )
+    connection.commit()
+
+
+def to_binary(connection: Connection, batch_size: int = 10000) -> bool:
+    """Convert `user.id` from `CHAR(36)` to `BINARY(16)`.
+
+    Args:
+        connection (Connection): Connection to the MySQL database.
+        batch_size (int): Rows converted per transaction. Default is 10000.
+
+    Returns:
+        bool: False if the column was already binary.
+
+    """
+    if _id_is_binary(connection):
+        return False
+    _convert(connection, "BINARY(16)", "UUID_TO_BIN", batch_size)
+    return True
+
+
+def to_char(connection: Connection, batch_size: int = 10000) -> bool:
+    """Convert `user.id` from `BINARY(16)` back to `CHAR(36)`.
+
+    Args:
+        connection (Connection): Connection to the MySQL database.
+        batch_size (int): Rows converted per transaction. Default is 10000.
+
+    Returns:
+        bool: False if the column was already textual.
+
+    """
+    if not _id_is_binary(connection):
+        return False
+    _convert(connection, "VARCHAR(36)", "BIN_TO_UUID", batch_size)
+    return True
+
+
+def add_search_indexes(connection: Connection) -> bool:
+    """Add `email_normalized` and the indexes used by user search.
+
+    Args:
+        connection (Connection): Connection to the MySQL database.
+
+    Returns:
+        bool: False if the column and indexes already existed.
+
+    """
+    inspector = inspect(connection)
+    columns = {
+        column["name"] for column in inspector.get_columns("user")
+    }
+    indexes = {index["name"] for index in inspector.get_indexes("user")}
+    changes = []
+    if "email_normalized" not in columns:
+        changes.append(
+            "ADD COLUMN email_normalized VARCHAR(100) "
+            "GENERATED ALWAYS AS (lower(email)) STORED",
+        )
+    if "ix_user_email_normalized" not in indexes:
+        changes.append(
+            "ADD INDEX ix_user_email_normalized (email_normalized)",
+        )
+    if "ix_user_full_name" not in indexes:
+        changes.append("ADD INDEX ix_user_full_name (full_name)")
+    if not changes:
+        return False
+    connection.execute(
+        text(f"ALTER TABLE {_TABLE} {', '.join(changes)}"),
+    )
+    connection.commit()
+    return True
+
+
+def add_version_column(connection: Connection) -> bool:
+    """Add the `version` column, starting every existing row at 1.
+
+    Args:
+        connection (Connection): Connection to the MySQL database.
+
+    Returns:
+        bool: False if the column already existed.
+
+    """
+    columns = inspect(connection).get_columns("user")
+    if any(column["name"] == "version" for column in columns):
+        return False
+    connection.execute(
+        text(
+            f"ALTER TABLE {_TABLE} "
+            "ADD COLUMN version INTEGER NOT NULL DEFAULT 1",
+        ),
+    )
+    connection.commit()
+    return True
+
+
+def make_emails_case_insensitive(connection: Connection) -> bool:
+    """Move email uniqueness from `email` to `email_normalized`.
+
+    Args:
+        connection (Connection): Connection to the MySQL database.
+
+    Returns:
+        bool: False if `email_normalized` was already the unique key.
+
+    """
+    indexes = inspect(connection).get_indexes("user")
+    if any(
+        index["name"] == "ix_user_email_normalized" and index["unique"]
+        for index in indexes
+    ):
+        return False
+    changes = [
+        f"DROP INDEX {index['name']}"
+        for index in indexes
+        if index["unique"] and index["column_names"] == ["email"]
+    ]
+    changes += [
+        "DROP INDEX ix_user_email_normalized",
+        "ADD UNIQUE INDEX ix_user_email_normalized (email_normalized)",
+    ]
+    connection.execute(
+        text(f"ALTER TABLE {_TABLE} {', '.join(changes)}"),
+    )
+    connection.commit()
+    return True
+
+
+_UPGRADES = (
+    (2, add_search_indexes),
+    (3, add_version_column),
+    (4, make_emails_case_insensitive),
+)
+
+# Outcome reported by each target: (when applied, when already done).
+_MESSAGES = {
+    "binary": ("user.id converted to binary", "user.id already binary"),
+    "char": ("user.id converted to char", "user.id already char"),
+    "search": (
+        "search indexes added",
+        "search indexes already present",
+    ),
+    "version": (
+        "version column added",
+        "version column already present",
+    ),
+    "email": (
+        "email uniqueness made case-insensitive",
+        "email uniqueness already case-insensitive",
+    ),
+}
+
+
+def upgrade(connection: Connection) -> int | None:
+    """Bring the schema to `schema.SCHEMA_VERSION` and stamp it.
+
+    An empty database gets every table created at once. Otherwise the
+    migrations newer than the stamped version run in order; an unstamped
+    database runs all of them, as they skip changes already present.
+
+    Args:
+        connection (Connection): Connection to the database.
+
+    Returns:
+        int | None: The version the schema was at, or None if it was
+            never stamped.
+
+    """
+    current = schema.get_version(connection)
+    if current == schema.SCHEMA_VERSION:
+        return current
+    if current is None and not inspect(connection).has_table("user"):
+        models.Base.metadata.create_all(connection)
+    else:
+        for version, migrate in _UPGRADES:
+            if current is None or current < version:
+                migrate(connection)
+        models.SchemaVersion.__table__.create(
+            connection, checkfirst=True
+        )
+    schema.stamp(connection)
+    return current
+
+
+def main() -> None:
+    """Run the migration selected on the command line."""
+    parser = argparse.ArgumentParser(
+        description=__doc__.splitlines()[0],
+    )
+    parser.add_argument(
+        "target",
+        choices=[
+            "upgrade",
+            "binary",
+            "char",
+            "search",
+            "version",
+            "email",
+        ],
+    )
+    parser.add_argument("--batch-size", type=int, default=10000)
+    args = parser.parse_args()
+
+    engine = create_engine(database_url(config.settings.db_type))
+    with engine.connect() as connection:
+        if args.target == "upgrade":
+            previous = upgrade(connection)
+            if previous == schema.SCHEMA_VERSION:
+                print(f"schema already at version {previous}")
+            else:
+                print(
+                    f"schema upgraded to version {schema.SCHEMA_VERSION}"
+                )
+            return
+        if args.target == "search":
+            changed = add_search_indexes(connection)
+        elif args.target == "version":
+            changed = add_version_column(connection)
+        elif args.target == "email":
+            changed = make_emails_case_insensitive(connection)
+        else:
+            migrate = to_binary if args.target == "binary" else to_char
+            changed = migrate(connection, batch_size=args.batch_size)
+    applied, already = _MESSAGES[args.target]
+    print(applied if changed else already)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,15 @@
 """SQLAlchemy ORM models for database schema definitions.
 
-This module defines the `User` model and a declarative `Base` class used to
-construct database tables. It includes field definitions and constraints for
-user-related data.
+This module defines the `User` model, the `SchemaVersion` bookkeeping
+table and a declarative `Base` class used to construct database tables. It
+includes field definitions and constraints for user-related data.
 """
 
-import uuid
-
-from sqlalchemy import Column, String
+from sqlalchemy import Column, Computed, Integer, String
 from sqlalchemy.orm import DeclarativeBase
 
+from app import ids
+
 
 class Base(DeclarativeBase):
     """Declarative base class for all ORM models.
@@ -22,24 +22,65 @@ class User(Base):
     """ORM model representing a user in the system.
 
     Attributes:
-        id (str): Unique identifier for the user (UUID string).
+        id (str): Unique identifier for the user (UUID string), stored as
+            configured in `app.ids`.
         username (str): The user's login username.
         full_name (str | None): The user's full name (optional).
         phone_number (str | None): The user's phone number (optional).
-        email (str): The user's email address (must be unique).
+        email (str): The user's email address, as entered.
+        email_normalized (str): Lower-cased `email`, generated by the
+            database. Its unique index makes emails unique regardless of
+            case and serves every email lookup.
         password (str): Hashed password for the user.
+        version (int): Row version, incremented by the ORM on every
+            update; used to build HTTP ETags.
 
     """
 
     __tablename__ = "user"
 
     id = Column(
-        String(36),
+        ids.UUIDKey(),
         primary_key=True,
-        default=lambda: str(uuid.uuid4()),
+        default=ids.new_id,
     )
     username = Column(String(100), index=True)
-    full_name = Column(String(100), nullable=True, default=None)
+    full_name = Column(
+        String(100),
+        nullable=True,
+        default=None,
+        index=True,
+    )
     phone_number = Column(String(30), nullable=True, default=None)
-    email = Column(String(100), unique=True)
+    email = Column(String(100))
+    email_normalized = Column(
+        String(100),
+        Computed("lower(email)", persisted=True),
+        index=True,
+        unique=True,
+    )
     password = Column(String(100))
+    version = Column(
+        Integer,
+        nullable=False,
+        default=1,
+        server_default="1",
+    )
+
+    __mapper_args__ = {"version_id_col": version}
+
+
+class SchemaVersion(Base):
+    """ORM model of the single-row table recording the schema version.
+
+    Written by `python -m app.migrations upgrade` and checked on startup
+    when `Settings.db_create_schema` is disabled; see `app.schema`.
+
+    Attributes:
+        version (int): Version of the applied schema.
+
+    """
+
+    __tablename__ = "schema_version"
+
+    version = Column(Integer, primary_key=True)
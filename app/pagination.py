@@ -0,0 +1,55 @@
+"""Opaque cursor helpers for keyset pagination.
+
+A cursor records the sort key of the last row of a page so the next page
+can seek past it with an indexed `WHERE key > ...` instead of scanning
+and discarding `OFFSET` rows. Cursors are URL-safe base64 encoded JSON
+and should be treated as opaque by clients.
+"""
+
+import base64
+import binascii
+import json
+
+from app import exceptions
+
+
+def encode_cursor(*values: str) -> str:
+    """Encode the sort key of the last row of a page as a cursor.
+
+    Args:
+        *values (str): Sort key values, in `ORDER BY` order.
+
+    Returns:
+        str: The opaque cursor string.
+
+    """
+    payload = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int = 1) -> list[str]:
+    """Decode a cursor produced by `encode_cursor`.
+
+    Args:
+        cursor (str): The opaque cursor string.
+        size (int): Expected number of sort key values. Default is 1.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed.
+
+    Returns:
+        list[str]: The sort key values.
+
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise exceptions.InvalidCursorError from None
+    if (
+        not isinstance(values, list)
+        or len(values) != size
+        or not all(isinstance(value, str) for value in values)
+    ):
+        raise exceptions.InvalidCursorError
+    return values
@@ -0,0 +1,283 @@
+"""Password hashing policy and cost calibration.
+
+A fixed hashing cost is either too slow on the throttled CPUs pods get
+or weaker than the hardware could afford. This module picks the cost at
+runtime: `calibrate` measures the hash time on the running hardware and
+chooses the highest cost within a latency budget, never going below a
+security floor. Stored hashes made with another scheme or cost are
+reported by `needs_update`, and `verify_and_update` returns a fresh hash
+for them, so they are upgraded the next time the password is checked.
+
+bcrypt is the default scheme. argon2, which is memory-hard, can be used
+instead when the `argon2-cffi` package is installed; its cost is the
+time cost, and its memory cost is fixed by configuration. Hashes of
+either scheme verify whichever one is configured.
+
+The policy is set once per process with `configure`, before the first
+password is hashed, and again whenever a calibration completes.
+`configure` only records it: passlib is imported, and its context
+built, by the first hash or check, which keeps it out of startup time.
+
+Key components:
+- `Calibration`: Outcome of a calibration run.
+- `measure`: Times one hash at a given cost.
+- `calibrate`: Picks the cost fitting a latency budget.
+- `configure`: Selects the scheme and cost of new hashes.
+- `hash_password`, `needs_update`, `verify_and_update`: Apply the policy.
+"""
+
+import statistics
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+SCHEMES = ("bcrypt", "argon2")
+MIN_ROUNDS = {"bcrypt": 12, "argon2": 2}
+
+_lock = threading.Lock()
+_context: "CryptContext | None" = None
+_policy: dict[str, Any] = {
+    "scheme": "bcrypt",
+    "rounds": MIN_ROUNDS["bcrypt"],
+}
+_memory_kib: int | None = None
+
+
+@dataclass(frozen=True)
+class Calibration:
+    """Outcome of a calibration run.
+
+    Attributes:
+        scheme (str): The hashing scheme.
+        rounds (int): The chosen cost.
+        hash_seconds (float): Median time of one hash at that cost.
+        budget_seconds (float): The latency budget of one hash.
+        min_rounds (int): The security floor.
+        within_budget (bool): False if even the floor exceeds the budget.
+
+    """
+
+    scheme: str
+    rounds: int
+    hash_seconds: float
+    budget_seconds: float
+    min_rounds: int
+    within_budget: bool
+
+
+def _handler(scheme: str, **settings: Any) -> Any:
+    from passlib import hash as passlib_hash
+
+    handler = getattr(passlib_hash, scheme)
+    if scheme == "argon2":
+        handler.get_backend()
+        handler = handler.using(
+            memory_cost=settings.get("memory_kib", handler.memory_cost),
+        )
+    return handler
+
+
+def measure(
+    scheme: str,
+    rounds: int,
+    samples: int = 3,
+    **settings: Any,
+) -> float:
+    """Return the median time of hashing a password at a given cost.
+
+    Args:
+        scheme (str): One of `SCHEMES`.
+        rounds (int): The cost to measure.
+        samples (int): Hashes timed. Default is 3.
+        **settings (Any): Scheme settings, e.g. `memory_kib` for argon2.
+
+    Returns:
+        float: Seconds per hash.
+
+    """
+    handler = _handler(scheme, **settings).using(rounds=rounds)
+    timings = []
+    for _ in range(samples):
+        started_at = time.perf_counter()
+        handler.hash("calibration")
+        timings.append(time.perf_counter() - started_at)
+    return statistics.median(timings)
+
+
+def calibrate(
+    scheme: str = "bcrypt",
+    budget_seconds: float = 0.25,
+    min_rounds: int | None = None,
+    samples: int = 3,
+    stop: threading.Event | None = None,
+    **settings: Any,
+) -> Calibration:
+    """Pick the highest cost whose hash time fits the budget.
+
+    Starting at the floor, the cost is raised while the time predicted
+    for the next step still fits: bcrypt doubles its work per round,
+    while argon2 grows linearly with its time cost. Once `stop` is set,
+    no further cost is measured and the last measured one is returned.
+
+    Args:
+        scheme (str): One of `SCHEMES`. Default is "bcrypt".
+        budget_seconds (float): Latency budget of one hash. Default is
+            0.25.
+        min_rounds (int | None): Security floor, raised to `MIN_ROUNDS`
+            of the scheme if lower. Defaults to `MIN_ROUNDS`.
+        samples (int): Hashes timed per cost. Default is 3.
+        stop (threading.Event | None): Ends the calibration early, e.g.
+            on shutdown.
+        **settings (Any): Scheme settings, e.g. `memory_kib` for argon2.
+
+    Returns:
+        Calibration: The chosen cost and its measured hash time.
+
+    """
+    floor = max(min_rounds or 0, MIN_ROUNDS[scheme])
+    max_rounds = _handler(scheme, **settings).max_rounds
+    rounds = floor
+    seconds = measure(scheme, rounds, samples, **settings)
+    while rounds < max_rounds and not (stop and stop.is_set()):
+        growth = 2 if scheme == "bcrypt" else (rounds + 1) / rounds
+        if seconds * growth > budget_seconds:
+            break
+        rounds += 1
+        seconds = measure(scheme, rounds, samples, **settings)
+    return Calibration(
+        scheme=scheme,
+        rounds=rounds,
+        hash_seconds=seconds,
+        budget_seconds=budget_seconds,
+        min_rounds=floor,
+        within_budget=seconds <= budget_seconds,
+    )
+
+
+def configure(
+    scheme: str = "bcrypt",
+    rounds: int | None = None,
+    memory_kib: int | None = None,
+) -> None:
+    """Select the scheme and cost of new hashes.
+
+    Only the policy is recorded here; the passlib context applying it is
+    built by the first hash or check.
+
+    Args:
+        scheme (str): One of `SCHEMES`. Default is "bcrypt".
+        rounds (int | None): Cost of new hashes; stored hashes with a
+            lower cost need an update. Defaults to `MIN_ROUNDS` of the
+            scheme.
+        memory_kib (int | None): Memory cost of argon2 hashes, in KiB.
+            Defaults to passlib's.
+
+    Raises:
+        passlib.exc.MissingBackendError: If argon2 is selected but
+            `argon2-cffi` is not installed.
+
+    """
+    global _context, _memory_kib  # noqa: PLW0603
+    if scheme == "argon2":
+        _handler(scheme)
+    with _lock:
+        _context = None
+        _memory_kib = memory_kib
+        _policy.update(
+            scheme=scheme,
+            rounds=rounds or MIN_ROUNDS[scheme],
+        )
+
+
+def _build_context(
+    scheme: str,
+    rounds: int,
+    memory_kib: int | None,
+) -> "CryptContext":
+    from passlib.context import CryptContext
+
+    options: dict[str, Any] = {
+        f"{scheme}__default_rounds": rounds,
+        f"{scheme}__min_rounds": rounds,
+    }
+    if memory_kib is not None:
+        options["argon2__memory_cost"] = memory_kib
+    return CryptContext(
+        schemes=[
+            scheme,
+            *(other for other in SCHEMES if other != scheme),
+        ],
+        deprecated="auto",
+        **options,
+    )
+
+
+def _current() -> "CryptContext":
+    global _context  # noqa: PLW0603
+    with _lock:
+        if _context is None:
+            _context = _build_context(
+                _policy["scheme"],
+                _policy["rounds"],
+                _memory_kib,
+            )
+        return _context
+
+
+def policy() -> dict[str, Any]:
+    """Return the scheme and cost of new hashes.
+
+    Returns:
+        dict[str, Any]: `scheme` and `rounds`.
+
+    """
+    with _lock:
+        return dict(_policy)
+
+
+def hash_password(password: str) -> str:
+    """Hash a plaintext password with the configured scheme and cost.
+
+    Args:
+        password (str): The plaintext password to hash.
+
+    Returns:
+        str: The hashed password.
+
+    """
+    return _current().hash(password)
+
+
+def needs_update(hashed_password: str) -> bool:
+    """Tell whether a stored hash uses an outdated scheme or cost.
+
+    Args:
+        hashed_password (str): The stored hash.
+
+    Returns:
+        bool: True if the hash should be replaced.
+
+    """
+    return _current().needs_update(hashed_password)
+
+
+def verify_and_update(
+    password: str,
+    hashed_password: str,
+) -> tuple[bool, str | None]:
+    """Check a password and rehash it if its stored hash is outdated.
+
+    Args:
+        password (str): The plaintext password to check.
+        hashed_password (str): The stored hash.
+
+    Returns:
+        tuple[bool, str | None]: Whether the password matches, and the
+            hash to store instead, if the stored one needs an update.
+
+    """
+    return _current().verify_and_update(password, hashed_password)
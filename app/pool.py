@@ -0,0 +1,130 @@
+"""Connection pool instrumentation.
+
+SQLAlchemy's `QueuePool` knows how many connections are checked out, but
+not how long requests wait to get one. The pool classes in this module
+time every checkout so pool exhaustion shows up as growing wait times
+before it turns into timeouts.
+
+Key components:
+- `PoolStats`: Checkout counters and wait times.
+- `InstrumentedQueuePool`: `QueuePool` recording `PoolStats`.
+- `InstrumentedAsyncQueuePool`: Same for async engines.
+- `pool_status`: Snapshot of live pool usage and counters.
+- `engine_pools`: Pools of the primary and replica engines, by label.
+"""
+
+import threading
+import time
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from sqlalchemy import Engine, exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+
+@dataclass
+class PoolStats:
+    """Cumulative checkout metrics of a connection pool.
+
+    Attributes:
+        checkouts (int): Connections handed out.
+        timeouts (int): Checkouts that gave up after `pool_timeout`.
+        checkout_wait_seconds (float): Total time spent obtaining connections.
+        max_checkout_wait_seconds (float): Longest single checkout.
+
+    """
+
+    checkouts: int = 0
+    timeouts: int = 0
+    checkout_wait_seconds: float = 0.0
+    max_checkout_wait_seconds: float = 0.0
+
+
+class _TimedCheckoutMixin:
+    stats: PoolStats
+    _stats_lock: threading.Lock
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+        self._stats_lock = threading.Lock()
+
+    def connect(self):
+        started_at = time.perf_counter()
+        try:
+            connection = super().connect()  # type: ignore[misc]
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self.stats.timeouts += 1
+            raise
+        wait = time.perf_counter() - started_at
+        with self._stats_lock:
+            self.stats.checkouts += 1
+            self.stats.checkout_wait_seconds += wait
+            self.stats.max_checkout_wait_seconds = max(
+                self.stats.max_checkout_wait_seconds,
+                wait,
+            )
+        return connection
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    """`QueuePool` that records how long each checkout takes."""
+
+
+class InstrumentedAsyncQueuePool(
+    _TimedCheckoutMixin,
+    AsyncAdaptedQueuePool,
+):
+    """`AsyncAdaptedQueuePool` that records how long each checkout takes."""
+
+
+def pool_status(pool: Pool) -> dict[str, Any]:
+    """Report live usage of a pool together with its checkout counters.
+
+    Args:
+        pool (Pool): The engine's connection pool.
+
+    Returns:
+        dict[str, Any]: Pool size, checked-in (idle), checked-out and
+            overflow connections, plus `PoolStats` when available.
+
+    """
+    status: dict[str, Any] = {}
+    if isinstance(pool, QueuePool):
+        status |= {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+        }
+    stats = getattr(pool, "stats", None)
+    if isinstance(stats, PoolStats):
+        status |= asdict(stats)
+    return status
+
+
+def engine_pools(
+    primary: Engine | AsyncEngine,
+    replicas: Sequence[Engine | AsyncEngine] = (),
+) -> dict[str, Pool]:
+    """Label the connection pool of every engine.
+
+    Args:
+        primary (Engine | AsyncEngine): Engine of the primary.
+        replicas (Sequence[Engine | AsyncEngine]): Engines of the read
+            replicas.
+
+    Returns:
+        dict[str, Pool]: The primary's pool under "primary", then each
+            replica's pool under its `host:port`.
+
+    """
+    pools = {"primary": primary.pool}
+    for replica in replicas:
+        url = replica.url
+        label = f"{url.host}:{url.port}" if url.port else str(url.host)
+        pools[label] = replica.pool
+    return pools
@@ -1,15 +1,136 @@
 """User repository module for handling database interactions related to the User model.
 
 This module provides the `UserRepository` class, which abstracts CRUD operations
-and query utilities for users in a SQLAlchemy-backed database.
+and query utilities for users in a SQLAlchemy-backed database, and
+`CachedUserRepository`, which adds a read-through cache for lookups by id.
+
+Reads select only `PUBLIC_COLUMNS`, plus the row `version` for lookups
+and listings, and return plain `Row` tuples rather than ORM entities:
+they skip the identity map and attribute instrumentation, never load the
+password hash, and are immutable, so they can be cached and shared as
+they are.
+
+Both repositories can consult an optional `EmailIndex` to skip email
+existence queries for emails that are definitely not registered.
+
+Under a `RoutingSession` reads go to a replica, except the uniqueness
+checks made before inserting, which read from the primary.
+
+Email lookups and filters compare against `email_normalized`, the
+lower-case copy of `email` holding the unique key, so emails are
+case-insensitive whatever the collation.
 """
 
 import uuid
+from collections.abc import Collection, Iterable, Iterator
+from typing import Any
 
-from sqlalchemy import exists, select
+from sqlalchemy import (
+    Row,
+    RowMapping,
+    Select,
+    exc,
+    exists,
+    func,
+    insert,
+    select,
+    text,
+    tuple_,
+    update,
+)
 from sqlalchemy.orm import Session
 
-from app import models
+from app import exceptions, ids, models
+from app.cache import MISSING, CacheBackend
+from app.email_index import EmailIndex
+from app.routing import PRIMARY
+
+PUBLIC_COLUMNS = (
+    models.User.id,
+    models.User.username,
+    models.User.full_name,
+    models.User.phone_number,
+    models.User.email,
+)
+VERSIONED_COLUMNS = (*PUBLIC_COLUMNS, models.User.version)
+
+SEARCH_COLUMNS = {
+    "username": models.User.username,
+    "full_name": models.User.full_name,
+    "email": models.User.email_normalized,
+}
+
+# InnoDB's row estimate for the user table. The hint bypasses the cache
+# of information_schema statistics, which may be a day old by default.
+_ESTIMATE_USER_COUNT = text(
+    "SELECT /*+ SET_VAR(information_schema_stats_expiry = 0) */ "
+    "table_rows FROM information_schema.tables "
+    "WHERE table_schema = DATABASE() AND table_name = 'user'",
+)
+
+# MySQL error raised when MAX_EXECUTION_TIME interrupts a SELECT.
+_QUERY_TIMEOUT_ERRNO = 3024
+
+# MySQL error raised when an INSERT violates a unique key.
+_DUPLICATE_ENTRY_ERRNO = 1062
+
+# Unique keys rejecting registered emails: the case-insensitive one, and
+# the one on `email` of databases not migrated yet.
+_EMAIL_UNIQUE_KEYS = frozenset({"ix_user_email_normalized", "email"})
+_EMAIL_UNIQUE_COLUMNS = frozenset(
+    {"user.email_normalized", "user.email"},
+)
+
+
+def _is_duplicate_email(error: exc.IntegrityError) -> bool:
+    # MySQL names the key, prefixed with the table since 8.0.19, and
+    # SQLite the column. Other integrity errors, such as a primary key
+    # clash or a NOT NULL violation, are not duplicate emails.
+    message = str(error.orig)
+    if getattr(error.orig, "args", ())[:1] == (_DUPLICATE_ENTRY_ERRNO,):
+        key = message.rpartition(" for key ")[2].strip("'\"")
+        return key.rpartition(".")[2] in _EMAIL_UNIQUE_KEYS
+    return (
+        message.rpartition("UNIQUE constraint failed: ")[2]
+        in _EMAIL_UNIQUE_COLUMNS
+    )
+
+
+def _filter_users(
+    stmt: Select,
+    username: str | None,
+    email: str | None,
+) -> Select:
+    if username:
+        stmt = stmt.where(models.User.username == username)
+    if email:
+        stmt = stmt.where(models.User.email_normalized == email.lower())
+    return stmt
+
+
+def _prefix_pattern(prefix: str) -> str:
+    escaped = (
+        prefix.replace("/", "//").replace("%", "/%").replace("_", "/_")
+    )
+    return f"{escaped}%"
+
+
+def select_emails(batch_size: int = 10000) -> Select:
+    """Build a query streaming every stored email `batch_size` at a time.
+
+    Shared by `UserRepository.stream_emails` and async callers, which
+    run it with `AsyncSession.stream_scalars`.
+
+    Args:
+        batch_size (int): Rows fetched per round trip. Default is 10000.
+
+    Returns:
+        Select: The query.
+
+    """
+    return select(models.User.email).execution_options(
+        yield_per=batch_size,
+    )
 
 
 class UserRepository:
@@ -17,84 +138,604 @@ class UserRepository:
 
     Attributes:
         session (Session): SQLAlchemy session used for database interactions.
+        email_index (EmailIndex | None): Optional index of registered emails.
+        count_cache (CacheBackend | None): Optional cache of user counts.
+        count_ttl (float): Seconds a user count stays cached.
 
     """
 
-    def __init__(self, session: Session) -> None:
+    def __init__(
+        self,
+        session: Session,
+        email_index: EmailIndex | None = None,
+        count_cache: CacheBackend | None = None,
+        count_ttl: float = 10.0,
+    ) -> None:
         """Initialize the UserRepository with a database session.
 
         Args:
             session (Session): The SQLAlchemy session to use.
+            email_index (EmailIndex | None): Optional index of registered
+                emails, kept up to date by the create methods.
+            count_cache (CacheBackend | None): Optional cache reusing
+                recent user counts, which writes do not invalidate.
+            count_ttl (float): Seconds a user count stays cached. Default
+                is 10.
 
         """
         self.session = session
+        self.email_index = email_index
+        self.count_cache = count_cache
+        self.count_ttl = count_ttl
 
-    def user_exists(self, email: str) -> bool:
+    def user_exists(self, email: str, *, primary: bool = False) -> bool:
         """Check whether a user with the given email exists in the database.
 
+        Emails the index knows are not registered are answered without a
+        query.
+
         Args:
             email (str): The email address to check.
+            primary (bool): Read from the primary rather than a replica,
+                as uniqueness checks before a write must. Default is False.
 
         Returns:
             bool: True if a user with the email exists, False otherwise.
 
         """
-        return self.session.query(
-            exists().where(models.User.email == email),
-        ).scalar()
+        if self.email_index and not self.email_index.might_contain(
+            email,
+        ):
+            return False
+        stmt = select(
+            exists().where(
+                models.User.email_normalized == email.lower()
+            ),
+        )
+        if primary:
+            stmt = stmt.execution_options(**PRIMARY)
+        found = self.session.scalar(stmt)
+        if self.email_index and not found:
+            self.email_index.record_false_positive()
+        return found
+
+    def _register_emails(self, emails: Iterable[str]) -> None:
+        if self.email_index:
+            for email in emails:
+                self.email_index.add(email)
+
+    def _rollback_duplicate(self) -> None:
+        self.session.rollback()
+        if self.email_index:
+            self.email_index.mark_stale()
 
     def create_user(self, user: models.User) -> models.User:
         """Create a new user in the database.
 
+        The id is generated client-side, so the user is complete after
+        the INSERT and is not reloaded. Uniqueness of the email is
+        enforced by the database constraint rather than checked up front,
+        which keeps the write to one round trip and free of races between
+        concurrent signups. The INSERT is flushed but not committed; the
+        caller's unit of work commits it.
+
         Args:
             user (models.User): The User object to add.
 
+        Raises:
+            ExistingEmailError: If a user with the same email already exists.
+
         Returns:
-            models.User: The newly created and refreshed User object.
+            models.User: The newly created User object.
 
         """
+        if user.id is None:
+            user.id = ids.new_id()
         self.session.add(user)
-        self.session.commit()
-        self.session.refresh(user)
+        try:
+            self.session.flush()
+        except exc.IntegrityError as error:
+            if not _is_duplicate_email(error):
+                raise
+            self._rollback_duplicate()
+            raise exceptions.ExistingEmailError from None
+        self._register_emails([user.email])
         return user
 
+    def get_existing_emails(self, emails: Collection[str]) -> set[str]:
+        """Return which of the given emails already belong to a user.
+
+        Runs a single `IN (...)` query against the unique email index on
+        the primary, limited to the emails the email index cannot rule
+        out; no query runs when it rules out all of them.
+
+        Args:
+            emails (Collection[str]): The email addresses to check.
+
+        Returns:
+            set[str]: The given emails already taken, in lower case.
+
+        """
+        if self.email_index:
+            emails = [
+                email
+                for email in emails
+                if self.email_index.might_contain(email)
+            ]
+        if not emails:
+            return set()
+        normalized = {email.lower() for email in emails}
+        stmt = (
+            select(models.User.email_normalized)
+            .where(models.User.email_normalized.in_(normalized))
+            .execution_options(**PRIMARY)
+        )
+        existing = set(self.session.scalars(stmt))
+        if self.email_index:
+            for _ in normalized - existing:
+                self.email_index.record_false_positive()
+        return existing
+
+    def create_users(self, rows: list[dict[str, Any]]) -> None:
+        """Insert several users in a single transaction.
+
+        The rows are sent as one executemany INSERT and committed once,
+        so that each chunk of a bulk request or import persists on its
+        own.
+
+        Args:
+            rows (list[dict[str, Any]]): Column values for each new user,
+                including the generated `id`.
+
+        Raises:
+            ExistingEmailError: If any of the emails is already taken; no
+                user is inserted.
+
+        """
+        try:
+            self.session.execute(insert(models.User), rows)
+            self.session.commit()
+        except exc.IntegrityError as error:
+            if not _is_duplicate_email(error):
+                raise
+            self._rollback_duplicate()
+            raise exceptions.ExistingEmailError from None
+        self._register_emails(row["email"] for row in rows)
+
+    def stream_emails(self, batch_size: int = 10000) -> Iterator[str]:
+        """Stream the email of every user, e.g. to build an `EmailIndex`.
+
+        Args:
+            batch_size (int): Rows fetched per round trip. Default is 10000.
+
+        Yields:
+            str: One stored email.
+
+        """
+        yield from self.session.scalars(select_emails(batch_size))
+
     def get_users(
         self,
         offset: int = 0,
         limit: int = 100,
         username: str | None = None,
         email: str | None = None,
-    ) -> list[models.User]:
+        after: str | None = None,
+    ) -> list[Row]:
         """Retrieve a list of users from the database, with optional filters.
 
+        Users are ordered by primary key. Passing `after` seeks past that
+        key through the index, so every page costs the same regardless of
+        depth; `offset` is applied on top of it for compatibility.
+
         Args:
             offset (int): The starting index for pagination. Default is 0.
             limit (int): The maximum number of users to return. Default is 100.
             username (str | None): Optional filter by username.
             email (str | None): Optional filter by email.
+            after (str | None): Optional id of the last user of the previous page.
+
+        Returns:
+            list[Row]: The public columns of the matching users.
+
+        """
+        stmt = _filter_users(
+            select(*VERSIONED_COLUMNS),
+            username,
+            email,
+        )
+        if after:
+            stmt = stmt.where(models.User.id > after)
+
+        stmt = stmt.order_by(models.User.id).offset(offset).limit(limit)
+        return list(self.session.execute(stmt).all())
+
+    def count_users(
+        self,
+        username: str | None = None,
+        email: str | None = None,
+    ) -> tuple[int, bool]:
+        """Count the users matching the filters.
+
+        Filtered counts are exact: both filters are equality matches on
+        indexed columns, so MySQL counts index entries for one key. The
+        unfiltered count would scan the whole table on InnoDB, so on
+        MySQL it is read from the table statistics instead. With a
+        `count_cache`, counts are reused for `count_ttl` seconds.
+
+        Args:
+            username (str | None): Optional filter by username.
+            email (str | None): Optional filter by email.
 
         Returns:
-            list[models.User]: A list of User objects matching the criteria.
+            tuple[int, bool]: The count, and whether it was exact when
+                computed.
+
+        """
+        if self.count_cache is None:
+            return self._count_users(username, email)
+        key = (username or None, email.lower() if email else None)
+        cached = self.count_cache.get(key)
+        if cached is not MISSING:
+            return cached
+
+        count = self._count_users(username, email)
+        self.count_cache.set(key, count, self.count_ttl)
+        return count
+
+    def _count_users(
+        self,
+        username: str | None,
+        email: str | None,
+    ) -> tuple[int, bool]:
+        if not username and not email:
+            if self.session.get_bind().dialect.name == "mysql":
+                estimate = self.session.scalar(_ESTIMATE_USER_COUNT)
+                if estimate is not None:
+                    return int(estimate), False
+        stmt = _filter_users(
+            select(func.count()).select_from(models.User),
+            username,
+            email,
+        )
+        return self.session.scalar(stmt), True
+
+    def stream_users(
+        self,
+        username: str | None = None,
+        email: str | None = None,
+        batch_size: int = 1000,
+    ) -> Iterator[RowMapping]:
+        """Stream the public columns of every matching user.
+
+        Rows are read from a server-side cursor `batch_size` at a time, so
+        memory stays flat regardless of the table size.
+
+        Args:
+            username (str | None): Optional filter by username.
+            email (str | None): Optional filter by email.
+            batch_size (int): Rows fetched per round trip. Default is 1000.
+
+        Yields:
+            RowMapping: The public columns of one user.
 
         """
-        stmt = select(models.User)
+        stmt = _filter_users(select(*PUBLIC_COLUMNS), username, email)
+        result = self.session.execute(
+            stmt.order_by(models.User.id).execution_options(
+                yield_per=batch_size,
+            ),
+        )
+        yield from result.mappings()
+
+    def search_users(
+        self,
+        field: str,
+        prefix: str,
+        limit: int = 100,
+        after: tuple[str, str] | None = None,
+        timeout_ms: int | None = None,
+    ) -> list[Row]:
+        """Find users whose `field` starts with `prefix`.
+
+        The match is an anchored `LIKE 'prefix%'` with wildcards escaped,
+        which MySQL resolves as a range scan of the column's index, and
+        rows are read in `(field, id)` order, the order of that index, so
+        a page stops after `limit` index entries and `after` seeks
+        straight to the next one. Email prefixes are matched
+        case-insensitively against `email_normalized`.
+
+        Args:
+            field (str): One of `SEARCH_COLUMNS`.
+            prefix (str): The text the field must start with.
+            limit (int): The maximum number of users to return. Default is 100.
+            after (tuple[str, str] | None): Optional `(search_key, id)` of
+                the last user of the previous page.
+            timeout_ms (int | None): Optional MySQL `MAX_EXECUTION_TIME`
+                for the query, in milliseconds.
+
+        Raises:
+            SearchTimeoutError: If the query ran out of time.
 
-        if username:
-            stmt = stmt.where(models.User.username == username)
-        if email:
-            stmt = stmt.where(models.User.email == email)
+        Returns:
+            list[Row]: The public columns of the matching users, plus
+                their `search_key`, the value of the searched column.
 
-        stmt = stmt.offset(offset).limit(limit)
-        return list(self.session.scalars(stmt).all())
+        """
+        column = SEARCH_COLUMNS[field]
+        if field == "email":
+            prefix = prefix.lower()
+        stmt = select(
+            *VERSIONED_COLUMNS,
+            column.label("search_key"),
+        ).where(column.like(_prefix_pattern(prefix), escape="/"))
+        if after:
+            stmt = stmt.where(tuple_(column, models.User.id) > after)
+        stmt = stmt.order_by(column, models.User.id).limit(limit)
+        if timeout_ms:
+            stmt = stmt.prefix_with(
+                f"/*+ MAX_EXECUTION_TIME({int(timeout_ms)}) */",
+                dialect="mysql",
+            )
+        try:
+            return list(self.session.execute(stmt).all())
+        except exc.OperationalError as error:
+            if getattr(error.orig, "args", ())[:1] != (
+                _QUERY_TIMEOUT_ERRNO,
+            ):
+                raise
+            raise exceptions.SearchTimeoutError from None
 
-    def get_user_by_id(self, user_id: uuid.UUID) -> models.User | None:
+    def get_user_by_id(self, user_id: uuid.UUID) -> Row | None:
         """Retrieve a user by their unique identifier.
 
         Args:
             user_id (uuid.UUID): The UUID of the user to retrieve.
 
         Returns:
-            models.User | None: The User object if found, or None if not found.
+            Row | None: The public columns of the user, or None if not found.
+
+        """
+        stmt = select(*VERSIONED_COLUMNS).where(
+            models.User.id == str(user_id),
+        )
+        return self.session.execute(stmt).first()
+
+    def get_user_version(self, user_id: uuid.UUID) -> int | None:
+        """Read only the row version of a user.
+
+        Lets conditional requests be validated without loading or
+        serializing the rest of the row.
+
+        Args:
+            user_id (uuid.UUID): The UUID of the user.
+
+        Returns:
+            int | None: The version, or None if the user does not exist.
+
+        """
+        stmt = select(models.User.version).where(
+            models.User.id == str(user_id),
+        )
+        return self.session.scalar(stmt)
+
+    def get_users_by_ids(
+        self,
+        user_ids: Collection[uuid.UUID],
+    ) -> list[Row]:
+        """Retrieve several users by id with a single `IN (...)` query.
+
+        Args:
+            user_ids (Collection[uuid.UUID]): The UUIDs of the users.
+
+        Returns:
+            list[Row]: The public columns of the users found, in no
+                particular order. Unknown ids are left out.
+
+        """
+        if not user_ids:
+            return []
+        stmt = select(*VERSIONED_COLUMNS).where(
+            models.User.id.in_([str(user_id) for user_id in user_ids]),
+        )
+        return list(self.session.execute(stmt).all())
+
+    def get_credentials(self, email: str) -> Row | None:
+        """Read the id and password hash of the user with an email.
+
+        Args:
+            email (str): The email address of the user.
+
+        Returns:
+            Row | None: `id` and `password`, or None if no user has the
+                email.
+
+        """
+        stmt = select(models.User.id, models.User.password).where(
+            models.User.email_normalized == email.lower(),
+        )
+        return self.session.execute(stmt).first()
+
+    def update_password(
+        self, user_id: str, hashed_password: str
+    ) -> None:
+        """Replace the stored password hash of a user.
+
+        The hash is not part of the public representation, so the row
+        version is left unchanged and cached users and ETags stay valid.
+
+        Args:
+            user_id (str): The id of the user.
+            hashed_password (str): The new hash.
+
+        """
+        self.session.execute(
+            update(models.User)
+            .where(models.User.id == user_id)
+            .values(password=hashed_password),
+        )
+
+
+class CachedUserRepository(UserRepository):
+    """User repository with a read-through cache for lookups by id.
+
+    Found users are cached as the immutable rows the repository returns,
+    so cached values never hold on to the session that loaded them.
+    Missing ids are cached too, with a shorter TTL, so polling an unknown
+    id does not hit the database on every call. Writes invalidate the ids
+    they create. User counts go to the separate `count_cache`, so they
+    never evict users.
+
+    Attributes:
+        session (Session): SQLAlchemy session used for database interactions.
+        email_index (EmailIndex | None): Optional index of registered emails.
+        count_cache (CacheBackend | None): Optional cache of user counts.
+        count_ttl (float): Seconds a user count stays cached.
+        cache (CacheBackend): Backend storing the cached users.
+        ttl (float): Seconds a found user stays cached.
+        negative_ttl (float): Seconds a missing id stays cached.
+
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        cache: CacheBackend,
+        ttl: float = 300.0,
+        negative_ttl: float = 5.0,
+        email_index: EmailIndex | None = None,
+        count_cache: CacheBackend | None = None,
+        count_ttl: float = 10.0,
+    ) -> None:
+        """Initialize the repository with a session and a cache backend.
+
+        Args:
+            session (Session): The SQLAlchemy session to use.
+            cache (CacheBackend): The cache backend to read through.
+            ttl (float): Seconds a found user stays cached. Default is 300.
+            negative_ttl (float): Seconds a missing id stays cached. Default is 5.
+            email_index (EmailIndex | None): Optional index of registered
+                emails.
+            count_cache (CacheBackend | None): Optional cache of user
+                counts.
+            count_ttl (float): Seconds a user count stays cached. Default
+                is 10.
+
+        """
+        super().__init__(
+            session,
+            email_index=email_index,
+            count_cache=count_cache,
+            count_ttl=count_ttl,
+        )
+        self.cache = cache
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+
+    @staticmethod
+    def _key(user_id: uuid.UUID | str) -> str:
+        return f"user:{user_id}"
+
+    def create_user(self, user: models.User) -> models.User:
+        """Create a new user and invalidate any cached entry for its id.
+
+        Args:
+            user (models.User): The User object to add.
+
+        Raises:
+            ExistingEmailError: If a user with the same email already exists.
+
+        Returns:
+            models.User: The newly created User object.
+
+        """
+        created_user = super().create_user(user)
+        self.cache.delete(self._key(created_user.id))
+        return created_user
+
+    def create_users(self, rows: list[dict[str, Any]]) -> None:
+        """Insert several users and invalidate any cached entries for their ids.
+
+        Args:
+            rows (list[dict[str, Any]]): Column values for each new user,
+                including the generated `id`.
+
+        """
+        super().create_users(rows)
+        for row in rows:
+            self.cache.delete(self._key(row["id"]))
+
+    def get_user_by_id(self, user_id: uuid.UUID) -> Row | None:
+        """Retrieve a user by id, answering from the cache when possible.
+
+        Args:
+            user_id (uuid.UUID): The UUID of the user to retrieve.
+
+        Returns:
+            Row | None: The public columns of the user, or None if not found.
+
+        """
+        key = self._key(user_id)
+        cached = self.cache.get(key)
+        if cached is not MISSING:
+            return cached
+
+        user = super().get_user_by_id(user_id)
+        self.cache.set(
+            key,
+            user,
+            self.negative_ttl if user is None else self.ttl,
+        )
+        return user
+
+    def get_user_version(self, user_id: uuid.UUID) -> int | None:
+        """Read the row version of a user, from its cached row if any.
+
+        Args:
+            user_id (uuid.UUID): The UUID of the user.
+
+        Returns:
+            int | None: The version, or None if the user does not exist.
 
         """
-        return self.session.get(models.User, str(user_id))
+        cached = self.cache.get(self._key(user_id))
+        if cached is MISSING:
+            return super().get_user_version(user_id)
+        return None if cached is None else cached.version
+
+    def get_users_by_ids(
+        self,
+        user_ids: Collection[uuid.UUID],
+    ) -> list[Row]:
+        """Retrieve several users by id, querying only the cache misses.
+
+        Args:
+            user_ids (Collection[uuid.UUID]): The UUIDs of the users.
+
+        Returns:
+            list[Row]: The public columns of the users found, in no
+                particular order. Unknown ids are left out.
+
+        """
+        users = []
+        misses = []
+        for user_id in user_ids:
+            cached = self.cache.get(self._key(user_id))
+            if cached is MISSING:
+                misses.append(user_id)
+            elif cached is not None:
+                users.append(cached)
+        if not misses:
+            return users
+
+        loaded = {
+            user.id: user for user in super().get_users_by_ids(misses)
+        }
+        for user_id in misses:
+            user = loaded.get(str(user_id))
+            self.cache.set(
+                self._key(user_id),
+                user,
+                self.negative_ttl if user is None else self.ttl,
+            )
+        return users + list(loaded.values())
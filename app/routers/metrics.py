@@ -0,0 +1,38 @@
+"""Metrics router module exposing Prometheus-compatible metrics.
+
+This module defines the `/metrics` endpoint scraped by Prometheus to
+monitor request rates and latencies, password hashing, the database
+connection pool, the user cache, read coalescing, the email index and
+the password hashing cost.
+"""
+
+from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
+
+from app import metrics, passwords
+from app.pool import engine_pools
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    include_in_schema=False,
+)
+def read_metrics(request: Request):
+    """Render all metrics in the Prometheus text exposition format."""
+    state = request.app.state
+    return PlainTextResponse(
+        metrics.render_metrics(
+            metrics.request_metrics,
+            hasher=state.password_hasher,
+            pools=engine_pools(state.db_engine, state.db_replicas),
+            cache=state.user_cache,
+            singleflight=state.singleflight,
+            email_index=state.email_index,
+            password_policy=passwords.policy(),
+            password_calibration=state.password_calibration,
+        ),
+        media_type="text/plain; version=0.0.4",
+    )
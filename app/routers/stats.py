@@ -0,0 +1,83 @@
+"""Stats router module exposing runtime counters for capacity planning.
+
+This module defines read-only endpoints reporting the state of in-process
+resources such as the user lookup cache, the database connection pool,
+the read coalescer, the email index and password hashing, so they can
+be sized from observed traffic.
+"""
+
+from dataclasses import asdict
+
+from fastapi import APIRouter, Request
+
+from app import passwords
+from app.pool import engine_pools, pool_status
+
+router = APIRouter(prefix="/stats", tags=["stats"])
+
+
+@router.get("/cache")
+def read_cache_stats(request: Request):
+    """Report hit, miss and eviction counters of the user cache."""
+    cache = request.app.state.user_cache
+    if cache is None:
+        return {"enabled": False}
+    return {
+        "enabled": True,
+        "size": len(cache),
+        "max_size": getattr(cache, "max_size", None),
+        **asdict(cache.stats),
+    }
+
+
+@router.get("/pool")
+def read_pool_stats(request: Request):
+    """Report connection usage and checkout waits of every pool.
+
+    Pools are keyed by engine: "primary", then each replica's
+    `host:port`.
+    """
+    state = request.app.state
+    return {
+        engine: pool_status(pool)
+        for engine, pool in engine_pools(
+            state.db_engine,
+            state.db_replicas,
+        ).items()
+    }
+
+
+@router.get("/singleflight")
+def read_singleflight_stats(request: Request):
+    """Report how many user reads were served by another in-flight query."""
+    singleflight = request.app.state.singleflight
+    if singleflight is None:
+        return {"enabled": False}
+    return {"enabled": True, **asdict(singleflight.stats)}
+
+
+@router.get("/email-index")
+def read_email_index_stats(request: Request):
+    """Report memory, false positive rate and skipped queries of the email index."""
+    email_index = request.app.state.email_index
+    if email_index is None:
+        return {"enabled": False}
+    return {"enabled": True, **email_index.report()}
+
+
+@router.get("/password-hashing")
+def read_password_hashing_stats(request: Request):
+    """Report the password hashing cost, its calibration and hash times."""
+    calibration = request.app.state.password_calibration
+    stats = request.app.state.password_hasher.stats
+    return {
+        **passwords.policy(),
+        "calibrated": calibration is not None,
+        "calibration": asdict(calibration) if calibration else None,
+        "hashed": stats.hashed,
+        "rejected": stats.rejected,
+        "mean_hash_seconds": (
+            stats.hash_seconds / stats.hashed if stats.hashed else None
+        ),
+        "max_hash_seconds": stats.max_hash_seconds,
+    }
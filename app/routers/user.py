@@ -1,61 +1,371 @@
 """User router module for managing user-related API endpoints.
 
-This module defines routes for creating users, retrieving multiple users,
-and fetching a specific user by ID. It utilizes FastAPI and depends on
+This module defines routes for creating users one by one, in bulk or by
+importing a file, retrieving multiple users, searching users by prefix,
+exporting all users, and fetching a specific user by ID. It utilizes FastAPI and depends on
 external service and schema layers for business logic and validation.
 """
 
+import csv
+import io
+import json
 import uuid
-from typing import Annotated
+from collections.abc import AsyncIterator, Iterator
+from typing import IO, Annotated, Any, Literal
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import (
+    APIRouter,
+    Body,
+    Header,
+    HTTPException,
+    Query,
+    Response,
+    UploadFile,
+)
+from fastapi.responses import StreamingResponse
+from sqlalchemy import RowMapping
 
-from app import dependencies, exceptions
+from app import (
+    conditional,
+    config,
+    dependencies,
+    exceptions,
+    pagination,
+    serialization,
+)
 from app.schemas import user as user_schemas
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+_EXPORT_FIELDS = [
+    "id",
+    "username",
+    "full_name",
+    "phone_number",
+    "email",
+]
+_EXPORT_ROWS_PER_CHUNK = 500
+
+
+async def _ndjson_chunks(rows: AsyncIterator[RowMapping]):
+    lines = []
+    async for row in rows:
+        lines.append(json.dumps(dict(row), default=str) + "\n")
+        if len(lines) >= _EXPORT_ROWS_PER_CHUNK:
+            yield "".join(lines)
+            lines.clear()
+    if lines:
+        yield "".join(lines)
+
+
+async def _csv_chunks(rows: AsyncIterator[RowMapping]):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=_EXPORT_FIELDS)
+    writer.writeheader()
+    count = 0
+    async for row in rows:
+        writer.writerow(row)
+        count += 1
+        if count % _EXPORT_ROWS_PER_CHUNK == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
 
 @router.post("/", response_model=user_schemas.UserPublic)
-def create_user(
+async def create_user(
     user: user_schemas.UserCreate,
     user_service: dependencies.UserServiceDep,
 ):
     """Create a new user account."""
     try:
-        created_user = user_service.create_user_in_db(user)
+        created_user = await user_service.create_user_in_db(user)
     except exceptions.ExistingEmailError:
         raise HTTPException(
             status_code=400,
             detail="Email already registered",
         ) from None
+    except exceptions.HashingQueueFullError:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many signups in progress, retry later",
+            headers={"Retry-After": "1"},
+        ) from None
+    if config.settings.fast_json:
+        return serialization.json_response(
+            serialization.dump_user(created_user),
+        )
     return created_user
 
 
+@router.post("/bulk", response_model=list[user_schemas.BulkUserResult])
+async def create_users_bulk(
+    users: Annotated[
+        list[dict[str, Any]],
+        Body(max_length=config.settings.bulk_max_items),
+    ],
+    user_service: dependencies.UserServiceDep,
+):
+    """Create many user accounts, reporting the outcome of each item."""
+    return await user_service.create_users_in_db(
+        users,
+        chunk_size=config.settings.bulk_chunk_size,
+    )
+
+
+def _ndjson_rows(file: IO[bytes]) -> Iterator[tuple[int, Any]]:
+    for line_number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError:
+            yield line_number, line.decode(errors="replace").strip()
+
+
+def _csv_rows(file: IO[bytes]) -> Iterator[tuple[int, Any]]:
+    reader = csv.DictReader(
+        io.TextIOWrapper(file, encoding="utf-8", newline=""),
+    )
+    for row in reader:
+        yield (
+            reader.line_num,
+            {key: value for key, value in row.items() if value != ""},
+        )
+
+
+@router.post("/import", response_model=user_schemas.ImportSummary)
+async def import_users(
+    file: UploadFile,
+    user_service: dependencies.UserServiceDep,
+    import_format: Annotated[
+        Literal["ndjson", "csv"] | None,
+        Query(alias="format"),
+    ] = None,
+    chunk_size: Annotated[int | None, Query(ge=1, le=10000)] = None,
+):
+    """Import users from an NDJSON or CSV file, one transaction per chunk.
+
+    The format defaults to CSV for `.csv` files and NDJSON otherwise.
+    """
+    if import_format is None:
+        import_format = (
+            "csv"
+            if (file.filename or "").lower().endswith(".csv")
+            else "ndjson"
+        )
+    parse = _csv_rows if import_format == "csv" else _ndjson_rows
+    return await user_service.import_users(
+        parse(file.file),
+        chunk_size=chunk_size or config.settings.import_chunk_size,
+    )
+
+
 @router.get("/", response_model=list[user_schemas.UserPublic])
-def read_users(
+async def read_users(
+    response: Response,
     user_service: dependencies.UserServiceDep,
     offset: int = 0,
     limit: Annotated[int, Query(le=100)] = 100,
     username: str | None = None,
     email: str | None = None,
+    cursor: str | None = None,
+    include_total: bool = False,
+    if_none_match: Annotated[str | None, Header()] = None,
 ):
-    """Retrieve a list of users with optional filters."""
-    return user_service.get_users_from_db(
+    """Retrieve a list of users with optional filters.
+
+    Pass the `X-Next-Cursor` header of a full page as `cursor` to fetch
+    the next one. With `include_total`, `X-Total-Count` holds the number
+    of users matching the filters. Counts are cached for a few seconds,
+    and the unfiltered count may be estimated from table statistics, in
+    which case `X-Total-Count-Approximate` is set. The page carries an
+    `ETag`; sending it back in `If-None-Match` yields `304 Not Modified`
+    while the page is unchanged.
+    """
+    try:
+        after = (
+            str(uuid.UUID(pagination.decode_cursor(cursor)[0]))
+            if cursor
+            else None
+        )
+    except (exceptions.InvalidCursorError, ValueError):
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid cursor",
+        ) from None
+
+    users = await user_service.get_users_from_db(
         offset,
         limit,
         username,
         email,
+        after,
+    )
+    headers = {}
+    if users and len(users) == limit:
+        headers["X-Next-Cursor"] = pagination.encode_cursor(
+            str(users[-1].id),
+        )
+    if include_total:
+        total, exact = await user_service.count_users(username, email)
+        headers["X-Total-Count"] = str(total)
+        if not exact:
+            headers["X-Total-Count-Approximate"] = "true"
+    etag = conditional.users_etag(users)
+    if conditional.matches(if_none_match, etag):
+        return conditional.not_modified(etag, headers)
+    headers["ETag"] = etag
+    if config.settings.fast_json:
+        return serialization.json_response(
+            serialization.dump_users(users),
+            headers=headers,
+        )
+    response.headers.update(headers)
+    return users
+
+
+@router.get("/search", response_model=list[user_schemas.UserPublic])
+async def search_users(
+    response: Response,
+    user_service: dependencies.UserServiceDep,
+    q: Annotated[str, Query(min_length=1, max_length=100)],
+    field: Literal["username", "full_name", "email"] = "username",
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    cursor: str | None = None,
+):
+    """Find users whose `field` starts with `q`.
+
+    Matches are ordered by `field`, then ID, and always served from an
+    index. Email matching is case-insensitive. Pass the `X-Next-Cursor`
+    header of a full page as `cursor` to fetch the next one.
+    """
+    try:
+        after = None
+        if cursor:
+            search_key, user_id = pagination.decode_cursor(
+                cursor,
+                size=2,
+            )
+            after = (search_key, str(uuid.UUID(user_id)))
+    except (exceptions.InvalidCursorError, ValueError):
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid cursor",
+        ) from None
+
+    try:
+        users = await user_service.search_users(
+            field,
+            q,
+            limit,
+            after,
+            config.settings.search_timeout_ms or None,
+        )
+    except exceptions.SearchTimeoutError:
+        raise HTTPException(
+            status_code=503,
+            detail="Search timed out",
+        ) from None
+    headers = {}
+    if len(users) == limit:
+        headers["X-Next-Cursor"] = pagination.encode_cursor(
+            users[-1].search_key,
+            str(users[-1].id),
+        )
+    if config.settings.fast_json:
+        return serialization.json_response(
+            serialization.dump_users(users),
+            headers=headers,
+        )
+    response.headers.update(headers)
+    return users
+
+
+@router.post("/batch-get", response_model=user_schemas.UserBatch)
+async def read_users_batch(
+    ids: Annotated[
+        list[uuid.UUID],
+        Body(embed=True, max_length=config.settings.batch_get_max_ids),
+    ],
+    user_service: dependencies.UserServiceDep,
+):
+    """Retrieve several users by ID with a single query.
+
+    Users are returned in the order their IDs were given; unknown IDs are
+    listed in `missing`.
+    """
+    found = await user_service.get_users_by_ids(ids)
+    users = [user for user in found.values() if user is not None]
+    missing = [
+        user_id for user_id, user in found.items() if user is None
+    ]
+    if config.settings.fast_json:
+        return serialization.json_response(
+            serialization.dump_user_batch(users, missing),
+        )
+    return {"users": users, "missing": missing}
+
+
+@router.get("/export")
+async def export_users(
+    user_service: dependencies.UserServiceDep,
+    export_format: Annotated[
+        Literal["ndjson", "csv"],
+        Query(alias="format"),
+    ] = "ndjson",
+    username: str | None = None,
+    email: str | None = None,
+):
+    """Stream every user matching the filters as NDJSON or CSV."""
+    rows = user_service.stream_users(
+        username=username,
+        email=email,
+        batch_size=config.settings.export_batch_size,
+    )
+    if export_format == "csv":
+        return StreamingResponse(
+            _csv_chunks(rows),
+            media_type="text/csv",
+            headers={
+                "Content-Disposition": 'attachment; filename="users.csv"',
+            },
+        )
+    return StreamingResponse(
+        _ndjson_chunks(rows),
+        media_type="application/x-ndjson",
     )
 
 
 @router.get("/{user_id}", response_model=user_schemas.UserPublic)
-def read_user(
+async def read_user(
     user_id: uuid.UUID,
+    response: Response,
     user_service: dependencies.UserServiceDep,
+    if_none_match: Annotated[str | None, Header()] = None,
 ):
-    """Retrieve a single user by their unique ID."""
-    user = user_service.get_user_by_id(user_id)
+    """Retrieve a single user by their unique ID.
+
+    The response carries an `ETag`. A request whose `If-None-Match` still
+    matches is answered `304 Not Modified` after reading only the row
+    version.
+    """
+    if if_none_match:
+        version = await user_service.get_user_version(user_id)
+        if version is not None:
+            etag = conditional.user_etag(version)
+            if conditional.matches(if_none_match, etag):
+                return conditional.not_modified(etag)
+
+    user = await user_service.get_user_by_id(user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    headers = {"ETag": conditional.user_etag(user.version)}
+    if config.settings.fast_json:
+        return serialization.json_response(
+            serialization.dump_user(user),
+            headers=headers,
+        )
+    response.headers.update(headers)
     return user
@@ -0,0 +1,221 @@
+"""Primary/replica routing of database statements.
+
+Reads are most of the load, so they can be served by MySQL read
+replicas while the primary only handles writes. `RoutingSession` picks
+the engine per statement: inserts, updates, deletes and ORM flushes go
+to the primary, as do reads explicitly marked with `PRIMARY`; every
+other read goes to one replica, chosen when the session is created.
+
+Sessions opened for read-only requests run their MySQL transactions as
+`READ ONLY`, at a configurable isolation level, which spares InnoDB the
+bookkeeping of read-write transactions. Replica connections always are.
+The characteristics are set with `SET TRANSACTION`, which only applies
+to the transaction about to start, so pooled connections return to
+their defaults for whoever checks them out next.
+
+Replication is asynchronous, so a client reading right after its own
+write could miss it. `ReadYourWritesMiddleware` sets a short-lived
+cookie on responses to requests that committed a write to the primary,
+and sessions opened for requests carrying it read from the primary too.
+
+Key components:
+- `PRIMARY`: Execution options routing a read to the primary.
+- `RoutingSession`: Session picking the primary or a replica per
+  statement.
+- `ReadYourWritesMiddleware`: Sets the read-your-writes cookie.
+- `reads_from_primary`: Tells whether a request carries a valid cookie.
+"""
+
+import math
+import random
+import time
+from collections.abc import Sequence
+from http.cookies import SimpleCookie
+from typing import Any
+
+from sqlalchemy import Connection, Engine, event
+from sqlalchemy.orm import Session, SessionTransaction
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+PRIMARY = {"primary": True}
+
+COOKIE_NAME = "read_primary_until"
+
+
+class RoutingSession(Session):
+    """Session sending writes to the primary and reads to a replica.
+
+    Attributes:
+        primary (Engine): Engine of the primary.
+        replica (Engine): Engine serving this session's reads; the
+            primary when no replica is configured.
+        use_primary (bool): Send every statement to the primary.
+        read_only (bool): Run transactions as `READ ONLY` on MySQL.
+        isolation_level (str): Isolation level of read-only transactions.
+        pending_write (bool): Whether the current transaction routed a
+            write to the primary.
+        wrote (bool): Whether a write to the primary has been committed.
+
+    """
+
+    def __init__(
+        self,
+        *,
+        primary: Engine,
+        replicas: Sequence[Engine] = (),
+        use_primary: bool = False,
+        read_only: bool = False,
+        isolation_level: str = "REPEATABLE READ",
+        **kwargs: Any,
+    ) -> None:
+        """Initialize the session and pick its replica.
+
+        Args:
+            primary (Engine): Engine of the primary. For an
+                `AsyncSession` this is the `sync_engine` of the async
+                engine.
+            replicas (Sequence[Engine]): Engines of the replicas.
+            use_primary (bool): Send every statement to the primary,
+                e.g. within a read-your-writes window. Default is False.
+            read_only (bool): Run transactions as `READ ONLY` on MySQL,
+                e.g. for GET requests. Default is False.
+            isolation_level (str): Isolation level of read-only
+                transactions, including those on replicas. Default is
+                "REPEATABLE READ".
+            **kwargs (Any): Passed on to `Session`.
+
+        """
+        super().__init__(**kwargs)
+        self.primary = primary
+        self.replica = random.choice(replicas) if replicas else primary
+        self.use_primary = use_primary
+        self.read_only = read_only
+        self.isolation_level = isolation_level
+        self.pending_write = False
+        self.wrote = False
+
+    def get_bind(
+        self,
+        mapper: Any = None,
+        *,
+        clause: Any = None,
+        **kwargs: Any,
+    ) -> Engine:
+        """Return the engine a statement must run on."""
+        writes = self._flushing or (
+            clause is not None and getattr(clause, "is_dml", False)
+        )
+        if writes:
+            self.pending_write = True
+            return self.primary
+        if self.use_primary or (
+            clause is not None
+            and clause.get_execution_options().get("primary")
+        ):
+            return self.primary
+        return self.replica
+
+
+@event.listens_for(RoutingSession, "after_begin")
+def _set_transaction_characteristics(
+    session: RoutingSession,
+    transaction: SessionTransaction,
+    connection: Connection,
+) -> None:
+    # MySQL starts the transaction with the first statement, which has
+    # not been sent yet, so characteristics set now apply to it alone.
+    if connection.dialect.name != "mysql":
+        return
+    if session.read_only or connection.engine is not session.primary:
+        connection.exec_driver_sql(
+            "SET TRANSACTION ISOLATION LEVEL "
+            f"{session.isolation_level}, READ ONLY",
+        )
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _record_write(session: RoutingSession) -> None:
+    if session.pending_write:
+        session.wrote = True
+        session.pending_write = False
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _discard_write(session: RoutingSession) -> None:
+    session.pending_write = False
+
+
+def reads_from_primary(connection: HTTPConnection) -> bool:
+    """Tell whether a request is within its read-your-writes window.
+
+    Args:
+        connection (HTTPConnection): The incoming request.
+
+    Returns:
+        bool: True if the request carries an unexpired cookie set by
+            `ReadYourWritesMiddleware`.
+
+    """
+    until = connection.cookies.get(COOKIE_NAME)
+    try:
+        return until is not None and float(until) > time.time()
+    except ValueError:
+        return False
+
+
+class ReadYourWritesMiddleware:
+    """ASGI middleware pinning a client's reads to the primary on write.
+
+    When the request's `RoutingSession`, published as
+    `request.state.db_session`, committed a write to the primary, the
+    response sets a cookie holding the end of the window.
+    """
+
+    def __init__(self, app: ASGIApp, window_seconds: float) -> None:
+        """Wrap an ASGI application.
+
+        Args:
+            app (ASGIApp): The application to wrap.
+            window_seconds (float): How long reads stay on the primary
+                after a write. Set to 0 to disable the cookie.
+
+        """
+        self.app = app
+        self.window_seconds = window_seconds
+
+    async def __call__(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        """Handle one ASGI request, adding the cookie after writes."""
+        if scope["type"] != "http" or self.window_seconds <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                session = scope.get("state", {}).get("db_session")
+                if getattr(session, "wrote", False):
+                    cookie = SimpleCookie()
+                    cookie[COOKIE_NAME] = str(
+                        time.time() + self.window_seconds,
+                    )
+                    cookie[COOKIE_NAME]["max-age"] = math.ceil(
+                        self.window_seconds,
+                    )
+                    cookie[COOKIE_NAME]["path"] = "/"
+                    cookie[COOKIE_NAME]["httponly"] = True
+                    cookie[COOKIE_NAME]["samesite"] = "Lax"
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (
+                            b"set-cookie",
+                            cookie.output(header="").strip().encode(),
+                        ),
+                    ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
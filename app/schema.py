@@ -0,0 +1,83 @@
+"""Schema version bookkeeping.
+
+Creating tables with `metadata.create_all` on every startup costs
+reflection round trips and takes DDL locks while pods roll out. With
+`Settings.db_create_schema` disabled, startup only reads the version
+stamped in the `schema_version` table, with a single query, and refuses
+to start unless it equals `SCHEMA_VERSION`. The schema itself is created
+or upgraded beforehand with `python -m app.migrations upgrade`.
+
+Migrations that change the schema increment `SCHEMA_VERSION`:
+
+1. The `user` table.
+2. `email_normalized` and the search indexes.
+3. The `version` column.
+4. Emails unique regardless of case, through `email_normalized`.
+
+Key components:
+- `SCHEMA_VERSION`: Version the models describe.
+- `get_version`: Reads the stamped version.
+- `check_version`: Raises unless the stamped version is current.
+- `stamp`: Records a version.
+"""
+
+from sqlalchemy import Connection, delete, func, insert, select
+from sqlalchemy.exc import DBAPIError
+
+from app import exceptions, models
+
+SCHEMA_VERSION = 4
+
+
+def get_version(connection: Connection) -> int | None:
+    """Return the version stamped in the database.
+
+    Args:
+        connection (Connection): Connection to the database.
+
+    Returns:
+        int | None: The version, or None if the database was never
+            stamped.
+
+    """
+    try:
+        return connection.scalar(
+            select(func.max(models.SchemaVersion.version)),
+        )
+    except DBAPIError:
+        connection.rollback()
+        return None
+
+
+def check_version(connection: Connection) -> None:
+    """Ensure the database schema is the version the models describe.
+
+    Args:
+        connection (Connection): Connection to the database.
+
+    Raises:
+        exceptions.SchemaVersionError: If the stamped version differs
+            from `SCHEMA_VERSION` or is missing.
+
+    """
+    found = get_version(connection)
+    if found != SCHEMA_VERSION:
+        raise exceptions.SchemaVersionError(found, SCHEMA_VERSION)
+
+
+def stamp(
+    connection: Connection, version: int = SCHEMA_VERSION
+) -> None:
+    """Record `version` as the applied schema version and commit.
+
+    Args:
+        connection (Connection): Connection to the database, which must
+            have the `schema_version` table.
+        version (int): Version to record. Default is `SCHEMA_VERSION`.
+
+    """
+    connection.execute(delete(models.SchemaVersion))
+    connection.execute(
+        insert(models.SchemaVersion).values(version=version)
+    )
+    connection.commit()
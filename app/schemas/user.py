@@ -5,6 +5,7 @@ Includes base schema, input (creation), and output (public-facing) models, with
 """
 
 import uuid
+from typing import Literal
 
 import pydantic
 
@@ -65,3 +66,66 @@ class UserPublic(UserBase):
     """
 
     id: uuid.UUID = pydantic.Field(examples=[DEFAULT_USER.id])
+
+
+class UserBatch(pydantic.BaseModel):
+    """Users resolved by a batch lookup.
+
+    Attributes:
+    - `users`: The users found, in the order their ids were requested.
+    - `missing`: Requested ids that do not belong to any user.
+
+    """
+
+    users: list[UserPublic]
+    missing: list[uuid.UUID]
+
+
+class BulkUserResult(pydantic.BaseModel):
+    """Outcome of a single item in a bulk user creation request.
+
+    Attributes:
+    - `index`: Position of the item in the request body.
+    - `status`: `created`, `duplicate` (email already taken or repeated in
+      the request) or `invalid` (failed `UserCreate` validation).
+    - `user`: The created user, only present when `status` is `created`.
+    - `detail`: Explanation for `duplicate` and `invalid` items.
+
+    """
+
+    index: int
+    status: Literal["created", "duplicate", "invalid"]
+    user: UserPublic | None = None
+    detail: str | None = None
+
+
+class ImportRowError(pydantic.BaseModel):
+    """A row skipped during a user import.
+
+    Attributes:
+    - `row`: Line number of the row in the uploaded file.
+    - `status`: `duplicate` or `invalid`.
+    - `detail`: Why the row was skipped.
+
+    """
+
+    row: int
+    status: Literal["duplicate", "invalid"]
+    detail: str | None = None
+
+
+class ImportSummary(pydantic.BaseModel):
+    """Outcome of a user import.
+
+    Attributes:
+    - `inserted`: Number of users created.
+    - `duplicates`: Rows skipped because the email was already taken.
+    - `invalid`: Rows skipped because they failed validation.
+    - `errors`: Skipped rows with their line numbers, possibly truncated.
+
+    """
+
+    inserted: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+    errors: list[ImportRowError] = []
@@ -0,0 +1,106 @@
+"""Fast JSON serialization of public user data.
+
+By default FastAPI validates every object a route returns against its
+`response_model`, dumps the validated model to JSON-compatible Python
+objects and encodes those with the standard library `json` module. For
+users read by the repository that work is redundant: the rows only hold
+the public columns and come from our own database. The helpers in this
+module copy those columns into plain dicts and encode them in a single
+call to pydantic-core's serializer, producing the same document.
+
+The fast path is opt-in through `Settings.fast_json`; routes keep their
+`response_model` so the OpenAPI schema is unchanged.
+
+Key components:
+- `PUBLIC_FIELDS`: Fields of `UserPublic`, in response order.
+- `dump_user`: Encodes one user as JSON bytes.
+- `dump_users`: Encodes a list of users as JSON bytes.
+- `dump_user_batch`: Encodes a `UserBatch` as JSON bytes.
+- `json_response`: Wraps pre-encoded JSON in a `Response`.
+"""
+
+import uuid
+from collections.abc import Iterable
+from typing import Any
+
+import pydantic_core
+from fastapi import Response
+
+from app.schemas.user import UserPublic
+
+PUBLIC_FIELDS = tuple(UserPublic.model_fields)
+
+
+def _public_dict(user: Any) -> dict[str, Any]:
+    return {field: getattr(user, field) for field in PUBLIC_FIELDS}
+
+
+def dump_user(user: Any) -> bytes:
+    """Encode a trusted user as JSON without validating it.
+
+    Args:
+        user (Any): Object exposing the `UserPublic` fields as attributes,
+            such as a repository row or a `models.User`.
+
+    Returns:
+        bytes: The JSON object.
+
+    """
+    return pydantic_core.to_json(_public_dict(user))
+
+
+def dump_users(users: Iterable[Any]) -> bytes:
+    """Encode trusted users as a JSON array without validating them.
+
+    Args:
+        users (Iterable[Any]): Objects exposing the `UserPublic` fields
+            as attributes.
+
+    Returns:
+        bytes: The JSON array.
+
+    """
+    return pydantic_core.to_json([_public_dict(user) for user in users])
+
+
+def dump_user_batch(
+    users: Iterable[Any],
+    missing: Iterable[uuid.UUID],
+) -> bytes:
+    """Encode the result of a batch lookup like `UserBatch`.
+
+    Args:
+        users (Iterable[Any]): The users found, see `dump_users`.
+        missing (Iterable[uuid.UUID]): The ids not found.
+
+    Returns:
+        bytes: The JSON object.
+
+    """
+    return pydantic_core.to_json(
+        {
+            "users": [_public_dict(user) for user in users],
+            "missing": list(missing),
+        },
+    )
+
+
+def json_response(
+    content: bytes,
+    headers: dict[str, str] | None = None,
+) -> Response:
+    """Wrap pre-encoded JSON in a response, bypassing `response_model`.
+
+    Args:
+        content (bytes): The encoded JSON document.
+        headers (dict[str, str] | None): Extra response headers.
+
+    Returns:
+        Response: The `application/json` response.
+
+    """
+    return Response(
+        content=content,
+        media_type="application/json",
+        headers=headers,
+    )
@@ -6,78 +6,361 @@ transforming schema data into model instances.
 
 Key components:
 - `UserService`: Class encapsulating user-related operations.
+- `AsyncUserService`: Awaitable facade used by the async route handlers.
 """
 
+import itertools
 import uuid
+from collections.abc import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+    Sequence,
+)
+from typing import Any
 
-from passlib.context import CryptContext
+import pydantic
+from anyio import to_thread
+from sqlalchemy import Row, RowMapping
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.util import await_only
 
-from app import exceptions, models
+from app import exceptions, ids, models
+from app.hashing import PasswordHasher
+from app.passwords import hash_password, verify_and_update
 from app.repositories.user import UserRepository
 from app.schemas import user as schemas_user
+from app.singleflight import SingleFlight
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+def _duplicate(index: int) -> schemas_user.BulkUserResult:
+    return schemas_user.BulkUserResult(
+        index=index,
+        status="duplicate",
+        detail="Email already registered",
+    )
 
-def hash_password(password: str) -> str:
-    """Hash a plaintext password using bcrypt.
 
-    Args:
-        password (str): The plaintext password to hash.
-
-    Returns:
-        str: The hashed password.
-
-    """
-    return pwd_context.hash(password)
+def _created(
+    index: int,
+    row: dict[str, Any],
+) -> schemas_user.BulkUserResult:
+    return schemas_user.BulkUserResult(
+        index=index,
+        status="created",
+        user=schemas_user.UserPublic.model_validate(row),
+    )
 
 
 class UserService:
     """Service class responsible for user-related business logic."""
 
-    def __init__(self, user_repo: UserRepository) -> None:
+    def __init__(
+        self,
+        user_repo: UserRepository,
+        hasher: PasswordHasher | None = None,
+    ) -> None:
         """Initialize the UserService.
 
         Args:
             user_repo (UserRepository): The user repository instance used for database operations.
+            hasher (PasswordHasher | None): Optional bounded executor used for
+                password hashing. When omitted, passwords are hashed inline.
 
         """
         self.user_repo = user_repo
+        self.hasher = hasher
+
+    def _hash_password(self, password: str) -> str:
+        if self.hasher is None:
+            return hash_password(password)
+        return self.hasher.hash(password)
+
+    def _hash_passwords(self, passwords: list[str]) -> list[str]:
+        if self.hasher is None:
+            return [hash_password(password) for password in passwords]
+        return self.hasher.hash_many(passwords)
+
+    def _verify_password(
+        self,
+        password: str,
+        hashed_password: str,
+    ) -> tuple[bool, str | None]:
+        if self.hasher is None:
+            return verify_and_update(password, hashed_password)
+        return self.hasher.verify(password, hashed_password)
+
+    @staticmethod
+    def _validate_users(
+        items: Iterable[tuple[int, Any]],
+        results: dict[int, schemas_user.BulkUserResult],
+    ) -> list[tuple[int, schemas_user.UserCreate]]:
+        pending: list[tuple[int, schemas_user.UserCreate]] = []
+        seen_emails: set[str] = set()
+
+        for index, item in items:
+            try:
+                user_create = schemas_user.UserCreate.model_validate(
+                    item,
+                )
+            except pydantic.ValidationError as exc:
+                results[index] = schemas_user.BulkUserResult(
+                    index=index,
+                    status="invalid",
+                    detail="; ".join(
+                        ": ".join(
+                            filter(
+                                None,
+                                (
+                                    ".".join(map(str, error["loc"])),
+                                    error["msg"],
+                                ),
+                            ),
+                        )
+                        for error in exc.errors()
+                    ),
+                )
+                continue
+
+            email = user_create.email.lower()
+            if email in seen_emails:
+                results[index] = schemas_user.BulkUserResult(
+                    index=index,
+                    status="duplicate",
+                    detail="Email repeated in request",
+                )
+                continue
+            seen_emails.add(email)
+            pending.append((index, user_create))
+
+        return pending
+
+    def _create_users_chunk(
+        self,
+        chunk: list[tuple[int, schemas_user.UserCreate]],
+        results: dict[int, schemas_user.BulkUserResult],
+        hashed_passwords: dict[int, str] | None = None,
+        *,
+        retry: bool = True,
+    ) -> None:
+        existing = {
+            email.lower()
+            for email in self.user_repo.get_existing_emails(
+                [user_create.email for _, user_create in chunk],
+            )
+        }
+        fresh = []
+        for index, user_create in chunk:
+            if user_create.email.lower() in existing:
+                results[index] = _duplicate(index)
+            else:
+                fresh.append((index, user_create))
+        if not fresh:
+            return
+
+        if hashed_passwords is None:
+            hashed_passwords = dict(
+                zip(
+                    [index for index, _ in fresh],
+                    self._hash_passwords(
+                        [
+                            user_create.password
+                            for _, user_create in fresh
+                        ],
+                    ),
+                    strict=True,
+                ),
+            )
+        rows = [
+            user_create.model_dump()
+            | {"id": ids.new_id(), "password": hashed_passwords[index]}
+            for index, user_create in fresh
+        ]
+        try:
+            self.user_repo.create_users(rows)
+        except exceptions.ExistingEmailError:
+            if retry:
+                # An email was taken after the check, by a concurrent
+                # request or a write the email index had not seen: check
+                # again, keeping the hashes already computed.
+                self._create_users_chunk(
+                    fresh,
+                    results,
+                    hashed_passwords,
+                    retry=False,
+                )
+            else:
+                self._create_users_one_by_one(fresh, rows, results)
+            return
+
+        for (index, _), row in zip(fresh, rows, strict=True):
+            results[index] = _created(index, row)
+
+    def _create_users_one_by_one(
+        self,
+        fresh: list[tuple[int, schemas_user.UserCreate]],
+        rows: list[dict[str, Any]],
+        results: dict[int, schemas_user.BulkUserResult],
+    ) -> None:
+        # Emails keep being taken between the check and the insert, so
+        # insert each row alone and report only the ones that conflict.
+        for (index, _), row in zip(fresh, rows, strict=True):
+            try:
+                self.user_repo.create_users([row])
+            except exceptions.ExistingEmailError:
+                results[index] = _duplicate(index)
+            else:
+                results[index] = _created(index, row)
+
+    def check_email_available(self, email: str) -> None:
+        """Reject an email the email index cannot rule out as taken.
+
+        Without an email index nothing is checked, since the insert
+        enforces uniqueness anyway; with one, likely duplicates are
+        confirmed against the primary before paying for a password hash.
+
+        Args:
+            email (str): The email address to check.
+
+        Raises:
+            ExistingEmailError: If a user with the email already exists.
+
+        """
+        if self.user_repo.email_index is not None and (
+            self.user_repo.user_exists(email, primary=True)
+        ):
+            raise exceptions.ExistingEmailError
 
     def create_user_in_db(
         self,
         user_create: schemas_user.UserCreate,
+        hashed_password: str | None = None,
     ) -> models.User:
-        """Create a new user in the database after validating uniqueness.
+        """Create a new user in the database.
+
+        Email uniqueness is enforced by the repository through the
+        database constraint, so no lookup precedes the insert, except
+        for the `check_email_available` check made before hashing.
 
         Args:
             user_create (UserCreate): The user creation schema with input data.
+            hashed_password (str | None): Hash of the password, computed
+                by the caller after `check_email_available`. When
+                omitted, the email is checked and the password hashed
+                here.
 
         Raises:
             ExistingEmailError: If a user with the same email already exists.
+            HashingQueueFullError: If the password hashing queue is full.
 
         Returns:
             models.User: The newly created User ORM model.
 
         """
-        if self.user_repo.user_exists(user_create.email):
-            raise exceptions.ExistingEmailError
-
-        hashed_password = hash_password(
-            user_create.password,
+        if hashed_password is None:
+            self.check_email_available(user_create.email)
+            hashed_password = self._hash_password(user_create.password)
+        user = models.User(
+            **user_create.model_dump() | {"password": hashed_password},
         )
-        user_create.password = hashed_password
-        user = models.User(**user_create.model_dump())
 
         return self.user_repo.create_user(user)
 
+    def create_users_in_db(
+        self,
+        items: Sequence[Mapping[str, Any]],
+        chunk_size: int = 500,
+    ) -> list[schemas_user.BulkUserResult]:
+        """Create many users with batched uniqueness checks and inserts.
+
+        Each item is validated against `UserCreate`. Valid items are
+        processed in chunks: one `IN (...)` query finds taken emails,
+        passwords are hashed in parallel, and the new users are inserted
+        with a single executemany and commit per chunk.
+
+        Args:
+            items (Sequence[Mapping[str, Any]]): Raw user creation payloads.
+            chunk_size (int): Users per transaction. Default is 500.
+
+        Returns:
+            list[BulkUserResult]: One result per item, in input order.
+
+        """
+        results: dict[int, schemas_user.BulkUserResult] = {}
+        pending = self._validate_users(enumerate(items), results)
+
+        for start in range(0, len(pending), chunk_size):
+            self._create_users_chunk(
+                pending[start : start + chunk_size],
+                results,
+            )
+
+        return [results[index] for index in range(len(items))]
+
+    def import_users(
+        self,
+        rows: Iterable[tuple[int, Any]],
+        chunk_size: int = 1000,
+        max_reported_errors: int = 1000,
+    ) -> schemas_user.ImportSummary:
+        """Import users from an arbitrarily long stream of numbered rows.
+
+        Rows are consumed `chunk_size` at a time and each chunk goes
+        through the same path as `create_users_in_db`: validation, one
+        batched lookup of taken emails, parallel hashing and one
+        executemany with a single commit. Only the current chunk is held
+        in memory; emails repeated across chunks are caught by the lookup
+        since earlier chunks are already committed.
+
+        Args:
+            rows (Iterable[tuple[int, Any]]): Row numbers with raw payloads.
+            chunk_size (int): Rows per transaction. Default is 1000.
+            max_reported_errors (int): Maximum duplicate or invalid rows
+                listed in the summary. Default is 1000.
+
+        Returns:
+            ImportSummary: Counts of inserted, duplicate and invalid rows.
+
+        """
+        summary = schemas_user.ImportSummary()
+        iterator = iter(rows)
+        while chunk := list(itertools.islice(iterator, chunk_size)):
+            results: dict[int, schemas_user.BulkUserResult] = {}
+            self._create_users_chunk(
+                self._validate_users(chunk, results),
+                results,
+            )
+            for row in sorted(results):
+                result = results[row]
+                if result.status == "created":
+                    summary.inserted += 1
+                    continue
+                if result.status == "duplicate":
+                    summary.duplicates += 1
+                else:
+                    summary.invalid += 1
+                if len(summary.errors) < max_reported_errors:
+                    summary.errors.append(
+                        schemas_user.ImportRowError(
+                            row=row,
+                            status=result.status,
+                            detail=result.detail,
+                        ),
+                    )
+        return summary
+
     def get_users_from_db(
         self,
         offset: int = 0,
         limit: int = 100,
         username: str | None = None,
         email: str | None = None,
-    ) -> list[models.User]:
+        after: str | None = None,
+    ) -> list[Row]:
         """Retrieve a list of users from the database with optional filters.
 
         Args:
@@ -85,9 +368,10 @@ class UserService:
             limit (int): Maximum number of users to return. Default is 100.
             username (str | None): Optional filter by username.
             email (str | None): Optional filter by email.
+            after (str | None): Optional id to seek past (keyset pagination).
 
         Returns:
-            list[models.User]: A list of User ORM models matching the query.
+            list[Row]: The public columns of the matching users.
 
         """
         return self.user_repo.get_users(
@@ -95,19 +379,508 @@ class UserService:
             limit=limit,
             username=username,
             email=email,
+            after=after,
+        )
+
+    def count_users(
+        self,
+        username: str | None = None,
+        email: str | None = None,
+    ) -> tuple[int, bool]:
+        """Count the users matching the filters.
+
+        Args:
+            username (str | None): Optional filter by username.
+            email (str | None): Optional filter by email.
+
+        Returns:
+            tuple[int, bool]: The count, and whether it is exact; the
+                unfiltered count may be estimated.
+
+        """
+        return self.user_repo.count_users(
+            username=username,
+            email=email,
+        )
+
+    def search_users(
+        self,
+        field: str,
+        prefix: str,
+        limit: int = 100,
+        after: tuple[str, str] | None = None,
+        timeout_ms: int | None = None,
+    ) -> list[Row]:
+        """Find users whose `field` starts with `prefix`, one page at a time.
+
+        Args:
+            field (str): `username`, `full_name` or `email`.
+            prefix (str): The text the field must start with.
+            limit (int): Maximum number of users to return. Default is 100.
+            after (tuple[str, str] | None): Optional `(search_key, id)` to
+                seek past (keyset pagination).
+            timeout_ms (int | None): Optional time budget of the query,
+                in milliseconds.
+
+        Returns:
+            list[Row]: The public columns and `search_key` of the matching
+                users.
+
+        """
+        return self.user_repo.search_users(
+            field=field,
+            prefix=prefix,
+            limit=limit,
+            after=after,
+            timeout_ms=timeout_ms,
+        )
+
+    def stream_users(
+        self,
+        username: str | None = None,
+        email: str | None = None,
+        batch_size: int = 1000,
+    ) -> Iterator[RowMapping]:
+        """Stream every user matching the filters without loading them all.
+
+        Args:
+            username (str | None): Optional filter by username.
+            email (str | None): Optional filter by email.
+            batch_size (int): Rows fetched per round trip. Default is 1000.
+
+        Yields:
+            RowMapping: The public columns of one user.
+
+        """
+        yield from self.user_repo.stream_users(
+            username=username,
+            email=email,
+            batch_size=batch_size,
         )
 
     def get_user_by_id(
         self,
         user_id: uuid.UUID,
-    ) -> models.User | None:
+    ) -> Row | None:
         """Retrieve a single user by their UUID.
 
         Args:
             user_id (uuid.UUID): The unique identifier of the user.
 
         Returns:
-            models.User | None: The user object if found, or None if not found.
+            Row | None: The public columns of the user, or None if not found.
 
         """
         return self.user_repo.get_user_by_id(user_id)
+
+    def get_user_version(self, user_id: uuid.UUID) -> int | None:
+        """Retrieve only the row version of a user.
+
+        Args:
+            user_id (uuid.UUID): The unique identifier of the user.
+
+        Returns:
+            int | None: The version, or None if the user does not exist.
+
+        """
+        return self.user_repo.get_user_version(user_id)
+
+    def verify_password(self, email: str, password: str) -> bool:
+        """Check a user's password, upgrading its hash if outdated.
+
+        A hash made with another scheme, or a lower cost than the
+        current policy, is replaced once the password is known to match,
+        so stored hashes follow `app.passwords` calibration over time.
+
+        Args:
+            email (str): The email address of the user.
+            password (str): The plaintext password to check.
+
+        Raises:
+            HashingQueueFullError: If the password hashing queue is full.
+
+        Returns:
+            bool: True if a user has the email and the password matches.
+
+        """
+        credentials = self.user_repo.get_credentials(email)
+        if credentials is None:
+            return False
+        matches, new_hash = self._verify_password(
+            password,
+            credentials.password,
+        )
+        if matches and new_hash:
+            self.user_repo.update_password(credentials.id, new_hash)
+        return matches
+
+    def get_users_by_ids(
+        self,
+        user_ids: Iterable[uuid.UUID],
+    ) -> dict[uuid.UUID, Row | None]:
+        """Retrieve several users by id in one repository call.
+
+        Args:
+            user_ids (Iterable[uuid.UUID]): The unique identifiers of the
+                users. Repeated ids are looked up once.
+
+        Returns:
+            dict[uuid.UUID, Row | None]: The public columns of each user,
+                or None if not found, keyed by id in input order.
+
+        """
+        users = dict.fromkeys(user_ids)
+        for user in self.user_repo.get_users_by_ids(list(users)):
+            users[uuid.UUID(user.id)] = user
+        return users
+
+
+class _AwaitingHasher:
+    """Adapter letting `UserService` hash from inside `AsyncSession.run_sync`.
+
+    Code running under `run_sync` executes in a greenlet on the event loop
+    thread, so blocking on a future would stall the loop. This adapter
+    hands the wait back to the loop with `await_only` instead.
+    """
+
+    def __init__(self, hasher: PasswordHasher) -> None:
+        self._hasher = hasher
+
+    def hash(self, password: str) -> str:
+        return await_only(self._hasher.hash_async(password))
+
+    def hash_many(self, passwords: Iterable[str]) -> list[str]:
+        return await_only(self._hasher.hash_many_async(passwords))
+
+    def verify(
+        self,
+        password: str,
+        hashed_password: str,
+    ) -> tuple[bool, str | None]:
+        return await_only(
+            self._hasher.verify_async(password, hashed_password),
+        )
+
+
+class AsyncUserService:
+    """Awaitable facade exposing the `UserService` methods as coroutines.
+
+    The facade owns a runner deciding where the synchronous service code
+    executes, so the repository and business logic exist only once:
+
+    - `threaded`: on Starlette's threadpool against a blocking `Session`,
+      which is how the routes behaved when they were synchronous.
+    - `for_async_session`: through `AsyncSession.run_sync`, where
+      SQLAlchemy drives the async driver and every database wait yields
+      to the event loop instead of holding a thread.
+
+    `stream_users` becomes an async generator advanced by the same
+    runner, `STREAM_BATCH_SIZE` items per call. Given a hasher,
+    `create_user_in_db` awaits the password hash on the event loop
+    between two runner calls, so no thread waits on the hashing pool.
+    When a `SingleFlight` is given, concurrent identical calls to the
+    single-query reads share one database query. Streams are consumed
+    after the request's dependencies have been torn down, so the facade
+    closes the session once a stream is exhausted.
+
+    Example:
+        `await user_service.get_user_by_id(user_id)` runs
+        `UserService.get_user_by_id` with the configured runner.
+
+    """
+
+    STREAM_BATCH_SIZE = 1000
+
+    def __init__(
+        self,
+        run: Callable[[Callable[..., Any], Any], Awaitable[Any]],
+        service: UserService,
+        close: Callable[[], Awaitable[None]],
+        singleflight: SingleFlight | None = None,
+        hasher: PasswordHasher | None = None,
+    ) -> None:
+        """Initialize the facade.
+
+        Args:
+            run (Callable): Coroutine function calling a function with the
+                given arguments where the service code must execute.
+            service (UserService): The wrapped synchronous service.
+            close (Callable[[], Awaitable[None]]): Closes the session once a
+                stream is exhausted.
+            singleflight (SingleFlight | None): Optional coalescer shared
+                by every facade of the process.
+            hasher (PasswordHasher | None): Hashing pool awaited by
+                `create_user_in_db` outside the runner.
+
+        """
+        self._run = run
+        self._service = service
+        self._close = close
+        self._singleflight = singleflight
+        self._hasher = hasher
+
+    @classmethod
+    def threaded(
+        cls,
+        session: Session,
+        hasher: PasswordHasher | None = None,
+        repo_factory: Callable[
+            [Session],
+            UserRepository,
+        ] = UserRepository,
+        singleflight: SingleFlight | None = None,
+    ) -> "AsyncUserService":
+        """Build a facade running the service on the threadpool.
+
+        Args:
+            session (Session): Blocking SQLAlchemy session.
+            hasher (PasswordHasher | None): Optional bounded hashing pool.
+            repo_factory (Callable[[Session], UserRepository]): Builds the
+                repository for the session. Default is `UserRepository`.
+            singleflight (SingleFlight | None): Optional read coalescer.
+
+        Returns:
+            AsyncUserService: The facade.
+
+        """
+
+        async def close() -> None:
+            await to_thread.run_sync(session.close)
+
+        return cls(
+            to_thread.run_sync,
+            UserService(repo_factory(session), hasher=hasher),
+            close,
+            singleflight,
+            hasher,
+        )
+
+    @classmethod
+    def for_async_session(
+        cls,
+        session: AsyncSession,
+        hasher: PasswordHasher | None = None,
+        repo_factory: Callable[
+            [Session],
+            UserRepository,
+        ] = UserRepository,
+        singleflight: SingleFlight | None = None,
+    ) -> "AsyncUserService":
+        """Build a facade running the service on an `AsyncSession`.
+
+        Args:
+            session (AsyncSession): Async SQLAlchemy session.
+            hasher (PasswordHasher | None): Optional bounded hashing pool.
+            repo_factory (Callable[[Session], UserRepository]): Builds the
+                repository for the synchronous session facade. Default is
+                `UserRepository`.
+            singleflight (SingleFlight | None): Optional read coalescer.
+
+        Returns:
+            AsyncUserService: The facade.
+
+        """
+
+        async def run(func: Callable[..., Any], *args: Any) -> Any:
+            return await session.run_sync(lambda _: func(*args))
+
+        return cls(
+            run,
+            UserService(
+                repo_factory(session.sync_session),
+                hasher=_AwaitingHasher(hasher) if hasher else None,  # type: ignore[arg-type]
+            ),
+            session.close,
+            singleflight,
+        )
+
+    async def create_user_in_db(
+        self,
+        user_create: schemas_user.UserCreate,
+    ) -> models.User:
+        """Run `UserService.create_user_in_db`, hashing on the event loop.
+
+        Args:
+            user_create (UserCreate): The user creation schema with input data.
+
+        Raises:
+            ExistingEmailError: If a user with the same email already exists.
+            HashingQueueFullError: If the password hashing queue is full.
+
+        Returns:
+            models.User: The newly created User ORM model.
+
+        """
+        service = self._service
+        if self._hasher is None:
+            return await self._run(
+                lambda: service.create_user_in_db(user_create),
+            )
+        if service.user_repo.email_index is not None:
+            await self._run(
+                service.check_email_available,
+                user_create.email,
+            )
+        hashed_password = await self._hasher.hash_async(
+            user_create.password,
+        )
+        return await self._run(
+            service.create_user_in_db,
+            user_create,
+            hashed_password,
+        )
+
+    async def _stream(
+        self,
+        iterator: Iterator[Any],
+    ) -> AsyncIterator[Any]:
+        try:
+            while batch := await self._run(
+                lambda: list(
+                    itertools.islice(iterator, self.STREAM_BATCH_SIZE),
+                ),
+            ):
+                for item in batch:
+                    yield item
+        finally:
+            await self._close()
+
+    async def _call(
+        self,
+        func: Callable[..., Any],
+        **kwargs: Any,
+    ) -> Any:
+        return await self._run(lambda: func(**kwargs))
+
+    async def _read(
+        self,
+        func: Callable[..., Any],
+        **kwargs: Any,
+    ) -> Any:
+        if self._singleflight is None:
+            return await self._call(func, **kwargs)
+        return await self._singleflight.do(
+            (func.__name__, tuple(sorted(kwargs.items()))),
+            lambda: self._call(func, **kwargs),
+        )
+
+    async def create_users_in_db(
+        self,
+        items: Sequence[Mapping[str, Any]],
+        chunk_size: int = 500,
+    ) -> list[schemas_user.BulkUserResult]:
+        """Run `UserService.create_users_in_db`."""
+        return await self._call(
+            self._service.create_users_in_db,
+            items=items,
+            chunk_size=chunk_size,
+        )
+
+    async def import_users(
+        self,
+        rows: Iterable[tuple[int, Any]],
+        chunk_size: int = 1000,
+        max_reported_errors: int = 1000,
+    ) -> schemas_user.ImportSummary:
+        """Run `UserService.import_users`."""
+        return await self._call(
+            self._service.import_users,
+            rows=rows,
+            chunk_size=chunk_size,
+            max_reported_errors=max_reported_errors,
+        )
+
+    async def get_users_from_db(
+        self,
+        offset: int = 0,
+        limit: int = 100,
+        username: str | None = None,
+        email: str | None = None,
+        after: str | None = None,
+    ) -> list[Row]:
+        """Run `UserService.get_users_from_db` (coalesced)."""
+        return await self._read(
+            self._service.get_users_from_db,
+            offset=offset,
+            limit=limit,
+            username=username,
+            email=email,
+            after=after,
+        )
+
+    async def count_users(
+        self,
+        username: str | None = None,
+        email: str | None = None,
+    ) -> tuple[int, bool]:
+        """Run `UserService.count_users` (coalesced)."""
+        return await self._read(
+            self._service.count_users,
+            username=username,
+            email=email,
+        )
+
+    async def search_users(
+        self,
+        field: str,
+        prefix: str,
+        limit: int = 100,
+        after: tuple[str, str] | None = None,
+        timeout_ms: int | None = None,
+    ) -> list[Row]:
+        """Run `UserService.search_users` (coalesced)."""
+        return await self._read(
+            self._service.search_users,
+            field=field,
+            prefix=prefix,
+            limit=limit,
+            after=after,
+            timeout_ms=timeout_ms,
+        )
+
+    def stream_users(
+        self,
+        username: str | None = None,
+        email: str | None = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[RowMapping]:
+        """Stream `UserService.stream_users`, then close the session."""
+        return self._stream(
+            self._service.stream_users(
+                username=username,
+                email=email,
+                batch_size=batch_size,
+            ),
+        )
+
+    async def get_user_by_id(self, user_id: uuid.UUID) -> Row | None:
+        """Run `UserService.get_user_by_id` (coalesced)."""
+        return await self._read(
+            self._service.get_user_by_id,
+            user_id=user_id,
+        )
+
+    async def get_user_version(self, user_id: uuid.UUID) -> int | None:
+        """Run `UserService.get_user_version` (coalesced)."""
+        return await self._read(
+            self._service.get_user_version,
+            user_id=user_id,
+        )
+
+    async def verify_password(self, email: str, password: str) -> bool:
+        """Run `UserService.verify_password`."""
+        return await self._call(
+            self._service.verify_password,
+            email=email,
+            password=password,
+        )
+
+    async def get_users_by_ids(
+        self,
+        user_ids: Iterable[uuid.UUID],
+    ) -> dict[uuid.UUID, Row | None]:
+        """Run `UserService.get_users_by_ids`."""
+        return await self._call(
+            self._service.get_users_by_ids,
+            user_ids=user_ids,
+        )
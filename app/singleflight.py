@@ -0,0 +1,99 @@
+"""Coalescing of concurrent identical reads.
+
+When a hot key is requested by many clients at once, every request
+would otherwise check out a pool connection and run the same query.
+`SingleFlight` lets the first caller for a key run the call and hands
+its result, or its exception, to every caller that asks for the same key
+while the call is in flight. Nothing is kept once the call completes,
+so results are never older than a read that started concurrently with
+the request.
+
+Key components:
+- `SingleFlightStats`: Call and deduplication counters.
+- `SingleFlight`: Shares in-flight calls between callers of the same key.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class SingleFlightStats:
+    """Cumulative counters of a `SingleFlight`.
+
+    Attributes:
+        calls (int): Calls made through the coalescer.
+        deduplicated (int): Calls answered by another caller's in-flight
+            call instead of running their own.
+
+    """
+
+    calls: int = 0
+    deduplicated: int = 0
+
+
+class SingleFlight:
+    """Share the result of an in-flight call between identical callers.
+
+    Runs on the event loop and needs no locking. Followers wait on the
+    leader through `asyncio.shield`, so a follower being cancelled does
+    not affect the others. If the leader itself is cancelled, for example
+    because its client disconnected, the waiting followers run the call
+    themselves instead of failing.
+
+    Attributes:
+        stats (SingleFlightStats): Call and deduplication counters.
+
+    """
+
+    def __init__(self) -> None:
+        """Initialize a coalescer with no calls in flight."""
+        self.stats = SingleFlightStats()
+        self._in_flight: dict[Hashable, asyncio.Future[Any]] = {}
+
+    async def do(
+        self,
+        key: Hashable,
+        func: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Run `func`, or join the in-flight call for the same key.
+
+        Args:
+            key (Hashable): Identifies calls that return the same result.
+            func (Callable[[], Awaitable[Any]]): Coroutine function making
+                the call.
+
+        Returns:
+            Any: The result of the call, shared with other callers.
+
+        """
+        self.stats.calls += 1
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.stats.deduplicated += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+            return await func()
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Followers re-raise it; silence "never retrieved" if none.
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._in_flight[key]
@@ -0,0 +1,298 @@
+"""Load and latency benchmark of the user API.
+
+Drives the app in-process through its ASGI interface, so that results
+reflect the routers, `UserService` and `UserRepository` rather than the
+network. Each workload sends a fixed number of requests from concurrent
+workers and reports throughput and p50/p95/p99 latency:
+
+- `create`: `POST /users/`, hashing a password per request.
+- `get`: `GET /users/{id}` for random seeded users.
+- `filter`: `GET /users/?username=...` for random seeded usernames.
+- `deep_offset`: `GET /users/` with an offset near the end of the table.
+- `deep_cursor`: The same page fetched with a keyset cursor.
+
+The database comes from the usual `DB_*` environment variables, which
+default here to a SQLite file in a temporary directory standing in for
+MySQL; other settings, such as `USER_CACHE_SIZE`, are read as usual.
+`PASSWORD_HASH_ROUNDS` defaults to 12, the bcrypt floor, so the startup
+calibration does not compete for CPU or change the hash cost mid-run.
+Seeded rows are inserted directly, and requests are picked with a fixed
+seed, so runs are comparable.
+
+Results are written as JSON with `--output`, along with the parameters
+of the run. With `--baseline`, each workload is compared against a
+stored result and the command exits with status 1 when throughput
+drops, or p95 latency grows, by more than `--threshold`, or when the
+share of failed requests grows. `create` is
+bounded by bcrypt and the hashing pool, so give it fewer requests by
+running it separately.
+
+Usage:
+    python -m benchmarks.load [--rows 10000] [--requests 1000]
+        [--concurrency 16] [--workloads get,filter] [--output FILE]
+        [--baseline FILE] [--threshold 0.2]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from typing import Any
+
+WORKLOADS = ("create", "get", "filter", "deep_offset", "deep_cursor")
+_ROW = "{:<14}{:>10}{:>10}{:>10}{:>10}{:>8}"
+
+Request = tuple[str, str, dict[str, Any]]
+
+
+def _seed(rows: int) -> list[str]:
+    from sqlalchemy import create_engine, insert
+
+    from app import config, db, ids, models
+
+    user_ids = [ids.new_id() for _ in range(rows)]
+    engine = create_engine(db.database_url(config.settings.db_type))
+    with engine.begin() as connection:
+        connection.execute(
+            insert(models.User),
+            [
+                {
+                    "id": user_id,
+                    "username": f"user{i}",
+                    "full_name": f"User {i}",
+                    "email": f"user{i}@example.com",
+                    "password": "hash",
+                }
+                for i, user_id in enumerate(user_ids)
+            ],
+        )
+    engine.dispose()
+    return sorted(user_ids)
+
+
+def _requests(
+    user_ids: list[str],
+    rng: random.Random,
+) -> dict[str, Callable[[int], Request]]:
+    from app import pagination
+
+    rows = len(user_ids)
+    deep = max(rows - 100, 0)
+    cursor = (
+        pagination.encode_cursor(user_ids[deep - 1]) if deep else None
+    )
+
+    def create(i: int) -> Request:
+        user = {
+            "username": f"load{i}",
+            "email": f"load{i}.{rng.getrandbits(32)}@example.com",
+            "password": "secret",
+        }
+        return "POST", "/users/", {"json": user}
+
+    return {
+        "create": create,
+        "get": lambda _: ("GET", f"/users/{rng.choice(user_ids)}", {}),
+        "filter": lambda _: (
+            "GET",
+            "/users/",
+            {"params": {"username": f"user{rng.randrange(rows)}"}},
+        ),
+        "deep_offset": lambda _: (
+            "GET",
+            "/users/",
+            {"params": {"offset": deep, "limit": 100}},
+        ),
+        "deep_cursor": lambda _: (
+            "GET",
+            "/users/",
+            {
+                "params": {"cursor": cursor, "limit": 100}
+                if cursor
+                else {}
+            },
+        ),
+    }
+
+
+async def _run_workload(
+    client: Any,
+    make_request: Callable[[int], Request],
+    requests: int,
+    concurrency: int,
+) -> dict[str, float]:
+    latencies: list[float] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for i in counter:
+            method, url, kwargs = make_request(i)
+            started_at = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            latencies.append(time.perf_counter() - started_at)
+            if response.status_code >= 400:  # noqa: PLR2004
+                errors += 1
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started_at
+    p50, p95, p99 = (
+        statistics.quantiles(latencies, n=100, method="inclusive")[q]
+        for q in (49, 94, 98)
+    )
+    return {
+        "requests": requests,
+        "errors": errors,
+        "rps": requests / elapsed,
+        "p50_ms": p50 * 1000,
+        "p95_ms": p95 * 1000,
+        "p99_ms": p99 * 1000,
+    }
+
+
+async def _benchmark(args: argparse.Namespace) -> dict[str, Any]:
+    import httpx
+
+    from app import main as app_main
+
+    rng = random.Random(args.seed)  # noqa: S311
+    results = {}
+    async with app_main.lifespan(app_main.app):
+        user_ids = _seed(args.rows)
+        requests = _requests(user_ids, rng)
+        transport = httpx.ASGITransport(app=app_main.app)
+        async with httpx.AsyncClient(
+            transport=transport,
+            base_url="http://benchmark",
+        ) as client:
+            for name in args.workloads:
+                await _run_workload(
+                    client,
+                    requests[name],
+                    args.warmup,
+                    args.concurrency,
+                )
+                results[name] = await _run_workload(
+                    client,
+                    requests[name],
+                    args.requests,
+                    args.concurrency,
+                )
+    return results
+
+
+def _regressions(
+    results: dict[str, Any],
+    baseline: dict[str, Any],
+    threshold: float,
+) -> list[str]:
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        if result["rps"] < previous["rps"] * (1 - threshold):
+            regressions.append(
+                f"{name}: {result['rps']:.0f} rps, "
+                f"baseline {previous['rps']:.0f}",
+            )
+        if result["p95_ms"] > previous["p95_ms"] * (1 + threshold):
+            regressions.append(
+                f"{name}: p95 {result['p95_ms']:.1f} ms, "
+                f"baseline {previous['p95_ms']:.1f}",
+            )
+        error_rate = result["errors"] / result["requests"]
+        previous_error_rate = previous["errors"] / previous["requests"]
+        if error_rate > previous_error_rate:
+            regressions.append(
+                f"{name}: {error_rate:.1%} errors, "
+                f"baseline {previous_error_rate:.1%}",
+            )
+    return regressions
+
+
+def main() -> None:
+    """Run the selected workloads, print and compare their results."""
+    parser = argparse.ArgumentParser(
+        description=__doc__.splitlines()[0],
+    )
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument(
+        "--workloads",
+        type=lambda value: value.split(","),
+        default=list(WORKLOADS),
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output")
+    parser.add_argument("--baseline")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+    unknown = set(args.workloads) - set(WORKLOADS)
+    if unknown:
+        parser.error(f"unknown workloads: {', '.join(sorted(unknown))}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for key, value in {
+            "DB_TYPE": "sqlite",
+            "DB_NAME": os.path.join(directory, "load.db"),
+            "DB_USER": "",
+            "DB_PASSWORD": "",
+            "DB_HOST": "",
+            "DB_PORT": "0",
+            "PASSWORD_HASH_ROUNDS": "12",
+        }.items():
+            os.environ.setdefault(key, value)
+        results = asyncio.run(_benchmark(args))
+
+    print(
+        _ROW.format(
+            "workload", "rps", "p50 ms", "p95 ms", "p99 ms", "err"
+        )
+    )
+    for name, result in results.items():
+        print(
+            _ROW.format(
+                name,
+                f"{result['rps']:.0f}",
+                f"{result['p50_ms']:.1f}",
+                f"{result['p95_ms']:.1f}",
+                f"{result['p99_ms']:.1f}",
+                result["errors"],
+            ),
+        )
+    if args.output:
+        parameters = {
+            key: getattr(args, key)
+            for key in ("rows", "requests", "concurrency", "seed")
+        }
+        with open(args.output, "w") as file:
+            json.dump(
+                {"parameters": parameters, "workloads": results},
+                file,
+                indent=2,
+            )
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = _regressions(
+                results,
+                json.load(file)["workloads"],
+                args.threshold,
+            )
+        if regressions:
+            print("\n".join(["Regressions:", *regressions]))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
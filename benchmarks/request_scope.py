@@ -0,0 +1,179 @@
+"""Measure the per-request cost of the session and service dependencies.
+
+Compares two ways of providing the user service to the same route,
+looking up one existing user by id:
+
+- `threaded`: A blocking `get_session` generator and a plain function
+  building the service, as the app used to have. FastAPI runs both on
+  the threadpool, entering and leaving each through a worker thread.
+- `lazy`: `app.dependencies.get_user_service`, whose coroutines build
+  the session and service on the event loop and only use the threadpool
+  to end a transaction that began.
+
+With the default user cache, lookups rarely reach the database, so the
+difference is the overhead of the dependencies themselves; set
+`USER_CACHE_SIZE=0` to include the query and the transaction. Both
+variants use blocking sessions, so leave `DB_ASYNC` unset.
+
+Usage:
+    python -m benchmarks.request_scope [--requests 5000]
+        [--concurrency 16]
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from typing import Annotated, Any
+
+_ROW = "{:<10}{:>10}{:>14}"
+
+
+def _routes() -> dict[str, Any]:
+    from fastapi import Depends, Request
+    from sqlalchemy.orm import Session
+
+    from app import dependencies
+    from app.services.user import AsyncUserService
+
+    def get_session(request: Request):
+        session = request.app.state.SessionLocal()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    def get_user_service(
+        request: Request,
+        session: Session = Depends(get_session),
+    ) -> AsyncUserService:
+        return AsyncUserService.threaded(
+            session,
+            hasher=request.app.state.password_hasher,
+            repo_factory=dependencies._repo_factory(request, session),  # noqa: SLF001
+            singleflight=request.app.state.singleflight,
+        )
+
+    async def threaded(
+        user_id: str,
+        user_service: Annotated[
+            AsyncUserService,
+            Depends(get_user_service),
+        ],
+    ) -> Any:
+        return await user_service.get_user_by_id(user_id)
+
+    async def lazy(
+        user_id: str,
+        user_service: dependencies.UserServiceDep,
+    ) -> Any:
+        return await user_service.get_user_by_id(user_id)
+
+    return {"threaded": threaded, "lazy": lazy}
+
+
+async def _measure(
+    client: Any,
+    url: str,
+    requests: int,
+    concurrency: int,
+) -> float:
+    counter = iter(range(requests))
+
+    async def worker() -> None:
+        for _ in counter:
+            response = await client.get(url)
+            response.raise_for_status()
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - started_at
+
+
+async def _benchmark(args: argparse.Namespace) -> dict[str, float]:
+    import httpx
+
+    from app import main as app_main
+    from app.schemas.user import UserPublic
+
+    routes = _routes()
+    for name, endpoint in routes.items():
+        app_main.app.add_api_route(
+            f"/benchmark/{name}/{{user_id}}",
+            endpoint,
+            response_model=UserPublic,
+        )
+    results = {}
+    async with app_main.lifespan(app_main.app):
+        transport = httpx.ASGITransport(app=app_main.app)
+        async with httpx.AsyncClient(
+            transport=transport,
+            base_url="http://benchmark",
+        ) as client:
+            created = await client.post(
+                "/users/",
+                json={
+                    "username": "benchmark",
+                    "email": "benchmark@example.com",
+                    "password": "secret",
+                },
+            )
+            user_id = created.json()["id"]
+            urls = {
+                name: f"/benchmark/{name}/{user_id}" for name in routes
+            }
+            for url in urls.values():
+                await _measure(
+                    client,
+                    url,
+                    args.warmup,
+                    args.concurrency,
+                )
+            for name, url in urls.items():
+                results[name] = await _measure(
+                    client,
+                    url,
+                    args.requests,
+                    args.concurrency,
+                )
+    return results
+
+
+def main() -> None:
+    """Run the benchmark and print throughput and time per request."""
+    parser = argparse.ArgumentParser(
+        description=__doc__.splitlines()[0],
+    )
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for key, value in {
+            "DB_TYPE": "sqlite",
+            "DB_NAME": os.path.join(directory, "request_scope.db"),
+            "DB_USER": "",
+            "DB_PASSWORD": "",
+            "DB_HOST": "",
+            "DB_PORT": "0",
+        }.items():
+            os.environ.setdefault(key, value)
+        results = asyncio.run(_benchmark(args))
+
+    print(_ROW.format("variant", "rps", "us/request"))
+    for name, elapsed in results.items():
+        print(
+            _ROW.format(
+                name,
+                f"{args.requests / elapsed:.0f}",
+                f"{elapsed / args.requests * 1e6:.0f}",
+            ),
+        )
+    saved = (results["threaded"] - results["lazy"]) / args.requests
+    print(f"saved {saved * 1e6:.0f} us per request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Compare the default and fast JSON paths for a page of users.
+
+The default path is what FastAPI runs for a route returning rows with
+`response_model=list[UserPublic]`: `serialize_response` validates and
+dumps the rows, then `JSONResponse` encodes the result with `json`. The
+fast path is `app.serialization.dump_users`, used when
+`Settings.fast_json` is enabled. Rows are real repository rows read from
+an in-memory SQLite database.
+
+Usage:
+    python -m benchmarks.serialization [--rows 100] [--repeat 2000]
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from app import models, serialization
+from app.repositories.user import UserRepository
+from app.schemas.user import UserPublic
+
+
+def _load_rows(count: int) -> list:
+    engine = create_engine("sqlite://")
+    models.Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.execute(
+            insert(models.User),
+            [
+                {
+                    "id": str(uuid.uuid4()),
+                    "username": f"user{i}",
+                    "full_name": f"User {i}",
+                    "phone_number": "+34 123 456 789",
+                    "email": f"user{i}@example.com",
+                    "password": "hash",
+                }
+                for i in range(count)
+            ],
+        )
+        session.commit()
+        return UserRepository(session).get_users(limit=count)
+
+
+async def _time_default_path(rows: list, repeat: int) -> float:
+    field = create_model_field(name="Response", type_=list[UserPublic])
+    started_at = time.perf_counter()
+    for _ in range(repeat):
+        content = await serialize_response(
+            field=field,
+            response_content=rows,
+        )
+        JSONResponse(content)
+    return (time.perf_counter() - started_at) / (repeat * len(rows))
+
+
+def _time_fast_path(rows: list, repeat: int) -> float:
+    started_at = time.perf_counter()
+    for _ in range(repeat):
+        serialization.json_response(serialization.dump_users(rows))
+    return (time.perf_counter() - started_at) / (repeat * len(rows))
+
+
+def main() -> None:
+    """Run the benchmark and print the cost per serialized row."""
+    parser = argparse.ArgumentParser(
+        description=__doc__.splitlines()[0],
+    )
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    rows = _load_rows(args.rows)
+    default = asyncio.run(_time_default_path(rows, args.repeat))
+    fast = _time_fast_path(rows, args.repeat)
+
+    print(f"rows per page: {args.rows}")
+    print(f"default path:  {default * 1e6:8.2f} us/row")
+    print(f"fast path:     {fast * 1e6:8.2f} us/row")
+    print(f"speedup:       {default / fast:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
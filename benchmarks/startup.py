@@ -0,0 +1,103 @@
+"""Measure cold-start time of the app, with and without schema creation.
+
+Each run starts a fresh interpreter, as a new pod would, and reports the
+time to import `app.main` and the time `lifespan` takes until the app is
+ready to serve. Both startup modes are measured: creating tables with
+`metadata.create_all`, and only checking the schema version. The schema
+is created and stamped with `python -m app.migrations upgrade` first.
+
+The database comes from the usual `DB_*` environment variables, which
+default here to a SQLite file in a temporary directory; set them to
+measure against MySQL.
+
+Usage:
+    python -m benchmarks.startup [--runs 10]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+MODES = {"create tables": "true", "check version": "false"}
+_ROW = "{:<16}{:>12}{:>12}{:>12}"
+_CHILD = """
+import asyncio, json, time
+started_at = time.perf_counter()
+from app import main
+imported_at = time.perf_counter()
+
+async def start():
+    async with main.lifespan(main.app):
+        return time.perf_counter()
+
+ready_at = asyncio.run(start())
+print(json.dumps({
+    "import": imported_at - started_at,
+    "ready": ready_at - imported_at,
+}))
+"""
+
+
+def _run(env: dict[str, str]) -> dict[str, float]:
+    started_at = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", _CHILD],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings = json.loads(result.stdout.splitlines()[-1])
+    timings["total"] = time.perf_counter() - started_at
+    return timings
+
+
+def _median_ms(runs: list[dict[str, float]], key: str) -> str:
+    return f"{statistics.median(run[key] for run in runs) * 1000:.1f}"
+
+
+def main() -> None:
+    """Run the benchmark and print median startup times per mode."""
+    parser = argparse.ArgumentParser(
+        description=__doc__.splitlines()[0],
+    )
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        env = {
+            "DB_TYPE": "sqlite",
+            "DB_NAME": os.path.join(directory, "startup.db"),
+            "DB_USER": "",
+            "DB_PASSWORD": "",
+            "DB_HOST": "",
+            "DB_PORT": "0",
+            **os.environ,
+        }
+        subprocess.run(
+            [sys.executable, "-m", "app.migrations", "upgrade"],
+            env=env,
+            capture_output=True,
+            check=True,
+        )
+        print(_ROW.format("mode", "import ms", "ready ms", "total ms"))
+        for name, create_schema in MODES.items():
+            mode_env = {**env, "DB_CREATE_SCHEMA": create_schema}
+            runs = [_run(mode_env) for _ in range(args.runs)]
+            print(
+                _ROW.format(
+                    name,
+                    _median_ms(runs, "import"),
+                    _median_ms(runs, "ready"),
+                    _median_ms(runs, "total"),
+                ),
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Compare insert throughput and table size per user id format.
+
+Each variant fills a scratch copy of the `user` table, named
+`benchmark_user`, with the same rows, using `app.ids` to generate and
+store the ids. On MySQL the data and index sizes reported by
+`information_schema` are printed too; they are where random `CHAR(36)`
+keys hurt most, since `username` and `email` index entries embed the
+primary key. SQLite, the default, only reports throughput.
+
+Usage:
+    python -m benchmarks.user_ids [--url sqlite://] [--rows 100000]
+        [--batch 1000]
+"""
+
+import argparse
+import time
+
+from sqlalchemy import MetaData, Table, create_engine, insert, text
+
+from app import ids, models
+
+VARIANTS = {
+    "char uuid4": {"binary": False, "time_ordered": False},
+    "char uuid7": {"binary": False, "time_ordered": True},
+    "binary uuid7": {"binary": True, "time_ordered": True},
+}
+_ROW = "{:<14}{:>10}{:>12}{:>12}"
+
+
+def _scratch_table() -> Table:
+    return models.User.__table__.to_metadata(
+        MetaData(),
+        name="benchmark_user",
+    )
+
+
+def _insert_rows(url: str, rows: int, batch: int) -> float:
+    engine = create_engine(url)
+    table = _scratch_table()
+    table.drop(engine, checkfirst=True)
+    table.create(engine)
+    started_at = time.perf_counter()
+    for start in range(0, rows, batch):
+        with engine.begin() as connection:
+            connection.execute(
+                insert(table),
+                [
+                    {
+                        "id": ids.new_id(),
+                        "username": f"user{i}",
+                        "email": f"user{i}@example.com",
+                        "password": "hash",
+                    }
+                    for i in range(start, min(start + batch, rows))
+                ],
+            )
+    elapsed = time.perf_counter() - started_at
+    engine.dispose()
+    return rows / elapsed
+
+
+def _table_size(url: str) -> tuple[int, int] | None:
+    engine = create_engine(url)
+    if engine.dialect.name != "mysql":
+        return None
+    with engine.connect() as connection:
+        connection.execute(text("ANALYZE TABLE benchmark_user"))
+        data, index = connection.execute(
+            text(
+                "SELECT data_length, index_length "
+                "FROM information_schema.tables "
+                "WHERE table_schema = DATABASE() "
+                "AND table_name = 'benchmark_user'",
+            ),
+        ).one()
+    _scratch_table().drop(engine)
+    engine.dispose()
+    return data, index
+
+
+def main() -> None:
+    """Run the benchmark and print throughput and size per id format."""
+    parser = argparse.ArgumentParser(
+        description=__doc__.splitlines()[0],
+    )
+    parser.add_argument("--url", default="sqlite://")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+
+    print(_ROW.format("format", "rows/s", "data KiB", "index KiB"))
+    for name, options in VARIANTS.items():
+        ids.configure(**options)
+        throughput = _insert_rows(args.url, args.rows, args.batch)
+        size = _table_size(args.url)
+        data, index = (
+            (f"{size[0] // 1024}", f"{size[1] // 1024}")
+            if size
+            else ("n/a", "n/a")
+        )
+        print(_ROW.format(name, f"{throughput:.0f}", data, index))
+    ids.configure()
+
+
+if __name__ == "__main__":
+    main()
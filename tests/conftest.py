@@ -1,3 +1,4 @@
+import os
 import uuid
 
 import pydantic
@@ -5,6 +6,10 @@ import pytest
 
 from app.schemas import user as user_schemas
 
+# Calibrating the hash cost on every app startup would dominate the
+# suite, so tests hash at a fixed low cost unless told otherwise.
+os.environ.setdefault("PASSWORD_HASH_ROUNDS", "4")
+
 
 class _ExampleUser(pydantic.BaseModel):
     id: uuid.UUID = uuid.UUID("11111111-2222-3333-4444-555566667777")
@@ -2,10 +2,11 @@ import uuid
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import Engine
+from sqlalchemy import Engine, exc
 from sqlalchemy.orm import Session, sessionmaker
 
-from app import main, models
+from app import exceptions, main, models
+from app.email_index import EmailIndex
 from app.repositories.user import UserRepository
 
 
@@ -47,6 +48,7 @@ def test_user_exists(user_repo, db_session):
     db_session.commit()
 
     assert user_repo.user_exists("exists@example.com") is True
+    assert user_repo.user_exists("Exists@Example.com") is True
     assert user_repo.user_exists("notfound@example.com") is False
 
 
@@ -64,6 +66,53 @@ def test_create_user(user_repo):
     assert result.username == "newuser"
 
 
+@pytest.mark.integration
+def test_create_user_with_existing_email_raises(user_repo, db_session):
+    db_session.add(
+        models.User(
+            username="first",
+            email="taken@example.com",
+            password="secret",
+        ),
+    )
+    db_session.commit()
+
+    with pytest.raises(exceptions.ExistingEmailError):
+        user_repo.create_user(
+            models.User(
+                username="second",
+                email="taken@example.com",
+                password="secret",
+            ),
+        )
+
+
+@pytest.mark.integration
+def test_create_user_with_existing_id_is_not_a_duplicate_email(
+    user_repo,
+    db_session,
+):
+    first = models.User(
+        username="first",
+        email="first@example.com",
+        password="secret",
+    )
+    db_session.add(first)
+    db_session.commit()
+    first_id = first.id
+    db_session.expunge_all()
+
+    with pytest.raises(exc.IntegrityError):
+        user_repo.create_user(
+            models.User(
+                id=first_id,
+                username="second",
+                email="second@example.com",
+                password="secret",
+            ),
+        )
+
+
 @pytest.mark.integration
 def test_get_users_default(user_repo, db_session):
     users = [
@@ -120,6 +169,7 @@ def test_get_user_by_id(user_repo, db_session):
     result = user_repo.get_user_by_id(uuid.UUID(user.id))  # type: ignore
     assert result is not None
     assert result.email == "byid@example.com"
+    assert "password" not in result._fields
 
 
 @pytest.mark.integration
@@ -127,3 +177,212 @@ def test_get_user_by_id_not_found(user_repo):
     random_id = uuid.uuid4()
     result = user_repo.get_user_by_id(random_id)
     assert result is None
+
+
+@pytest.mark.integration
+def test_get_existing_emails(user_repo, db_session):
+    db_session.add(
+        models.User(
+            username="taken",
+            email="taken@example.com",
+            password="secret",
+        ),
+    )
+    db_session.commit()
+
+    result = user_repo.get_existing_emails(
+        ["Taken@example.com", "free@example.com"],
+    )
+    assert result == {"taken@example.com"}
+    assert user_repo.get_existing_emails([]) == set()
+
+
+@pytest.mark.integration
+def test_email_index_skips_and_tracks_queries(db_session):
+    db_session.add(
+        models.User(
+            username="indexed",
+            email="indexed@example.com",
+            password="secret",
+        ),
+    )
+    db_session.commit()
+    index = EmailIndex(capacity=100, error_rate=0.01)
+    repo = UserRepository(session=db_session, email_index=index)
+    index.rebuild(repo.stream_emails())
+
+    assert repo.user_exists("indexed@example.com") is True
+    assert repo.user_exists("free@example.com") is False
+    assert repo.get_existing_emails(
+        ["indexed@example.com", "free@example.com"],
+    ) == {"indexed@example.com"}
+    assert index.stats.skipped_queries == 2
+
+    repo.create_user(
+        models.User(
+            username="fresh",
+            email="fresh@example.com",
+            password="secret",
+        ),
+    )
+    assert index.might_contain("fresh@example.com") is True
+
+
+@pytest.mark.integration
+def test_create_users(user_repo):
+    rows = [
+        {
+            "id": str(uuid.uuid4()),
+            "username": f"bulk{i}",
+            "email": f"bulk{i}@example.com",
+            "password": "secret",
+        }
+        for i in range(3)
+    ]
+    user_repo.create_users(rows)
+
+    result = user_repo.get_user_by_id(uuid.UUID(rows[0]["id"]))
+    assert result is not None
+    assert result.email == "bulk0@example.com"
+    assert len(user_repo.get_users()) == len(rows)
+
+
+@pytest.mark.integration
+def test_get_users_keyset(user_repo, db_session):
+    users = [
+        models.User(
+            username="paged",
+            email=f"paged{i}@example.com",
+            password="secret",
+        )
+        for i in range(5)
+    ]
+    db_session.add_all(users)
+    db_session.commit()
+
+    first_page = user_repo.get_users(limit=2, username="paged")
+    second_page = user_repo.get_users(
+        limit=2,
+        username="paged",
+        after=first_page[-1].id,
+    )
+    last_page = user_repo.get_users(
+        limit=2,
+        username="paged",
+        after=second_page[-1].id,
+    )
+
+    ids = [user.id for user in first_page + second_page + last_page]
+    assert ids == sorted(user.id for user in users)
+
+
+@pytest.mark.integration
+def test_count_users(user_repo, db_session):
+    for i in range(3):
+        db_session.add(
+            models.User(
+                username="count" if i else "solo",
+                email=f"count{i}@example.com",
+                password="x",
+            ),
+        )
+    db_session.commit()
+
+    assert user_repo.count_users(username="count") == (2, True)
+    assert user_repo.count_users(email="COUNT0@example.com") == (
+        1,
+        True,
+    )
+    total, _ = user_repo.count_users()
+    assert total >= 0
+
+
+@pytest.mark.integration
+def test_search_users(user_repo, db_session):
+    for username, email in [
+        ("ann", "Ann@example.com"),
+        ("anna", "anna@example.com"),
+        ("an%", "percent@example.com"),
+        ("bob", "bob@example.com"),
+    ]:
+        db_session.add(
+            models.User(username=username, email=email, password="x"),
+        )
+    db_session.commit()
+
+    page_1 = user_repo.search_users("username", "an", limit=2)
+    page_2 = user_repo.search_users(
+        "username",
+        "an",
+        limit=2,
+        after=(page_1[-1].search_key, page_1[-1].id),
+    )
+
+    assert [user.username for user in page_1 + page_2] == [
+        "an%",
+        "ann",
+        "anna",
+    ]
+    assert [
+        user.username
+        for user in user_repo.search_users("username", "an%")
+    ] == ["an%"]
+    assert [
+        user.email for user in user_repo.search_users("email", "ANN@")
+    ] == ["Ann@example.com"]
+
+
+@pytest.mark.integration
+def test_get_users_email_filter_ignores_case(user_repo, db_session):
+    db_session.add(
+        models.User(
+            username="case", email="Case@Example.com", password="x"
+        ),
+    )
+    db_session.commit()
+
+    result = user_repo.get_users(email="case@example.COM")
+    assert [user.username for user in result] == ["case"]
+
+
+@pytest.mark.integration
+def test_get_users_by_ids(user_repo, db_session):
+    users = [
+        models.User(
+            username=f"batch{i}",
+            email=f"batch{i}@example.com",
+            password="secret",
+        )
+        for i in range(3)
+    ]
+    db_session.add_all(users)
+    db_session.commit()
+
+    result = user_repo.get_users_by_ids(
+        [uuid.UUID(users[0].id), uuid.UUID(users[2].id), uuid.uuid4()],
+    )
+
+    assert {row.email for row in result} == {
+        "batch0@example.com",
+        "batch2@example.com",
+    }
+    assert user_repo.get_users_by_ids([]) == []
+
+
+@pytest.mark.integration
+def test_update_password_keeps_version(user_repo, db_session):
+    user = models.User(
+        username="rehash",
+        email="rehash@example.com",
+        password="old-hash",
+    )
+    db_session.add(user)
+    db_session.commit()
+
+    user_repo.update_password(user.id, "new-hash")
+
+    credentials = user_repo.get_credentials("ReHash@example.com")
+    assert credentials.id == user.id
+    assert credentials.password == "new-hash"
+    assert user_repo.get_user_version(user.id) == user.version
+    assert user_repo.get_credentials("missing@example.com") is None
@@ -1,8 +1,24 @@
+import csv
+import io
+import json
+import time
+import uuid
+
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, delete
 from sqlalchemy.orm import Session
 
-from app import main, models
+from app import (
+    config,
+    db,
+    dependencies,
+    exceptions,
+    main,
+    models,
+    schema,
+)
+from app.routing import COOKIE_NAME
 from app.schemas.user import UserCreate
 
 
@@ -20,6 +36,31 @@ def client():
         _clear_database(engine=db_engine)
 
 
+@pytest.fixture
+def async_client(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(config.settings, "db_async", True)
+    if config.settings.db_type == "sqlite":
+        monkeypatch.setattr(
+            config.settings,
+            "db_async_driver",
+            "sqlite+aiosqlite",
+        )
+    monkeypatch.setitem(
+        main.app.dependency_overrides,
+        dependencies.get_user_service,
+        dependencies.get_async_user_service,
+    )
+
+    with TestClient(main.app) as client:
+        yield client
+    engine = create_engine(db.database_url(config.settings.db_type))
+    with Session(engine) as session:
+        for table in reversed(models.Base.metadata.sorted_tables):
+            session.execute(table.delete())
+        session.commit()
+    engine.dispose()
+
+
 @pytest.mark.integration
 def test_create_user(
     client: TestClient,
@@ -53,6 +94,22 @@ def test_create_user_incomplete(
     assert response.status_code == 422
 
 
+@pytest.mark.integration
+def test_create_user_email_is_case_insensitive(
+    client: TestClient,
+    user_create: UserCreate,
+):
+    client.post("/users/", json=user_create.model_dump())
+    response = client.post(
+        "/users/",
+        json=user_create.model_dump()
+        | {"email": user_create.email.upper()},
+    )
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Email already registered"
+
+
 @pytest.mark.integration
 def test_create_user_invalid(
     client: TestClient,
@@ -155,3 +212,529 @@ def test_read_users(
     assert inserted_data_2["id"] == str(retrieved_user_2["id"])
     assert "password" not in retrieved_user_2
     assert retrieved_user_2["full_name"] is None
+
+
+@pytest.mark.integration
+def test_create_users_bulk(
+    client: TestClient,
+    user_create: UserCreate,
+):
+    client.post("/users/", json=user_create.model_dump())
+
+    response = client.post(
+        "/users/bulk",
+        json=[
+            {
+                "username": "bulkuser",
+                "email": "bulk@example.com",
+                "password": "secret",
+            },
+            user_create.model_dump(),
+            {
+                "username": "bulkuser",
+                "email": "bulk@example.com",
+                "password": "secret",
+            },
+            {"username": "nopassword", "email": "nopass@example.com"},
+        ],
+    )
+    data = response.json()
+
+    assert response.status_code == 200
+    assert [item["status"] for item in data] == [
+        "created",
+        "duplicate",
+        "duplicate",
+        "invalid",
+    ]
+    assert data[0]["user"]["email"] == "bulk@example.com"
+    assert "password" not in data[0]["user"]
+
+    response = client.get(f"/users/{data[0]['user']['id']}")
+    assert response.status_code == 200
+
+
+@pytest.mark.integration
+def test_read_users_with_cursor(client: TestClient):
+    for i in range(3):
+        client.post(
+            "/users/",
+            json={
+                "username": f"cursor{i}",
+                "email": f"cursor{i}@example.com",
+                "password": "secret",
+            },
+        )
+
+    response_1 = client.get("/users/", params={"limit": 2})
+    cursor = response_1.headers["X-Next-Cursor"]
+    response_2 = client.get(
+        "/users/",
+        params={"limit": 2, "cursor": cursor},
+    )
+
+    assert len(response_1.json()) == 2
+    assert len(response_2.json()) == 1
+    assert "X-Next-Cursor" not in response_2.headers
+    page_ids = {item["id"] for item in response_1.json()}
+    assert response_2.json()[0]["id"] not in page_ids
+
+
+@pytest.mark.integration
+def test_read_users_include_total(client: TestClient):
+    for i in range(3):
+        client.post(
+            "/users/",
+            json={
+                "username": "counted" if i else "other",
+                "email": f"counted{i}@example.com",
+                "password": "secret",
+            },
+        )
+
+    filtered = client.get(
+        "/users/",
+        params={
+            "username": "counted",
+            "limit": 1,
+            "include_total": True,
+        },
+    )
+    unfiltered = client.get("/users/", params={"include_total": True})
+    default = client.get("/users/")
+
+    assert filtered.headers["X-Total-Count"] == "2"
+    assert "X-Total-Count-Approximate" not in filtered.headers
+    assert int(unfiltered.headers["X-Total-Count"]) >= 0
+    assert "X-Total-Count" not in default.headers
+
+
+@pytest.mark.integration
+def test_read_users_with_invalid_cursor(client: TestClient):
+    response = client.get("/users/", params={"cursor": "garbage"})
+    assert response.status_code == 400
+
+
+@pytest.mark.integration
+def test_search_users_by_prefix(client: TestClient):
+    for name in ["alice", "alina", "bob"]:
+        client.post(
+            "/users/",
+            json={
+                "username": name,
+                "email": f"{name.upper()}@example.com",
+                "password": "secret",
+            },
+        )
+
+    response_1 = client.get(
+        "/users/search",
+        params={"q": "al", "limit": 1},
+    )
+    response_2 = client.get(
+        "/users/search",
+        params={
+            "q": "al",
+            "limit": 1,
+            "cursor": response_1.headers["X-Next-Cursor"],
+        },
+    )
+    by_email = client.get(
+        "/users/search",
+        params={"q": "Bob@", "field": "email"},
+    )
+
+    assert [user["username"] for user in response_1.json()] == ["alice"]
+    assert [user["username"] for user in response_2.json()] == ["alina"]
+    assert [user["username"] for user in by_email.json()] == ["bob"]
+    assert "search_key" not in by_email.json()[0]
+
+
+@pytest.mark.integration
+def test_search_users_validates_input(client: TestClient):
+    assert (
+        client.get("/users/search", params={"q": ""}).status_code == 422
+    )
+    response = client.get(
+        "/users/search",
+        params={"q": "a", "cursor": "garbage"},
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.integration
+def test_read_user_conditional(
+    client: TestClient,
+    user_create: UserCreate,
+):
+    user_id = client.post(
+        "/users/",
+        json=user_create.model_dump(),
+    ).json()["id"]
+
+    response_1 = client.get(f"/users/{user_id}")
+    etag = response_1.headers["ETag"]
+    response_2 = client.get(
+        f"/users/{user_id}",
+        headers={"If-None-Match": etag},
+    )
+    response_3 = client.get(
+        f"/users/{user_id}",
+        headers={"If-None-Match": '"stale"'},
+    )
+
+    assert response_2.status_code == 304
+    assert response_2.content == b""
+    assert response_2.headers["ETag"] == etag
+    assert response_3.status_code == 200
+    assert response_3.json() == response_1.json()
+
+
+@pytest.mark.integration
+def test_read_users_conditional(
+    client: TestClient,
+    user_create: UserCreate,
+):
+    client.post("/users/", json=user_create.model_dump())
+    etag = client.get("/users/").headers["ETag"]
+
+    unchanged = client.get("/users/", headers={"If-None-Match": etag})
+    client.post(
+        "/users/",
+        json={
+            "username": "another",
+            "email": "another@example.com",
+            "password": "secret",
+        },
+    )
+    changed = client.get("/users/", headers={"If-None-Match": etag})
+
+    assert unchanged.status_code == 304
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+@pytest.mark.integration
+def test_read_user_is_cached(
+    client: TestClient,
+    user_create: UserCreate,
+):
+    created = client.post(
+        "/users/",
+        json=user_create.model_dump(),
+    ).json()
+
+    client.get(f"/users/{created['id']}")
+    client.get(f"/users/{created['id']}")
+    stats = client.get("/stats/cache").json()
+
+    assert stats["enabled"] is True
+    assert stats["hits"] >= 1
+    assert stats["size"] >= 1
+
+
+@pytest.mark.integration
+def test_read_pool_stats(client: TestClient):
+    client.get("/users/")
+    stats = client.get("/stats/pool").json()
+
+    assert list(stats) == ["primary"]
+    assert stats["primary"]["checked_out"] == 0
+    assert stats["primary"]["checkouts"] >= 1
+
+
+@pytest.mark.integration
+def test_read_singleflight_stats(client: TestClient):
+    before = client.get("/stats/singleflight").json()
+    client.get("/users/")
+    after = client.get("/stats/singleflight").json()
+
+    assert after["enabled"] is True
+    assert after["calls"] == before["calls"] + 1
+
+
+@pytest.mark.integration
+def test_read_metrics(client: TestClient):
+    client.get("/users/")
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert 'route="/users/"' in response.text
+    assert 'db_pool_checked_out{engine="primary"}' in response.text
+    assert "password_hash_rejected_total" in response.text
+    assert "singleflight_deduplicated_total" in response.text
+    assert 'password_hash_cost{scheme="bcrypt"}' in response.text
+
+
+@pytest.mark.integration
+def test_read_password_hashing_stats(client: TestClient):
+    stats = client.get("/stats/password-hashing").json()
+
+    assert stats["scheme"] == "bcrypt"
+    assert stats["rounds"] == config.settings.password_hash_rounds
+    assert stats["calibrated"] is False
+
+
+@pytest.mark.integration
+def test_shutdown_stops_password_calibration(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(config.settings, "password_hash_rounds", None)
+    monkeypatch.setattr(config.settings, "password_hash_budget_ms", 1e6)
+
+    with TestClient(main.app) as client:
+        pass
+
+    assert client.app.state.password_calibration is None  # type: ignore
+
+
+@pytest.mark.integration
+def test_export_users(
+    client: TestClient,
+    user_create: UserCreate,
+):
+    client.post("/users/", json=user_create.model_dump())
+    client.post(
+        "/users/",
+        json={
+            "username": "exported",
+            "email": "exported@example.com",
+            "password": "secret",
+        },
+    )
+
+    response = client.get("/users/export")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert {row["username"] for row in rows} == {
+        user_create.username,
+        "exported",
+    }
+    assert all("password" not in row for row in rows)
+
+    response = client.get(
+        "/users/export",
+        params={"format": "csv", "username": "exported"},
+    )
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+
+    assert response.headers["content-type"].startswith("text/csv")
+    assert len(rows) == 1
+    assert rows[0]["email"] == "exported@example.com"
+
+
+@pytest.mark.integration
+def test_import_users(
+    client: TestClient,
+    user_create: UserCreate,
+):
+    client.post("/users/", json=user_create.model_dump())
+    ndjson = "\n".join(
+        [
+            json.dumps(user_create.model_dump()),
+            json.dumps(
+                {
+                    "username": "imported",
+                    "email": "imported@example.com",
+                    "password": "secret",
+                },
+            ),
+            "",
+            "not json",
+        ],
+    )
+
+    response = client.post(
+        "/users/import",
+        files={"file": ("users.ndjson", ndjson)},
+        params={"chunk_size": 1},
+    )
+    data = response.json()
+
+    assert response.status_code == 200
+    assert data["inserted"] == 1
+    assert data["duplicates"] == 1
+    assert data["invalid"] == 1
+    assert [(e["row"], e["status"]) for e in data["errors"]] == [
+        (1, "duplicate"),
+        (4, "invalid"),
+    ]
+
+    csv_file = (
+        "username,email,password,full_name\n"
+        "csvuser,csv@example.com,secret,\n"
+        "csvuser2,csv@example.com,secret,Csv User\n"
+    )
+    response = client.post(
+        "/users/import",
+        files={"file": ("users.csv", csv_file)},
+    )
+    data = response.json()
+
+    assert data["inserted"] == 1
+    assert data["errors"] == [
+        {
+            "row": 3,
+            "status": "duplicate",
+            "detail": "Email repeated in request",
+        },
+    ]
+
+
+@pytest.mark.integration
+def test_fast_json_matches_default_responses(
+    client: TestClient,
+    user_create: UserCreate,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    created = client.post(
+        "/users/",
+        json=user_create.model_dump(),
+    ).json()
+    default_list = client.get("/users/", params={"limit": 1})
+    default_user = client.get(f"/users/{created['id']}").json()
+
+    monkeypatch.setattr(config.settings, "fast_json", True)
+    fast_list = client.get("/users/", params={"limit": 1})
+
+    assert fast_list.json() == default_list.json()
+    assert (
+        fast_list.headers["x-next-cursor"]
+        == (default_list.headers["x-next-cursor"])
+    )
+    assert client.get(f"/users/{created['id']}").json() == default_user
+
+
+@pytest.mark.integration
+def test_read_users_batch(
+    client: TestClient,
+    user_create: UserCreate,
+):
+    created = client.post(
+        "/users/",
+        json=user_create.model_dump(),
+    ).json()
+    other = client.post(
+        "/users/",
+        json={
+            "username": "other",
+            "email": "other@example.com",
+            "password": "secret",
+        },
+    ).json()
+    unknown = "00000000-0000-0000-0000-000000000000"
+
+    response = client.post(
+        "/users/batch-get",
+        json={"ids": [other["id"], unknown, created["id"]]},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "users": [other, created],
+        "missing": [unknown],
+    }
+
+
+@pytest.mark.integration
+def test_startup_checks_schema_version(monkeypatch: pytest.MonkeyPatch):
+    engine = create_engine(db.database_url(config.settings.db_type))
+    models.Base.metadata.create_all(engine)
+    with engine.connect() as connection:
+        connection.execute(delete(models.SchemaVersion))
+        connection.commit()
+    monkeypatch.setattr(config.settings, "db_create_schema", False)
+
+    with pytest.raises(exceptions.SchemaVersionError):
+        with TestClient(main.app):
+            pass
+
+    with engine.connect() as connection:
+        schema.stamp(connection)
+    with TestClient(main.app) as client:
+        assert client.get("/users/").status_code == 200
+
+    with engine.connect() as connection:
+        connection.execute(delete(models.SchemaVersion))
+        connection.commit()
+    engine.dispose()
+
+
+@pytest.mark.integration
+def test_read_only_request_leaves_connection_writable(
+    monkeypatch: pytest.MonkeyPatch,
+    user_create: UserCreate,
+):
+    if config.settings.db_type != "mysql":
+        pytest.skip("transaction characteristics are MySQL specific")
+    monkeypatch.setattr(config.settings, "db_pool_size", 1)
+    monkeypatch.setattr(config.settings, "db_max_overflow", 0)
+
+    with TestClient(main.app) as client:
+        engine = client.app.state.db_engine  # type: ignore
+        assert client.get("/users/").status_code == 200
+
+        with Session(engine) as session:
+            session.add(
+                models.User(
+                    username=user_create.username,
+                    email=user_create.email,
+                    password="hash",
+                ),
+            )
+            session.commit()
+            session.execute(delete(models.User))
+            session.commit()
+        assert engine.pool.checkedout() == 0
+
+
+@pytest.mark.integration
+def test_read_your_writes_window_bypasses_user_cache(
+    client: TestClient,
+):
+    user_id = str(uuid.uuid4())
+    assert client.get(f"/users/{user_id}").status_code == 404
+    with Session(client.app.state.db_engine) as session:  # type: ignore
+        session.add(
+            models.User(
+                id=user_id,
+                username="pinned",
+                email="pinned@example.com",
+                password="hash",
+            ),
+        )
+        session.commit()
+
+    cached = client.get(f"/users/{user_id}")
+    client.cookies.set(COOKIE_NAME, str(time.time() + 60))
+    pinned = client.get(f"/users/{user_id}")
+
+    assert cached.status_code == 404
+    assert pinned.status_code == 200
+
+
+@pytest.mark.integration
+def test_async_mode_commits_and_closes_sessions(
+    async_client: TestClient,
+    user_create: UserCreate,
+):
+    created = async_client.post(
+        "/users/",
+        json=user_create.model_dump(),
+    )
+    duplicate = async_client.post(
+        "/users/",
+        json=user_create.model_dump(),
+    )
+    read = async_client.get(f"/users/{created.json()['id']}")
+    exported = async_client.get("/users/export")
+    engine = async_client.app.state.db_engine  # type: ignore
+    rows = [json.loads(line) for line in exported.text.splitlines()]
+
+    assert created.status_code == 200
+    assert duplicate.status_code == 400
+    assert read.json()["email"] == user_create.email
+    assert [row["email"] for row in rows] == [user_create.email]
+    assert engine.pool.checkedout() == 0
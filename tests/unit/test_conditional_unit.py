@@ -0,0 +1,50 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app import conditional
+
+
+@pytest.mark.unit
+def test_user_etag_changes_with_version():
+    assert conditional.user_etag(1) != conditional.user_etag(2)
+
+
+@pytest.mark.unit
+def test_users_etag_tracks_ids_order_and_versions():
+    first = SimpleNamespace(id="a", version=1)
+    second = SimpleNamespace(id="b", version=1)
+    updated = SimpleNamespace(id="b", version=2)
+
+    etag = conditional.users_etag([first, second])
+
+    assert etag == conditional.users_etag([first, second])
+    assert etag != conditional.users_etag([second, first])
+    assert etag != conditional.users_etag([first, updated])
+    assert etag != conditional.users_etag([first])
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        (None, False),
+        ('"v1"', True),
+        ('W/"v1"', True),
+        ('"v0", "v1"', True),
+        ('"v2"', False),
+        ("*", True),
+    ],
+)
+def test_matches(header, expected):
+    assert conditional.matches(header, '"v1"') is expected
+
+
+@pytest.mark.unit
+def test_not_modified_keeps_headers():
+    response = conditional.not_modified('"v1"', {"X-Next-Cursor": "c"})
+
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["ETag"] == '"v1"'
+    assert response.headers["X-Next-Cursor"] == "c"
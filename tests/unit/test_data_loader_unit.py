@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+
+from app.loaders import DataLoader
+
+
+class _BatchLoad:
+    def __init__(self, values):
+        self.values = values
+        self.calls = []
+
+    async def __call__(self, keys):
+        self.calls.append(keys)
+        return {
+            key: self.values[key] for key in keys if key in self.values
+        }
+
+
+@pytest.mark.unit
+def test_data_loader_coalesces_concurrent_loads():
+    batch_load = _BatchLoad({"a": 1, "b": 2})
+
+    async def scenario():
+        loader = DataLoader(batch_load)
+        first = await asyncio.gather(
+            loader.load("a"),
+            loader.load("b"),
+            loader.load("a"),
+            loader.load("missing"),
+        )
+        second = await loader.load_many(["b", "a"])
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert first == [1, 2, 1, None]
+    assert second == [2, 1]
+    assert batch_load.calls == [["a", "b", "missing"]]
+
+
+@pytest.mark.unit
+def test_data_loader_propagates_errors():
+    async def failing(keys):
+        raise RuntimeError("boom")
+
+    async def scenario():
+        loader = DataLoader(failing)
+        await loader.load_many(["a", "b"])
+
+    with pytest.raises(RuntimeError, match="boom"):
+        asyncio.run(scenario())
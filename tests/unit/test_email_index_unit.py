@@ -0,0 +1,157 @@
+import asyncio
+
+import pytest
+
+from app.email_index import BloomFilter, EmailIndex
+
+
+@pytest.mark.unit
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    items = [f"user{i}@example.com" for i in range(1000)]
+    for item in items:
+        bloom.add(item)
+
+    assert all(item in bloom for item in items)
+    assert bloom.count == 1000
+
+
+@pytest.mark.unit
+def test_bloom_filter_false_positive_rate_near_target():
+    bloom = BloomFilter(capacity=5000, error_rate=0.01)
+    for i in range(5000):
+        bloom.add(f"user{i}@example.com")
+
+    false_positives = sum(
+        f"other{i}@example.com" in bloom for i in range(10000)
+    )
+
+    assert false_positives / 10000 < 0.02
+    assert bloom.estimated_false_positive_rate == pytest.approx(
+        0.01,
+        rel=0.2,
+    )
+
+
+@pytest.mark.unit
+def test_bloom_filter_memory_shrinks_with_error_rate():
+    loose = BloomFilter(capacity=10000, error_rate=0.1)
+    tight = BloomFilter(capacity=10000, error_rate=0.001)
+
+    assert loose.memory_bytes < tight.memory_bytes
+    assert loose.hash_count < tight.hash_count
+
+
+@pytest.mark.unit
+def test_email_index_answers_nothing_until_built():
+    index = EmailIndex(capacity=100, error_rate=0.01)
+
+    assert index.ready is False
+    assert index.might_contain("new@example.com") is True
+    assert index.stats.lookups == 0
+
+
+@pytest.mark.unit
+def test_email_index_skips_unknown_emails():
+    index = EmailIndex(capacity=100, error_rate=0.01)
+    index.rebuild(["Taken@example.com"])
+
+    assert index.might_contain("taken@EXAMPLE.com") is True
+    assert index.might_contain("free@example.com") is False
+    assert index.stats.lookups == 2
+    assert index.stats.skipped_queries == 1
+    assert index.stats.rebuilds == 1
+
+
+@pytest.mark.unit
+def test_email_index_add_updates_filter():
+    index = EmailIndex(capacity=100, error_rate=0.01)
+    index.rebuild([])
+
+    index.add("new@example.com")
+
+    assert index.might_contain("new@example.com") is True
+
+
+@pytest.mark.unit
+def test_email_index_keeps_emails_added_during_rebuild():
+    index = EmailIndex(capacity=100, error_rate=0.01)
+
+    def emails():
+        yield "old@example.com"
+        index.add("concurrent@example.com")
+
+    index.rebuild(emails())
+
+    assert index.might_contain("old@example.com") is True
+    assert index.might_contain("concurrent@example.com") is True
+
+
+@pytest.mark.unit
+def test_email_index_failed_rebuild_keeps_previous_filter():
+    index = EmailIndex(capacity=100, error_rate=0.01)
+    index.rebuild(["old@example.com"])
+
+    def emails():
+        yield "new@example.com"
+        raise RuntimeError
+
+    with pytest.raises(RuntimeError):
+        index.rebuild(emails())
+
+    assert index.might_contain("old@example.com") is True
+    assert index.might_contain("new@example.com") is False
+    assert index.stats.rebuilds == 1
+
+
+@pytest.mark.unit
+def test_email_index_mark_stale_disables_negatives():
+    index = EmailIndex(capacity=100, error_rate=0.01)
+    index.rebuild([])
+
+    index.mark_stale()
+
+    assert index.ready is False
+    assert index.might_contain("free@example.com") is True
+
+
+@pytest.mark.unit
+def test_email_index_grows_capacity_when_overfull():
+    index = EmailIndex(capacity=10, error_rate=0.01)
+
+    index.rebuild(f"user{i}@example.com" for i in range(50))
+
+    assert index.capacity == 100
+    assert index.report()["emails"] == 50
+
+
+@pytest.mark.unit
+def test_email_index_rebuild_async():
+    index = EmailIndex(capacity=100, error_rate=0.01)
+
+    async def batches():
+        yield ["a@example.com", "b@example.com"]
+        yield ["c@example.com"]
+
+    asyncio.run(index.rebuild_async(batches()))
+
+    assert index.might_contain("c@example.com") is True
+    assert index.might_contain("d@example.com") is False
+
+
+@pytest.mark.unit
+def test_email_index_report():
+    index = EmailIndex(capacity=100, error_rate=0.01)
+    assert index.report()["ready"] is False
+    assert "memory_bytes" not in index.report()
+
+    index.rebuild(["a@example.com"])
+    index.might_contain("b@example.com")
+    index.record_false_positive()
+    report = index.report()
+
+    assert report["ready"] is True
+    assert report["emails"] == 1
+    assert report["memory_bytes"] > 0
+    assert report["skipped_queries"] == 1
+    assert report["false_positives"] == 1
@@ -0,0 +1,85 @@
+import time
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from app import ids, models
+
+
+@pytest.fixture
+def binary_ids():
+    ids.configure(binary=True)
+    yield
+    ids.configure()
+
+
+@pytest.mark.unit
+def test_uuid7_layout():
+    before_ms = time.time_ns() // 1_000_000
+    value = ids.uuid7()
+
+    assert value.version == 7
+    assert value.variant == uuid.RFC_4122
+    assert value.int >> 80 >= before_ms
+
+
+@pytest.mark.unit
+def test_uuid7_is_monotonic():
+    values = [ids.uuid7() for _ in range(10000)]
+
+    assert values == sorted(values)
+    assert [str(value) for value in values] == sorted(
+        str(value) for value in values
+    )
+    assert len(set(values)) == len(values)
+
+
+@pytest.mark.unit
+def test_configure_selects_generator():
+    ids.configure(time_ordered=False)
+    try:
+        assert uuid.UUID(ids.new_id()).version == 4
+    finally:
+        ids.configure()
+    assert uuid.UUID(ids.new_id()).version == 7
+
+
+@pytest.mark.unit
+def test_binary_ids_round_trip_as_strings(binary_ids):
+    engine = create_engine("sqlite://")
+    models.Base.metadata.create_all(engine)
+    user_ids = [ids.new_id() for _ in range(3)]
+    with Session(engine) as session:
+        session.execute(
+            insert(models.User),
+            [
+                {
+                    "id": user_id,
+                    "username": f"user{i}",
+                    "email": f"user{i}@example.com",
+                    "password": "hash",
+                }
+                for i, user_id in enumerate(user_ids)
+            ],
+        )
+        session.commit()
+
+        stored = session.scalars(
+            select(models.User.id).order_by(models.User.id),
+        ).all()
+        after = session.scalars(
+            select(models.User.id).where(models.User.id > user_ids[0]),
+        ).all()
+        raw = (
+            session.connection()
+            .exec_driver_sql(
+                'SELECT id FROM "user" ORDER BY id',
+            )
+            .scalar()
+        )
+
+    assert stored == user_ids
+    assert after == user_ids[1:]
+    assert raw == uuid.UUID(user_ids[0]).bytes
@@ -0,0 +1,63 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, exc, text
+
+from app import instrumentation
+
+
+@pytest.mark.unit
+def test_normalize_sql_collapses_placeholder_lists():
+    statement = """SELECT user.email
+    FROM user WHERE user.email IN (%s, %s, %s)"""
+
+    assert instrumentation.normalize_sql(statement) == (
+        "SELECT user.email FROM user WHERE user.email IN (...)"
+    )
+    assert (
+        instrumentation.normalize_sql(
+            "INSERT INTO user (id, email) VALUES (?, ?), (?, ?), (?, ?)",
+        )
+        == "INSERT INTO user (id, email) VALUES (...)"
+    )
+
+
+@pytest.mark.unit
+def test_middleware_reports_queries_per_request(caplog):
+    engine = create_engine("sqlite://")
+    instrumentation.instrument_engine(engine, slow_query_ms=0)
+    app = FastAPI()
+    app.add_middleware(instrumentation.QueryStatsMiddleware)
+
+    @app.get("/")
+    def _run_queries():
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT 2"))
+
+    with caplog.at_level("WARNING"):
+        response = TestClient(app).get("/")
+
+    assert 'desc="2 queries"' in response.headers["server-timing"]
+    assert "Slow query" in caplog.text
+
+
+@pytest.mark.unit
+def test_failed_statement_leaves_no_timing_on_connection():
+    engine = create_engine("sqlite://")
+    instrumentation.instrument_engine(engine, slow_query_ms=1000)
+    app = FastAPI()
+    app.add_middleware(instrumentation.QueryStatsMiddleware)
+
+    @app.get("/")
+    def _run_queries():
+        with engine.connect() as connection:
+            with pytest.raises(exc.OperationalError):
+                connection.execute(text("SELECT * FROM missing"))
+            connection.execute(text("SELECT 1"))
+            return {"info": sorted(connection.info)}
+
+    response = TestClient(app).get("/")
+
+    assert response.json() == {"info": []}
+    assert 'desc="1 queries"' in response.headers["server-timing"]
@@ -0,0 +1,82 @@
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import metrics
+from app.pool import InstrumentedQueuePool
+
+
+@pytest.fixture
+def request_metrics():
+    return metrics.RequestMetrics(buckets=(0.1, 1.0))
+
+
+@pytest.mark.unit
+def test_middleware_labels_requests_by_route_template(request_metrics):
+    app = FastAPI()
+    app.add_middleware(
+        metrics.MetricsMiddleware,
+        metrics=request_metrics,
+    )
+
+    @app.get("/items/{item_id}")
+    def _read_item(item_id: int):
+        return {"id": item_id}
+
+    client = TestClient(app)
+    client.get("/items/1")
+    client.get("/items/2")
+    client.get("/missing")
+
+    assert request_metrics.requests == {
+        ("GET", "/items/{item_id}", "200"): 2,
+        ("GET", "unmatched", "404"): 1,
+    }
+    assert request_metrics.in_flight == 0
+
+
+@pytest.mark.unit
+def test_render_metrics_histogram_is_cumulative(request_metrics):
+    request_metrics.observe("GET", "/users/", 200, 0.05)
+    request_metrics.observe("GET", "/users/", 200, 0.5)
+    request_metrics.observe("GET", "/users/", 200, 5.0)
+
+    text = metrics.render_metrics(request_metrics)
+
+    labels = 'method="GET",route="/users/"'
+    assert (
+        f'http_request_duration_seconds_bucket{{{labels},le="0.1"}} 1'
+        in text
+    )
+    assert (
+        f'http_request_duration_seconds_bucket{{{labels},le="1.0"}} 2'
+        in text
+    )
+    assert (
+        f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 3'
+        in text
+    )
+    assert f"http_request_duration_seconds_count{{{labels}}} 3" in text
+    assert (
+        'http_requests_total{method="GET",route="/users/",status="200"} 3'
+        in text
+    )
+
+
+@pytest.mark.unit
+def test_render_metrics_labels_pools_by_engine(request_metrics):
+    pools = {
+        "primary": InstrumentedQueuePool(MagicMock, pool_size=2),
+        "replica:3306": InstrumentedQueuePool(MagicMock, pool_size=1),
+    }
+    connection = pools["replica:3306"].connect()
+
+    text = metrics.render_metrics(request_metrics, pools=pools)
+
+    assert text.count("# TYPE db_pool_checked_out gauge") == 1
+    assert 'db_pool_checked_out{engine="primary"} 0' in text
+    assert 'db_pool_checked_out{engine="replica:3306"} 1' in text
+    assert 'db_pool_checkouts_total{engine="replica:3306"} 1' in text
+    connection.close()
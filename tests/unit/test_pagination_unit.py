@@ -0,0 +1,28 @@
+import pytest
+
+from app import exceptions, pagination
+
+
+@pytest.mark.unit
+def test_cursor_round_trip():
+    cursor = pagination.encode_cursor("johndoe", "some-id")
+
+    assert pagination.decode_cursor(cursor, size=2) == [
+        "johndoe",
+        "some-id",
+    ]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("cursor", ["not a cursor", "bnVsbA", "WzFd"])
+def test_decode_invalid_cursor_raises(cursor):
+    with pytest.raises(exceptions.InvalidCursorError):
+        pagination.decode_cursor(cursor)
+
+
+@pytest.mark.unit
+def test_decode_cursor_with_wrong_size_raises():
+    cursor = pagination.encode_cursor("a", "b")
+
+    with pytest.raises(exceptions.InvalidCursorError):
+        pagination.decode_cursor(cursor)
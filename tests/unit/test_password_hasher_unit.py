@@ -0,0 +1,114 @@
+import threading
+import time
+
+import pytest
+
+from app import exceptions
+from app.hashing import PasswordHasher
+
+
+@pytest.fixture
+def hasher():
+    hasher = PasswordHasher(lambda password: f"hashed:{password}")
+    yield hasher
+    hasher.shutdown()
+
+
+@pytest.mark.unit
+def test_hash_runs_on_pool_and_records_stats(hasher):
+    result = hasher.hash("secret")
+
+    assert result == "hashed:secret"
+    assert hasher.stats.hashed == 1
+    assert hasher.stats.rejected == 0
+    assert hasher.stats.hash_seconds >= 0
+
+
+@pytest.mark.unit
+def test_submit_rejects_when_queue_is_full():
+    release = threading.Event()
+
+    def _slow_hash(password):
+        release.wait()
+        return password
+
+    hasher = PasswordHasher(_slow_hash, max_workers=1, max_pending=1)
+    futures = [hasher.submit("a"), hasher.submit("b")]
+
+    with pytest.raises(exceptions.HashingQueueFullError):
+        hasher.submit("c")
+
+    release.set()
+    assert [future.result() for future in futures] == ["a", "b"]
+    assert hasher.stats.rejected == 1
+    hasher.submit("d").result()
+    hasher.shutdown()
+
+
+@pytest.mark.unit
+def test_verify_runs_on_pool_and_records_stats():
+    hasher = PasswordHasher(
+        lambda password: password,
+        verify_func=lambda password, hashed: (password == hashed, None),
+    )
+
+    assert hasher.verify("secret", "secret") == (True, None)
+    assert hasher.verify("wrong", "secret") == (False, None)
+    assert hasher.stats.hashed == 2
+    hasher.shutdown()
+
+
+@pytest.mark.unit
+def test_hash_many_leaves_slots_and_a_worker_to_submit():
+    started = threading.Event()
+    release = threading.Event()
+
+    def _hash(password):
+        if password.startswith("batch"):
+            started.set()
+            release.wait()
+        return f"hashed:{password}"
+
+    hasher = PasswordHasher(
+        _hash,
+        max_workers=2,
+        max_pending=0,
+        max_batch=1,
+    )
+    batch = threading.Thread(
+        target=hasher.hash_many,
+        args=([f"batch{i}" for i in range(4)],),
+    )
+    batch.start()
+    started.wait()
+
+    assert hasher.submit("single").result(timeout=5) == "hashed:single"
+    assert hasher.stats.rejected == 0
+
+    release.set()
+    batch.join()
+    hasher.shutdown()
+
+
+@pytest.mark.unit
+def test_hash_many_runs_on_every_worker_by_default():
+    lock = threading.Lock()
+    running = []
+    peak = []
+
+    def _hash(password):
+        with lock:
+            running.append(password)
+            peak.append(len(running))
+        time.sleep(0.05)
+        with lock:
+            running.remove(password)
+        return f"hashed:{password}"
+
+    hasher = PasswordHasher(_hash, max_workers=4)
+
+    hashed = hasher.hash_many([f"user{i}" for i in range(8)])
+
+    assert hashed == [f"hashed:user{i}" for i in range(8)]
+    assert max(peak) == 4
+    hasher.shutdown()
@@ -0,0 +1,123 @@
+import threading
+
+import pytest
+
+from app import passwords
+
+
+@pytest.fixture(autouse=True)
+def _reset_policy():
+    yield
+    passwords.configure()
+
+
+@pytest.mark.unit
+def test_configure_sets_cost_of_new_hashes():
+    passwords.configure("bcrypt", rounds=5)
+
+    hashed = passwords.hash_password("secret")
+
+    assert hashed.startswith("$2b$05$")
+    assert passwords.policy() == {"scheme": "bcrypt", "rounds": 5}
+    assert passwords.needs_update(hashed) is False
+
+
+@pytest.mark.unit
+def test_verify_and_update_rehashes_outdated_hashes():
+    passwords.configure("bcrypt", rounds=4)
+    old_hash = passwords.hash_password("secret")
+    passwords.configure("bcrypt", rounds=5)
+
+    assert passwords.needs_update(old_hash) is True
+    assert passwords.verify_and_update("wrong", old_hash) == (
+        False,
+        None,
+    )
+    matches, new_hash = passwords.verify_and_update("secret", old_hash)
+
+    assert matches is True
+    assert new_hash.startswith("$2b$05$")
+    assert passwords.verify_and_update("secret", new_hash) == (
+        True,
+        None,
+    )
+
+
+@pytest.mark.unit
+def test_calibrate_picks_highest_cost_within_budget(monkeypatch):
+    measured = []
+
+    def _measure(scheme, rounds, samples=3, **settings):
+        measured.append(rounds)
+        return 0.01 * 2 ** (rounds - 10)
+
+    monkeypatch.setattr(passwords, "measure", _measure)
+
+    calibration = passwords.calibrate("bcrypt", budget_seconds=0.1)
+
+    assert measured == [12, 13]
+    assert calibration.rounds == 13
+    assert calibration.hash_seconds == pytest.approx(0.08)
+    assert calibration.within_budget is True
+
+
+@pytest.mark.unit
+def test_calibrate_never_goes_below_the_floor(monkeypatch):
+    monkeypatch.setattr(
+        passwords,
+        "measure",
+        lambda scheme, rounds, samples=3, **settings: 0.5,
+    )
+
+    calibration = passwords.calibrate(
+        "bcrypt",
+        budget_seconds=0.1,
+        min_rounds=13,
+    )
+
+    assert calibration.rounds == 13
+    assert calibration.min_rounds == 13
+    assert calibration.within_budget is False
+    assert passwords.calibrate("bcrypt", min_rounds=10).rounds == 12
+
+
+@pytest.mark.unit
+def test_calibrate_stops_measuring_once_asked(monkeypatch):
+    stop = threading.Event()
+    measured = []
+
+    def _measure(scheme, rounds, samples=3, **settings):
+        measured.append(rounds)
+        stop.set()
+        return 0.001
+
+    monkeypatch.setattr(passwords, "measure", _measure)
+
+    calibration = passwords.calibrate(
+        "bcrypt",
+        budget_seconds=1.0,
+        stop=stop,
+    )
+
+    assert measured == [12]
+    assert calibration.rounds == 12
+
+
+@pytest.mark.unit
+def test_configure_defers_building_the_context(monkeypatch):
+    built = []
+    build_context = passwords._build_context
+
+    def _build_context(*args):
+        built.append(args)
+        return build_context(*args)
+
+    monkeypatch.setattr(passwords, "_build_context", _build_context)
+
+    passwords.configure("bcrypt", rounds=5)
+
+    assert passwords.policy() == {"scheme": "bcrypt", "rounds": 5}
+    assert built == []
+    assert passwords.hash_password("secret").startswith("$2b$05$")
+    assert passwords.needs_update(passwords.hash_password("x")) is False
+    assert built == [("bcrypt", 5, None)]
@@ -0,0 +1,55 @@
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import create_engine, exc
+
+from app.pool import InstrumentedQueuePool, engine_pools, pool_status
+
+
+@pytest.fixture
+def pool():
+    return InstrumentedQueuePool(
+        MagicMock,
+        pool_size=1,
+        max_overflow=0,
+        timeout=0.01,
+    )
+
+
+@pytest.mark.unit
+def test_pool_status_reports_usage_and_checkouts(pool):
+    connection = pool.connect()
+    status = pool_status(pool)
+
+    assert status["size"] == 1
+    assert status["checked_out"] == 1
+    assert status["checkouts"] == 1
+    assert status["checkout_wait_seconds"] >= 0
+
+    connection.close()
+    assert pool_status(pool)["checked_in"] == 1
+
+
+@pytest.mark.unit
+def test_pool_counts_checkout_timeouts(pool):
+    connection = pool.connect()
+
+    with pytest.raises(exc.TimeoutError):
+        pool.connect()
+
+    assert pool.stats.timeouts == 1
+    connection.close()
+
+
+@pytest.mark.unit
+def test_engine_pools_labels_replicas_by_host():
+    primary = create_engine("mysql://primary/db", module=MagicMock())
+    replicas = [
+        create_engine("mysql://replica-1:3307/db", module=MagicMock()),
+        create_engine("mysql://replica-2/db", module=MagicMock()),
+    ]
+
+    pools = engine_pools(primary, replicas)
+
+    assert list(pools) == ["primary", "replica-1:3307", "replica-2"]
+    assert pools["replica-1:3307"] is replicas[0].pool
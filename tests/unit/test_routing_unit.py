@@ -0,0 +1,224 @@
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func, select
+
+from app import models
+from app.routing import (
+    COOKIE_NAME,
+    PRIMARY,
+    ReadYourWritesMiddleware,
+    RoutingSession,
+    _set_transaction_characteristics,
+    reads_from_primary,
+)
+
+
+@pytest.fixture
+def engines():
+    primary = create_engine("sqlite://")
+    replica = create_engine("sqlite://")
+    for engine in (primary, replica):
+        models.Base.metadata.create_all(engine)
+    yield primary, replica
+    primary.dispose()
+    replica.dispose()
+
+
+def _count(session, **options):
+    return session.scalar(
+        select(func.count(models.User.id)).execution_options(**options),
+    )
+
+
+def _add_user(session):
+    session.add(
+        models.User(
+            username="johndoe",
+            email="johndoe@example.com",
+            password="hash",
+        ),
+    )
+    session.commit()
+
+
+@pytest.mark.unit
+def test_writes_go_to_primary_and_reads_to_replica(engines):
+    primary, replica = engines
+    session = RoutingSession(primary=primary, replicas=[replica])
+
+    assert session.wrote is False
+    _add_user(session)
+
+    assert session.wrote is True
+    assert _count(session) == 0
+    assert _count(session, **PRIMARY) == 1
+    session.close()
+
+
+@pytest.mark.unit
+def test_use_primary_reads_from_primary(engines):
+    primary, replica = engines
+    _add_user(RoutingSession(primary=primary))
+
+    session = RoutingSession(
+        primary=primary,
+        replicas=[replica],
+        use_primary=True,
+    )
+
+    assert _count(session) == 1
+    assert session.wrote is False
+    session.close()
+
+
+@pytest.mark.unit
+def test_rolled_back_write_is_not_recorded(engines):
+    primary, replica = engines
+    session = RoutingSession(primary=primary, replicas=[replica])
+
+    session.add(
+        models.User(
+            username="johndoe",
+            email="johndoe@example.com",
+            password="hash",
+        ),
+    )
+    session.flush()
+    session.rollback()
+
+    assert session.wrote is False
+    assert _count(session, **PRIMARY) == 0
+    session.close()
+
+
+@pytest.mark.unit
+def test_without_replicas_reads_from_primary(engines):
+    primary, _ = engines
+    session = RoutingSession(primary=primary)
+
+    _add_user(session)
+
+    assert _count(session) == 1
+    session.close()
+
+
+def _client(window_seconds: float) -> TestClient:
+    class _Session:
+        wrote = False
+
+    app = FastAPI()
+    app.add_middleware(
+        ReadYourWritesMiddleware, window_seconds=window_seconds
+    )
+
+    @app.get("/")
+    def read(request: Request):
+        request.state.db_session = _Session()
+        return {"primary": reads_from_primary(request)}
+
+    @app.post("/")
+    def write(request: Request):
+        request.state.db_session = _Session()
+        request.state.db_session.wrote = True
+        return {}
+
+    return TestClient(app)
+
+
+@pytest.mark.unit
+def test_write_pins_following_reads_to_primary():
+    client = _client(window_seconds=5)
+
+    assert client.get("/").json() == {"primary": False}
+    assert COOKIE_NAME not in client.get("/").cookies
+
+    response = client.post("/")
+
+    assert COOKIE_NAME in response.cookies
+    assert "max-age=5" in response.headers["set-cookie"].lower()
+    assert client.get("/").json() == {"primary": True}
+
+
+@pytest.mark.unit
+def test_zero_window_sets_no_cookie():
+    client = _client(window_seconds=0)
+
+    assert COOKIE_NAME not in client.post("/").cookies
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    ("cookie", "expected"),
+    [
+        (str(time.time() + 60), True),
+        (str(time.time() - 60), False),
+        ("invalid", False),
+    ],
+)
+def test_reads_from_primary_checks_expiry(cookie, expected):
+    app = FastAPI()
+
+    @app.get("/")
+    def read(request: Request):
+        return {"primary": reads_from_primary(request)}
+
+    client = TestClient(app, cookies={COOKIE_NAME: cookie})
+
+    assert client.get("/").json() == {"primary": expected}
+
+
+def _mysql_connection(engine):
+    return MagicMock(
+        engine=engine,
+        **{"dialect.name": "mysql"},
+    )
+
+
+@pytest.mark.unit
+def test_read_only_session_sets_characteristics_per_transaction(
+    engines,
+):
+    primary, _ = engines
+    session = RoutingSession(
+        primary=primary,
+        read_only=True,
+        isolation_level="READ COMMITTED",
+    )
+    connection = _mysql_connection(primary)
+
+    _set_transaction_characteristics(session, None, connection)
+
+    connection.exec_driver_sql.assert_called_once_with(
+        "SET TRANSACTION ISOLATION LEVEL READ COMMITTED, READ ONLY",
+    )
+
+
+@pytest.mark.unit
+def test_read_write_session_keeps_default_characteristics(engines):
+    primary, replica = engines
+    session = RoutingSession(primary=primary, replicas=[replica])
+    connection = _mysql_connection(primary)
+
+    _set_transaction_characteristics(session, None, connection)
+
+    connection.exec_driver_sql.assert_not_called()
+
+    replica_connection = _mysql_connection(replica)
+    _set_transaction_characteristics(session, None, replica_connection)
+
+    replica_connection.exec_driver_sql.assert_called_once_with(
+        "SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY",
+    )
+
+
+@pytest.mark.unit
+def test_characteristics_are_only_set_on_mysql(engines):
+    primary, _ = engines
+    session = RoutingSession(primary=primary, read_only=True)
+
+    assert session.scalar(select(func.count(models.User.id))) == 0
+    session.close()
@@ -0,0 +1,50 @@
+import pytest
+from sqlalchemy import create_engine
+
+from app import exceptions, models, schema
+
+
+@pytest.fixture
+def connection():
+    engine = create_engine("sqlite://")
+    with engine.connect() as connection:
+        yield connection
+    engine.dispose()
+
+
+@pytest.mark.unit
+def test_get_version_without_table_returns_none(connection):
+    assert schema.get_version(connection) is None
+
+
+@pytest.mark.unit
+def test_check_version_accepts_current_stamp(connection):
+    models.Base.metadata.create_all(connection)
+    schema.stamp(connection)
+
+    schema.check_version(connection)
+
+    assert schema.get_version(connection) == schema.SCHEMA_VERSION
+
+
+@pytest.mark.unit
+def test_stamp_replaces_previous_version(connection):
+    models.Base.metadata.create_all(connection)
+    schema.stamp(connection, 1)
+    schema.stamp(connection, 2)
+
+    assert schema.get_version(connection) == 2
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("version", [None, schema.SCHEMA_VERSION - 1])
+def test_check_version_rejects_other_versions(connection, version):
+    models.Base.metadata.create_all(connection)
+    if version is not None:
+        schema.stamp(connection, version)
+
+    with pytest.raises(exceptions.SchemaVersionError) as error:
+        schema.check_version(connection)
+
+    assert error.value.found == version
+    assert error.value.expected == schema.SCHEMA_VERSION
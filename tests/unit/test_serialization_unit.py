@@ -0,0 +1,38 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app import serialization
+from app.schemas.user import UserPublic
+
+
+@pytest.fixture
+def row():
+    return SimpleNamespace(
+        id="11111111-2222-3333-4444-555566667777",
+        username="johndoe",
+        full_name=None,
+        phone_number="+34 123 456 789",
+        email="johndoe@example.com",
+        password="hash",
+    )
+
+
+@pytest.mark.unit
+def test_dump_user_matches_response_model(row):
+    expected = UserPublic.model_validate(row, from_attributes=True)
+
+    assert (
+        serialization.dump_user(row)
+        == expected.model_dump_json().encode()
+    )
+
+
+@pytest.mark.unit
+def test_dump_users_omits_private_fields(row):
+    data = json.loads(serialization.dump_users([row, row]))
+
+    assert len(data) == 2
+    assert list(data[0]) == list(serialization.PUBLIC_FIELDS)
+    assert "password" not in data[0]
@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from app.singleflight import SingleFlight
+
+
+@pytest.mark.unit
+def test_singleflight_shares_in_flight_calls():
+    singleflight = SingleFlight()
+    calls = []
+
+    async def fetch(key):
+        calls.append(key)
+        await asyncio.sleep(0.01)
+        return {"key": key}
+
+    async def scenario():
+        return await asyncio.gather(
+            *(
+                singleflight.do("a", lambda: fetch("a"))
+                for _ in range(5)
+            ),
+            singleflight.do("b", lambda: fetch("b")),
+        )
+
+    results = asyncio.run(scenario())
+
+    assert calls == ["a", "b"]
+    assert results[0] is results[4]
+    assert results[5] == {"key": "b"}
+    assert singleflight.stats.calls == 6
+    assert singleflight.stats.deduplicated == 4
+
+
+@pytest.mark.unit
+def test_singleflight_does_not_cache_completed_calls():
+    singleflight = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        return len(calls)
+
+    async def scenario():
+        first = await singleflight.do("a", fetch)
+        second = await singleflight.do("a", fetch)
+        return first, second
+
+    assert asyncio.run(scenario()) == (1, 2)
+    assert singleflight.stats.deduplicated == 0
+
+
+@pytest.mark.unit
+def test_singleflight_shares_errors():
+    singleflight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    async def scenario():
+        return await asyncio.gather(
+            singleflight.do("a", fail),
+            singleflight.do("a", fail),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(scenario())
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+@pytest.mark.unit
+def test_singleflight_followers_retry_when_leader_is_cancelled():
+    singleflight = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        return "value"
+
+    async def scenario():
+        leader = asyncio.ensure_future(singleflight.do("a", fetch))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(singleflight.do("a", fetch))
+        await asyncio.sleep(0)
+        leader.cancel()
+        return await follower
+
+    assert asyncio.run(scenario()) == "value"
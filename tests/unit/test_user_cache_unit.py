@@ -0,0 +1,186 @@
+import uuid
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.cache import MISSING, LRUCache
+from app.repositories.user import CachedUserRepository, UserRepository
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return _FakeClock()
+
+
+@pytest.fixture
+def cache(clock):
+    return LRUCache(max_size=2, clock=clock)
+
+
+@pytest.mark.unit
+def test_lru_cache_hits_and_misses(cache):
+    assert cache.get("a") is MISSING
+    cache.set("a", None, ttl=10)
+
+    assert cache.get("a") is None
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+
+
+@pytest.mark.unit
+def test_lru_cache_evicts_least_recently_used(cache):
+    cache.set("a", 1, ttl=10)
+    cache.set("b", 2, ttl=10)
+    cache.get("a")
+    cache.set("c", 3, ttl=10)
+
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1
+    assert cache.stats.evictions == 1
+    assert len(cache) == 2
+
+
+@pytest.mark.unit
+def test_lru_cache_expires_entries(cache, clock):
+    cache.set("a", 1, ttl=10)
+    clock.now = 10
+
+    assert cache.get("a") is MISSING
+    assert cache.stats.expirations == 1
+
+
+@pytest.mark.unit
+def test_cached_repository_reads_through(cache):
+    session = MagicMock()
+    session.execute.return_value.first.return_value = SimpleNamespace(
+        id="some-id",
+        username="cached",
+        email="cached@example.com",
+    )
+    repo = CachedUserRepository(session, cache)
+    user_id = uuid.uuid4()
+
+    first = repo.get_user_by_id(user_id)
+    second = repo.get_user_by_id(user_id)
+
+    session.execute.assert_called_once()
+    assert first.email == second.email == "cached@example.com"
+
+
+@pytest.mark.unit
+def test_cached_repository_caches_missing_users(cache, clock):
+    session = MagicMock()
+    session.execute.return_value.first.return_value = None
+    repo = CachedUserRepository(session, cache, negative_ttl=5)
+    user_id = uuid.uuid4()
+
+    assert repo.get_user_by_id(user_id) is None
+    assert repo.get_user_by_id(user_id) is None
+    session.execute.assert_called_once()
+
+    clock.now = 5
+    repo.get_user_by_id(user_id)
+    assert session.execute.return_value.first.call_count == 2
+
+
+@pytest.mark.unit
+def test_cached_repository_invalidates_on_create(cache):
+    session = MagicMock()
+    session.execute.return_value.first.return_value = None
+    repo = CachedUserRepository(session, cache)
+    user_id = uuid.uuid4()
+    repo.get_user_by_id(user_id)
+
+    repo.create_users(
+        [{"id": str(user_id), "email": "new@example.com"}],
+    )
+    repo.get_user_by_id(user_id)
+
+    assert session.execute.return_value.first.call_count == 2
+
+
+@pytest.mark.unit
+def test_cached_repository_batch_queries_only_misses(cache):
+    cached_id, missing_id = uuid.uuid4(), uuid.uuid4()
+    session = MagicMock()
+    session.execute.return_value.first.return_value = SimpleNamespace(
+        id=str(cached_id),
+    )
+    session.execute.return_value.all.return_value = []
+    repo = CachedUserRepository(session, cache)
+    repo.get_user_by_id(cached_id)
+
+    users = repo.get_users_by_ids([cached_id, missing_id])
+    repo.get_users_by_ids([cached_id, missing_id])
+
+    assert [user.id for user in users] == [str(cached_id)]
+    assert session.execute.return_value.all.call_count == 1
+
+
+@pytest.mark.unit
+def test_repository_caches_counts_without_user_cache(clock):
+    session = MagicMock()
+    session.scalar.return_value = 3
+    repo = UserRepository(
+        session,
+        count_cache=LRUCache(max_size=2, clock=clock),
+        count_ttl=10,
+    )
+
+    assert repo.count_users(email="A@example.com") == (3, True)
+    assert repo.count_users(email="a@example.com") == (3, True)
+    session.scalar.assert_called_once()
+
+    clock.now = 10
+    repo.count_users(email="a@example.com")
+    assert session.scalar.call_count == 2
+
+
+@pytest.mark.unit
+def test_cached_repository_keeps_counts_out_of_user_cache(cache, clock):
+    session = MagicMock()
+    session.scalar.return_value = 3
+    count_cache = LRUCache(max_size=2, clock=clock)
+    repo = CachedUserRepository(session, cache, count_cache=count_cache)
+
+    repo.count_users(username="a")
+    repo.count_users(username="b")
+    repo.count_users(username="c")
+
+    assert len(cache) == 0
+    assert len(count_cache) == 2
+
+
+@pytest.mark.unit
+def test_repository_estimates_unfiltered_count_on_mysql(cache):
+    session = MagicMock()
+    session.get_bind.return_value.dialect.name = "mysql"
+    session.scalar.return_value = 1200
+    repo = CachedUserRepository(session, cache)
+
+    assert repo.count_users() == (1200, False)
+    assert "information_schema" in str(session.scalar.call_args.args[0])
+
+
+@pytest.mark.unit
+def test_cached_repository_reads_version_from_cached_row(cache):
+    session = MagicMock()
+    session.execute.return_value.first.return_value = SimpleNamespace(
+        id="some-id",
+        version=3,
+    )
+    repo = CachedUserRepository(session, cache)
+    user_id = uuid.uuid4()
+    repo.get_user_by_id(user_id)
+
+    assert repo.get_user_version(user_id) == 3
+    session.scalar.assert_not_called()
@@ -1,15 +1,27 @@
+import asyncio
+import inspect
+import threading
+import time
 import uuid
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
-from app import exceptions
-from app.services.user import UserService
+from app import exceptions, models
+from app.hashing import PasswordHasher
+from app.routing import RoutingSession
+from app.services.user import AsyncUserService, UserService
+from app.singleflight import SingleFlight
 
 
 @pytest.fixture
 def mock_repo():
-    return MagicMock()
+    return MagicMock(email_index=None)
 
 
 @pytest.fixture
@@ -23,7 +35,6 @@ def test_create_user_success(user_create, user_service, mock_repo):
         email=user_create.email,
         username=user_create.username,
     )
-    mock_repo.user_exists.return_value = False
     mock_repo.create_user.return_value = fake_user
 
     result = user_service.create_user_in_db(user_create)
@@ -39,12 +50,12 @@ def test_create_user_with_existing_email_raises(
     user_service,
     mock_repo,
 ):
-    mock_repo.user_exists.return_value = True
+    mock_repo.create_user.side_effect = exceptions.ExistingEmailError
 
     with pytest.raises(exceptions.ExistingEmailError):
         user_service.create_user_in_db(user_create)
 
-    mock_repo.create_user.assert_not_called()
+    mock_repo.user_exists.assert_not_called()
 
 
 @pytest.mark.unit
@@ -76,6 +87,7 @@ def test_get_users_from_db_with_filters(user_service, mock_repo):
         limit=10,
         username="filtered_user",
         email="filtered@example.com",
+        after=None,
     )
 
 
@@ -100,3 +112,534 @@ def test_get_user_by_id_not_found(user_service, mock_repo):
 
     assert result is None
     mock_repo.get_user_by_id.assert_called_once_with(user_id)
+
+
+@pytest.mark.unit
+def test_search_users_delegates_to_repository(user_service, mock_repo):
+    mock_repo.search_users.return_value = [MagicMock(username="ann")]
+
+    result = user_service.search_users(
+        "username",
+        "an",
+        limit=10,
+        after=("am", "id"),
+    )
+
+    assert result == mock_repo.search_users.return_value
+    mock_repo.search_users.assert_called_once_with(
+        field="username",
+        prefix="an",
+        limit=10,
+        after=("am", "id"),
+        timeout_ms=None,
+    )
+
+
+@pytest.mark.unit
+def test_create_user_uses_hasher(user_create, mock_repo):
+    hasher = MagicMock()
+    hasher.hash.return_value = "hashed"
+    service = UserService(mock_repo, hasher=hasher)
+
+    service.create_user_in_db(user_create)
+
+    hasher.hash.assert_called_once_with("secret")
+    created = mock_repo.create_user.call_args.args[0]
+    assert created.password == "hashed"
+
+
+@pytest.mark.unit
+def test_create_user_with_email_index_checks_before_hashing(
+    user_create,
+    mock_repo,
+):
+    mock_repo.email_index = MagicMock()
+    mock_repo.user_exists.return_value = True
+    hasher = MagicMock()
+    service = UserService(mock_repo, hasher=hasher)
+
+    with pytest.raises(exceptions.ExistingEmailError):
+        service.create_user_in_db(user_create)
+
+    mock_repo.user_exists.assert_called_once_with(
+        user_create.email,
+        primary=True,
+    )
+    hasher.hash.assert_not_called()
+    mock_repo.create_user.assert_not_called()
+
+
+@pytest.mark.unit
+def test_create_users_in_db_retries_chunk_on_race(
+    user_service,
+    mock_repo,
+):
+    mock_repo.get_existing_emails.side_effect = [
+        set(),
+        {"b@example.com"},
+    ]
+    mock_repo.create_users.side_effect = [
+        exceptions.ExistingEmailError,
+        None,
+    ]
+    items = [
+        {"username": "a", "email": "a@example.com", "password": "x"},
+        {"username": "b", "email": "b@example.com", "password": "x"},
+    ]
+
+    results = user_service.create_users_in_db(items, chunk_size=10)
+
+    assert [result.status for result in results] == [
+        "created",
+        "duplicate",
+    ]
+    assert mock_repo.create_users.call_count == 2
+
+
+@pytest.mark.unit
+def test_create_users_in_db_reuses_hashes_and_inserts_one_by_one(
+    mock_repo,
+):
+    mock_repo.get_existing_emails.return_value = set()
+    mock_repo.create_users.side_effect = [
+        exceptions.ExistingEmailError,
+        exceptions.ExistingEmailError,
+        None,
+        exceptions.ExistingEmailError,
+    ]
+    hasher = MagicMock()
+    hasher.hash_many.return_value = ["hash-a", "hash-b"]
+    service = UserService(mock_repo, hasher=hasher)
+    items = [
+        {"username": "a", "email": "a@example.com", "password": "x"},
+        {"username": "b", "email": "b@example.com", "password": "y"},
+    ]
+
+    results = service.create_users_in_db(items, chunk_size=10)
+
+    assert [result.status for result in results] == [
+        "created",
+        "duplicate",
+    ]
+    hasher.hash_many.assert_called_once_with(["x", "y"])
+    inserted = mock_repo.create_users.call_args_list[2].args[0]
+    assert inserted[0]["password"] == "hash-a"
+
+
+@pytest.mark.unit
+def test_create_users_in_db_reports_each_item(user_service, mock_repo):
+    mock_repo.get_existing_emails.return_value = {"Taken@example.com"}
+    items = [
+        {"username": "a", "email": "a@example.com", "password": "x"},
+        {
+            "username": "b",
+            "email": "taken@example.com",
+            "password": "x",
+        },
+        {"username": "c", "email": "A@example.com", "password": "x"},
+        {"username": "d", "email": "not-an-email", "password": "x"},
+    ]
+
+    results = user_service.create_users_in_db(items, chunk_size=10)
+
+    assert [result.status for result in results] == [
+        "created",
+        "duplicate",
+        "duplicate",
+        "invalid",
+    ]
+    assert results[0].user.email == "a@example.com"
+    assert "email" in results[3].detail
+    mock_repo.get_existing_emails.assert_called_once_with(
+        ["a@example.com", "taken@example.com"],
+    )
+    rows = mock_repo.create_users.call_args.args[0]
+    assert len(rows) == 1
+    assert rows[0]["password"] != "x"
+
+
+@pytest.mark.unit
+def test_create_users_in_db_chunks_inserts(user_service, mock_repo):
+    mock_repo.get_existing_emails.return_value = set()
+    items = [
+        {
+            "username": f"u{i}",
+            "email": f"u{i}@example.com",
+            "password": "x",
+        }
+        for i in range(5)
+    ]
+
+    results = user_service.create_users_in_db(items, chunk_size=2)
+
+    assert all(result.status == "created" for result in results)
+    assert mock_repo.get_existing_emails.call_count == 3
+    assert mock_repo.create_users.call_count == 3
+
+
+@pytest.mark.unit
+def test_async_user_service_delegates_to_user_service():
+    session = MagicMock()
+    session.execute.return_value.first.return_value = MagicMock(
+        email="async@example.com",
+    )
+    user_service = AsyncUserService.threaded(session)
+
+    result = asyncio.run(user_service.get_user_by_id(uuid.uuid4()))
+
+    assert result.email == "async@example.com"
+    with pytest.raises(AttributeError):
+        user_service._hash_password
+
+
+@pytest.mark.unit
+def test_async_user_service_mirrors_service_signatures():
+    names = {
+        name
+        for name, member in vars(AsyncUserService).items()
+        if inspect.isfunction(member) and not name.startswith("_")
+    }
+
+    assert names == {
+        name
+        for name, member in vars(UserService).items()
+        if inspect.isfunction(member)
+        and not name.startswith("_")
+        and name != "check_email_available"
+    }
+    for name in names:
+        wrapper = inspect.signature(getattr(AsyncUserService, name))
+        method = inspect.signature(getattr(UserService, name))
+        assert wrapper.parameters.items() <= method.parameters.items()
+
+
+@pytest.mark.unit
+def test_async_user_service_streams_and_closes_session():
+    session = MagicMock()
+    session.execute.return_value.mappings.return_value = iter(
+        [{"id": "1"}, {"id": "2"}],
+    )
+    user_service = AsyncUserService.threaded(session)
+
+    async def _collect():
+        return [row async for row in user_service.stream_users()]
+
+    assert asyncio.run(_collect()) == [{"id": "1"}, {"id": "2"}]
+    session.close.assert_called_once()
+
+
+@pytest.mark.unit
+def test_import_users_summarizes_chunks(user_service, mock_repo):
+    mock_repo.get_existing_emails.side_effect = [
+        set(),
+        {"b@example.com"},
+    ]
+    rows = [
+        (
+            1,
+            {
+                "username": "a",
+                "email": "a@example.com",
+                "password": "x",
+            },
+        ),
+        (2, "not a user"),
+        (
+            3,
+            {
+                "username": "b",
+                "email": "b@example.com",
+                "password": "x",
+            },
+        ),
+    ]
+
+    summary = user_service.import_users(iter(rows), chunk_size=2)
+
+    assert (summary.inserted, summary.duplicates, summary.invalid) == (
+        1,
+        1,
+        1,
+    )
+    assert [(error.row, error.status) for error in summary.errors] == [
+        (2, "invalid"),
+        (3, "duplicate"),
+    ]
+    assert mock_repo.create_users.call_count == 1
+
+
+@pytest.mark.unit
+def test_import_users_hashes_in_parallel(mock_repo):
+    mock_repo.get_existing_emails.return_value = set()
+    lock = threading.Lock()
+    running = []
+    peak = []
+
+    def _hash(password):
+        with lock:
+            running.append(password)
+            peak.append(len(running))
+        time.sleep(0.05)
+        with lock:
+            running.remove(password)
+        return f"hashed:{password}"
+
+    hasher = PasswordHasher(_hash)
+    service = UserService(mock_repo, hasher=hasher)
+    rows = [
+        (
+            i,
+            {
+                "username": f"u{i}",
+                "email": f"u{i}@example.com",
+                "password": f"p{i}",
+            },
+        )
+        for i in range(6)
+    ]
+
+    summary = service.import_users(iter(rows))
+    hasher.shutdown()
+
+    assert summary.inserted == 6
+    assert max(peak) > 1
+
+
+@pytest.mark.unit
+def test_get_users_by_ids_preserves_order(user_service, mock_repo):
+    first, second, unknown = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    mock_repo.get_users_by_ids.return_value = [
+        MagicMock(id=str(first)),
+        MagicMock(id=str(second)),
+    ]
+
+    result = user_service.get_users_by_ids(
+        [second, unknown, first, second],
+    )
+
+    assert list(result) == [second, unknown, first]
+    assert result[unknown] is None
+    assert result[first].id == str(first)
+    mock_repo.get_users_by_ids.assert_called_once_with(
+        [second, unknown, first],
+    )
+
+
+@pytest.mark.unit
+def test_async_user_service_coalesces_identical_reads(mock_repo):
+    singleflight = SingleFlight()
+    user_id = uuid.uuid4()
+
+    async def run(func, *args):
+        await asyncio.sleep(0.01)
+        return func(*args)
+
+    async def close():
+        pass
+
+    async def scenario():
+        user_service = AsyncUserService(
+            run,
+            UserService(mock_repo),
+            close,
+            singleflight,
+        )
+        return await asyncio.gather(
+            user_service.get_user_by_id(user_id),
+            user_service.get_user_by_id(user_id),
+            user_service.get_users_from_db(limit=10),
+        )
+
+    asyncio.run(scenario())
+
+    mock_repo.get_user_by_id.assert_called_once_with(user_id)
+    mock_repo.get_users.assert_called_once()
+    assert singleflight.stats.deduplicated == 1
+
+
+@pytest.mark.unit
+def test_verify_password_rehashes_outdated_hash(mock_repo):
+    mock_repo.get_credentials.return_value = MagicMock(
+        id="user-id",
+        password="old-hash",
+    )
+    hasher = MagicMock()
+    hasher.verify.return_value = (True, "new-hash")
+    service = UserService(mock_repo, hasher=hasher)
+
+    assert service.verify_password("a@example.com", "secret") is True
+
+    hasher.verify.assert_called_once_with("secret", "old-hash")
+    mock_repo.update_password.assert_called_once_with(
+        "user-id",
+        "new-hash",
+    )
+
+
+@pytest.mark.unit
+def test_verify_password_rejects_wrong_password(mock_repo):
+    mock_repo.get_credentials.return_value = MagicMock(
+        id="user-id",
+        password="old-hash",
+    )
+    hasher = MagicMock()
+    hasher.verify.return_value = (False, None)
+    service = UserService(mock_repo, hasher=hasher)
+
+    assert service.verify_password("a@example.com", "wrong") is False
+    mock_repo.get_credentials.return_value = None
+    assert service.verify_password("b@example.com", "secret") is False
+
+    mock_repo.update_password.assert_not_called()
+
+
+@pytest.mark.unit
+def test_threaded_create_user_awaits_hash_on_event_loop(
+    user_create,
+    mock_repo,
+):
+    mock_repo.email_index = MagicMock()
+    mock_repo.user_exists.return_value = False
+    mock_repo.create_user.side_effect = lambda user: user
+    hasher = MagicMock()
+    hasher.hash_async = AsyncMock(return_value="hashed")
+    user_service = AsyncUserService.threaded(
+        MagicMock(),
+        hasher=hasher,
+        repo_factory=lambda _: mock_repo,
+    )
+
+    user = asyncio.run(user_service.create_user_in_db(user_create))
+
+    assert user.password == "hashed"
+    hasher.hash_async.assert_awaited_once_with("secret")
+    hasher.hash.assert_not_called()
+    mock_repo.user_exists.assert_called_once_with(
+        user_create.email,
+        primary=True,
+    )
+
+
+@pytest.mark.unit
+def test_async_user_service_streams_in_batches():
+    calls = []
+
+    async def run(func, *args):
+        calls.append(func)
+        return func(*args)
+
+    async def close():
+        pass
+
+    service = MagicMock()
+    service.stream_users.return_value = iter(range(2500))
+    user_service = AsyncUserService(run, service, close)
+
+    async def _collect():
+        return [row async for row in user_service.stream_users()]
+
+    assert asyncio.run(_collect()) == list(range(2500))
+    assert len(calls) == 4
+
+
+@pytest.fixture
+def fake_hasher():
+    hasher = PasswordHasher(lambda password: f"hashed:{password}")
+    yield hasher
+    hasher.shutdown()
+
+
+def _run_on_async_session(tmp_path, scenario):
+    """Run `scenario(SessionLocal)` against a fresh aiosqlite database."""
+
+    async def _main():
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'async.db'}",
+        )
+        async with engine.begin() as connection:
+            await connection.run_sync(models.Base.metadata.create_all)
+        SessionLocal = async_sessionmaker(
+            class_=AsyncSession,
+            sync_session_class=RoutingSession,
+            primary=engine.sync_engine,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+        try:
+            return await scenario(SessionLocal)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(_main())
+
+
+@pytest.mark.unit
+def test_async_session_creates_user_through_awaiting_hasher(
+    tmp_path,
+    user_create,
+    fake_hasher,
+):
+    async def scenario(SessionLocal):
+        async with SessionLocal() as session:
+            user_service = AsyncUserService.for_async_session(
+                session,
+                hasher=fake_hasher,
+            )
+            user = await user_service.create_user_in_db(user_create)
+            await session.commit()
+        async with SessionLocal() as session:
+            user_service = AsyncUserService.for_async_session(
+                session,
+                hasher=fake_hasher,
+            )
+            with pytest.raises(exceptions.ExistingEmailError):
+                await user_service.create_user_in_db(user_create)
+            found = await user_service.get_user_by_id(
+                uuid.UUID(user.id),
+            )
+        return user, found
+
+    user, found = _run_on_async_session(tmp_path, scenario)
+
+    assert user.password == "hashed:secret"
+    assert found.email == user_create.email
+
+
+@pytest.mark.unit
+def test_async_session_streams_users_and_closes_session(
+    tmp_path,
+    user_create,
+    fake_hasher,
+    monkeypatch,
+):
+    monkeypatch.setattr(AsyncUserService, "STREAM_BATCH_SIZE", 2)
+
+    async def scenario(SessionLocal):
+        async with SessionLocal() as session:
+            user_service = AsyncUserService.for_async_session(
+                session,
+                hasher=fake_hasher,
+            )
+            for index in range(5):
+                await user_service.create_user_in_db(
+                    user_create.model_copy(
+                        update={"email": f"user{index}@example.com"},
+                    ),
+                )
+            await session.commit()
+        pool = SessionLocal.kw["primary"].pool
+        user_service = AsyncUserService.for_async_session(
+            SessionLocal(),
+        )
+        rows = []
+        async for row in user_service.stream_users():
+            rows.append(row)
+            checked_out = pool.checkedout()
+        return rows, checked_out, pool.checkedout()
+
+    rows, streaming, after = _run_on_async_session(tmp_path, scenario)
+
+    assert sorted(row["email"] for row in rows) == [
+        f"user{index}@example.com" for index in range(5)
+    ]
+    assert (streaming, after) == (1, 0)